@@ -0,0 +1,742 @@
+import copy
+import math
+import os
+import re
+import shutil
+import struct
+import sys
+import types
+import numpy as np
+
+# Field types as reported by ListFields, keyed by the AddField type keyword
+FIELD_TYPES = {"TEXT": "String", "DOUBLE": "Double", "FLOAT": "Single", "LONG": "Integer",
+               "SHORT": "SmallInteger", "DATE": "Date", "GUID": "Guid"}
+
+SQL_KEYWORDS = {"AND", "OR", "NOT", "IS", "NULL", "LIKE", "IN"}
+SQL_TOKEN = re.compile(r"\s*(?:('(?:[^']|'')*')|(\d+(?:\.\d*)?)|([A-Za-z_][A-Za-z0-9_\.]*)|(<>|!=|>=|<=|=|<|>|\(|\)|,))")
+
+
+class Field(object):
+    def __init__(self, name, type="String", length=None, editable=True):
+        self.name = name
+        self.type = type
+        self.length = length
+        self.editable = editable
+        self.aliasName = name
+
+
+class SpatialReference(object):
+    def __init__(self, item=None):
+        self.factoryCode = item if isinstance(item, int) else 0
+        self.name = str(item) if item is not None else "Unknown"
+        self.type = "Geographic" if self.factoryCode in (4283, 7844) else "Projected"
+
+    def exportToString(self):
+        return self.name
+
+
+class Point(object):
+    def __init__(self, X=None, Y=None, Z=None, M=None):
+        self.X, self.Y, self.Z, self.M = X, Y, Z, M
+
+
+class Extent(tuple):
+    """(xmin, ymin, xmax, ymax) tuple with the arcpy Extent properties."""
+    XMin = property(lambda self: self[0])
+    YMin = property(lambda self: self[1])
+    XMax = property(lambda self: self[2])
+    YMax = property(lambda self: self[3])
+    width = property(lambda self: self[2] - self[0])
+    height = property(lambda self: self[3] - self[1])
+
+
+def _segment_distance(x, y, x1, y1, x2, y2):
+    dx, dy = x2 - x1, y2 - y1
+    t = 0.0 if dx == dy == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+class PointGeometry(object):
+    type = "point"
+
+    def __init__(self, point, spatial_reference=None, has_z=False, has_m=False):
+        self.firstPoint = point
+        self.spatialReference = spatial_reference
+
+    def equals(self, other):
+        return (other is not None and self.firstPoint.X == other.firstPoint.X
+                and self.firstPoint.Y == other.firstPoint.Y)
+
+    def distanceTo(self, other):
+        """Planar distance to a point, polyline or polygon (0 inside a polygon)."""
+        x, y = self.firstPoint.X, self.firstPoint.Y
+        if isinstance(other, PointGeometry):
+            return math.hypot(x - other.firstPoint.X, y - other.firstPoint.Y)
+        if isinstance(other, Polygon) and other.contains_xy(x, y):
+            return 0.0
+        return min(_segment_distance(x, y, x1, y1, x2, y2)
+                   for path in other.rings for (x1, y1), (x2, y2) in zip(path, path[1:]))
+
+
+class Polyline(object):
+    """Polyline as a list of paths of (x, y) tuples, as returned by Polygon.boundary()."""
+    type = "polyline"
+
+    def __init__(self, paths, spatial_reference=None):
+        self.rings = [list(path) for path in paths]
+        self.spatialReference = spatial_reference
+
+
+class Polygon(object):
+    """Polygon as a list of rings of (x, y) tuples, enough for extents, point tests and their WKB."""
+    type = "polygon"
+
+    def __init__(self, rings, spatial_reference=None):
+        self.rings = [list(ring) for ring in rings]
+        self.spatialReference = spatial_reference
+        xs = [x for ring in self.rings for x, _ in ring]
+        ys = [y for ring in self.rings for _, y in ring]
+        self.extent = Extent((min(xs), min(ys), max(xs), max(ys)))
+
+    @property
+    def labelPoint(self):
+        """Midpoint of the widest interior span on the horizontal line through the extent's middle."""
+        y = (self.extent.YMin + self.extent.YMax) / 2
+        crossings = sorted(x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+                           for ring in self.rings for (x1, y1), (x2, y2) in zip(ring, ring[1:])
+                           if (y1 > y) != (y2 > y))
+        spans = list(zip(crossings[::2], crossings[1::2]))
+        start, end = max(spans, key=lambda span: span[1] - span[0])
+        return Point((start + end) / 2, y)
+
+    def boundary(self):
+        return Polyline(self.rings, self.spatialReference)
+
+    def contains(self, geometry):
+        return self.contains_xy(geometry.firstPoint.X, geometry.firstPoint.Y)
+
+    @property
+    def WKB(self):
+        data = struct.pack("<BII", 1, 3, len(self.rings))
+        for ring in self.rings:
+            data += struct.pack("<I", len(ring)) + b"".join(struct.pack("<dd", x, y) for x, y in ring)
+        return data
+
+    def contains_xy(self, x, y):
+        xmin, ymin, xmax, ymax = self.extent
+        if x < xmin or x > xmax or y < ymin or y > ymax:
+            return False
+        inside = False
+        for ring in self.rings:
+            for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+                if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+        return inside
+
+    def equals(self, other):
+        return isinstance(other, Polygon) and self.rings == other.rings
+
+
+class Result(object):
+    def __init__(self, *outputs):
+        self.outputs = outputs
+
+    def getOutput(self, index):
+        return self.outputs[index]
+
+
+class Dataset(object):
+    """Feature class, table or raster held in memory. Rows are lists aligned with fields."""
+
+    def __init__(self, path, kind="FeatureClass", shape_type="Point", spatial_reference=None, has_z=False):
+        self.path = path
+        self.kind = kind
+        self.shape_type = shape_type
+        self.spatial_reference = spatial_reference or SpatialReference(4283)
+        self.has_z = has_z
+        self.fields = [Field("OBJECTID", "OID", editable=False)]
+        if kind == "FeatureClass":
+            self.fields.append(Field("Shape", "Geometry", editable=False))
+        self.rows = []
+        self.next_oid = 1
+        self.array = None
+        self.raster_extent = None
+
+    def index(self, name):
+        upper = name.upper()
+        for i, field in enumerate(self.fields):
+            if field.name.upper() == upper:
+                return i
+        return None
+
+    @property
+    def shape_index(self):
+        return 1 if self.kind == "FeatureClass" else None
+
+    def add_field(self, name, field_type, length=None):
+        if self.index(name) is not None:
+            return
+        self.fields.append(Field(name, field_type, length))
+        for row in self.rows:
+            row.append(None)
+
+    def new_row(self):
+        row = [None] * len(self.fields)
+        row[0] = self.next_oid
+        self.next_oid += 1
+        return row
+
+
+class Layer(object):
+    def __init__(self, name, source, where_clause=None):
+        self.name = name
+        self.source = source
+        self.where_clause = where_clause
+
+
+class _Like(object):
+    """Right operand of the '@' operator a LIKE is translated to."""
+
+    def __init__(self, pattern, negate=False):
+        regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+        self.regex = re.compile(f"^{regex}$", re.IGNORECASE | re.DOTALL)
+        self.negate = negate
+
+    def __rmatmul__(self, value):
+        if value is None:
+            return False
+        return (self.regex.match(str(value)) is None) if self.negate else (self.regex.match(str(value)) is not None)
+
+
+_WHERE_CACHE = {}
+
+
+def compile_where(clause, fields):
+    """
+    Compiles a SQL where clause to a row predicate.
+
+    Supports comparisons, AND/OR/NOT, IS [NOT] NULL, [NOT] LIKE and IN. Clauses arcpy would reject,
+    such as adjacent identifiers ("INSTALLATION TYPE") or names that are not fields of the dataset,
+    raise the same RuntimeError arcpy does instead of running.
+    """
+    if not clause or not clause.strip():
+        return None
+    names = tuple(field.name.upper() for field in fields)
+    key = (clause, names)
+    if key in _WHERE_CACHE:
+        return _WHERE_CACHE[key]
+
+    tokens, pos = [], 0
+    while pos < len(clause):
+        match = SQL_TOKEN.match(clause, pos)
+        if not match:
+            if not clause[pos:].strip():
+                break
+            raise ValueError(f"Cannot parse where clause: {clause}")
+        pos = match.end()
+        string, number, identifier, operator = match.groups()
+        if identifier and identifier.upper() not in SQL_KEYWORDS:
+            if tokens and tokens[-1][0] == "identifier":
+                raise RuntimeError(f"An invalid SQL statement was used. [{clause}]")
+            tokens.append(("identifier", identifier))
+        elif identifier:
+            tokens.append(("keyword", identifier.upper()))
+        elif string is not None:
+            tokens.append(("string", string[1:-1].replace("''", "'")))
+        elif number is not None:
+            tokens.append(("number", number))
+        else:
+            tokens.append(("operator", operator))
+
+    parts, i, like = [], 0, None
+    while i < len(tokens):
+        kind, value = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else (None, None)
+        if kind == "identifier":
+            upper = value.upper().split(".")[-1]
+            if upper not in names:
+                raise RuntimeError(f"An invalid SQL statement was used. [{clause}]")
+            parts.append(f"r[{names.index(upper)}]")
+        elif kind == "string":
+            parts.append(f"_Like({value!r}, {like})" if like is not None else repr(value))
+            like = None
+        elif kind == "number":
+            parts.append(value)
+        elif kind == "operator":
+            parts.append({"=": "==", "<>": "!="}.get(value, value))
+        elif value == "IS":
+            if following == ("keyword", "NOT"):
+                parts.append("is not None")
+                i += 2
+            else:
+                parts.append("is None")
+                i += 1
+        elif value == "NOT" and following == ("keyword", "LIKE"):
+            parts.append("@")
+            like = True
+            i += 1
+        elif value == "LIKE":
+            parts.append("@")
+            like = False
+        else:
+            parts.append(value.lower())
+        i += 1
+
+    expression = eval("lambda r: " + " ".join(parts), {"_Like": _Like})
+
+    def predicate(row):
+        try:
+            return bool(expression(row))
+        except TypeError:
+            return False  # comparisons with NULL
+
+    _WHERE_CACHE[key] = predicate
+    return predicate
+
+
+class StandIn(object):
+    """
+    In-memory stand-in for the parts of arcpy the lost-equipment pipeline calls.
+
+    Datasets live in a dictionary keyed by normalised path; workspaces are also created on disk
+    so code that lists or deletes folders keeps working. install() registers the stand-in as the
+    arcpy module, it must be called before any pipeline module is imported.
+
+    Search cursors honour spatial_reference by projecting the shapes they read through
+    CoordinateTransform. Pairs it cannot handle without arcpy, and update cursors in another
+    spatial reference, raise NotImplementedError rather than returning unprojected coordinates.
+    """
+
+    def __init__(self):
+        self.datasets = {}
+        self.layers = {}
+        self.workspaces = set()
+        self.module = self._build_module()
+
+    @staticmethod
+    def key(path):
+        return os.path.normcase(os.path.normpath(str(path)))
+
+    def install(self):
+        sys.modules["arcpy"] = self.module
+        return self.module
+
+    def reset(self):
+        self.datasets.clear()
+        self.layers.clear()
+        self.workspaces.clear()
+
+    # Lookup
+
+    def resolve(self, path):
+        """Returns (dataset, predicate) for a dataset path or layer name."""
+        if isinstance(path, Layer):
+            layer = path
+        else:
+            layer = self.layers.get(str(path))
+        if layer is not None:
+            dataset, predicate = self.resolve(layer.source)
+            own = compile_where(layer.where_clause, dataset.fields)
+            if own and predicate:
+                return dataset, lambda row: predicate(row) and own(row)
+            return dataset, own or predicate
+        dataset = self.datasets.get(self.key(path))
+        if dataset is None:
+            raise RuntimeError(f"ERROR 000732: Dataset {path} does not exist or is not supported")
+        return dataset, None
+
+    def rows(self, path, where_clause=None):
+        dataset, predicate = self.resolve(path)
+        own = compile_where(where_clause, dataset.fields)
+        if predicate and own:
+            return dataset, [row for row in dataset.rows if predicate(row) and own(row)]
+        if predicate or own:
+            return dataset, [row for row in dataset.rows if (predicate or own)(row)]
+        return dataset, dataset.rows
+
+    def create_dataset(self, path, kind="FeatureClass", shape_type="Point", spatial_reference=None, has_z=False, template=None):
+        dataset = Dataset(path, kind, shape_type, spatial_reference, has_z)
+        if template:
+            source, _ = self.resolve(template)
+            for field in source.fields:
+                if field.type not in ("OID", "Geometry") and field.name.lower() not in ("shape_length", "shape_area"):
+                    dataset.add_field(field.name, field.type, field.length)
+            if spatial_reference in (None, ""):
+                dataset.spatial_reference = source.spatial_reference
+        self.datasets[self.key(path)] = dataset
+        return dataset
+
+    # Geometry token access
+
+    @staticmethod
+    def _getter(dataset, token):
+        s = dataset.shape_index
+        if token == "OID@":
+            return lambda row: row[0]
+        if token == "SHAPE@XY":
+            return lambda row: (row[s][0], row[s][1]) if isinstance(row[s], tuple) else (
+                ((row[s].extent[0] + row[s].extent[2]) / 2, (row[s].extent[1] + row[s].extent[3]) / 2) if row[s] else None)
+        if token == "SHAPE@X":
+            return lambda row: row[s][0] if row[s] else None
+        if token == "SHAPE@Y":
+            return lambda row: row[s][1] if row[s] else None
+        if token == "SHAPE@Z":
+            return lambda row: row[s][2] if isinstance(row[s], tuple) else None
+        if token == "SHAPE@WKB":
+            return lambda row: row[s].WKB if isinstance(row[s], Polygon) else (
+                struct.pack("<BIdd", 1, 1, row[s][0], row[s][1]) if row[s] else None)
+        if token == "SHAPE@":
+            sr = dataset.spatial_reference
+            return lambda row: PointGeometry(Point(*row[s]), sr) if isinstance(row[s], tuple) else row[s]
+        index = dataset.index(token)
+        if index is None:
+            raise RuntimeError(f"Cannot find field '{token}' in {dataset.path}")
+        return lambda row: row[index]
+
+    @staticmethod
+    def _setter(dataset, token):
+        s = dataset.shape_index
+        if token == "OID@":
+            return None
+        if token == "SHAPE@XY":
+            def set_xy(row, value):
+                z = row[s][2] if isinstance(row[s], tuple) else None
+                row[s] = (value[0], value[1], z) if value else None
+            return set_xy
+        if token == "SHAPE@Z":
+            def set_z(row, value):
+                if isinstance(row[s], tuple):
+                    row[s] = (row[s][0], row[s][1], value)
+            return set_z
+        if token == "SHAPE@":
+            def set_shape(row, value):
+                if isinstance(value, PointGeometry):
+                    row[s] = (value.firstPoint.X, value.firstPoint.Y, value.firstPoint.Z)
+                elif isinstance(value, Point):
+                    row[s] = (value.X, value.Y, value.Z)
+                else:
+                    row[s] = value
+            return set_shape
+        index = dataset.index(token)
+        if index is None:
+            raise RuntimeError(f"Cannot find field '{token}' in {dataset.path}")
+
+        def set_value(row, value):
+            row[index] = value
+        return set_value
+
+    # Module
+
+    def _build_module(self):
+        standin = self
+        arcpy = types.ModuleType("arcpy")
+        arcpy.__file__ = __file__
+        arcpy.standin = self
+        arcpy.env = types.SimpleNamespace(scratchFolder=None, workspace=None, overwriteOutput=True)
+        arcpy.SpatialReference = SpatialReference
+        arcpy.Point = Point
+        arcpy.PointGeometry = PointGeometry
+        arcpy.Polygon = Polygon
+        arcpy.Polyline = Polyline
+        arcpy.ProductInfo = lambda: "StandIn"
+        arcpy.AddMessage = lambda message: print(message)
+        arcpy.AddWarning = lambda message: print(f"WARNING: {message}")
+        arcpy.AddError = lambda message: print(f"ERROR: {message}")
+        arcpy.AddFieldDelimiters = lambda dataset, field: field
+        arcpy.ValidateTableName = lambda name, workspace=None: re.sub(r"[^0-9A-Za-z_]", "_", name)
+        arcpy.ValidateFieldName = lambda name, workspace=None: re.sub(r"[^0-9A-Za-z_]", "_", name)[:64]
+
+        def Exists(path):
+            return str(path) in standin.layers or standin.key(path) in standin.datasets or standin.key(path) in standin.workspaces
+
+        def Delete_management(path, *args, **kwargs):
+            key = standin.key(path)
+            if str(path) in standin.layers:
+                del standin.layers[str(path)]
+            elif key in standin.datasets:
+                del standin.datasets[key]
+            elif key in standin.workspaces:
+                standin.workspaces.discard(key)
+                for dataset_key in [k for k in standin.datasets if k.startswith(key + os.sep)]:
+                    del standin.datasets[dataset_key]
+                shutil.rmtree(path, ignore_errors=True)
+            return Result(path)
+
+        def CreateFileGDB_management(folder, name, *args, **kwargs):
+            path = os.path.join(folder, name if name.lower().endswith(".gdb") else name + ".gdb")
+            os.makedirs(path, exist_ok=True)
+            standin.workspaces.add(standin.key(path))
+            return Result(path)
+
+        def GetCount_management(path):
+            dataset, rows = standin.rows(path)
+            if dataset.kind == "Raster":
+                return Result(str(dataset.array.size))
+            return Result(str(len(rows)))
+
+        def ListFields(path, *args, **kwargs):
+            dataset, _ = standin.resolve(path)
+            return list(dataset.fields)
+
+        def Describe(path):
+            key = standin.key(path)
+            if key in standin.workspaces:
+                return types.SimpleNamespace(dataType="Workspace", path=os.path.dirname(str(path)), catalogPath=str(path),
+                                             name=os.path.basename(str(path)))
+            if str(path) not in standin.layers and key not in standin.datasets:
+                if os.path.isdir(str(path)):
+                    return types.SimpleNamespace(dataType="Folder", path=os.path.dirname(str(path)), catalogPath=str(path))
+                raise RuntimeError(f"ERROR 000732: Dataset {path} does not exist or is not supported")
+            dataset, _ = standin.resolve(path)
+            is_layer = str(path) in standin.layers
+            return types.SimpleNamespace(
+                dataType="FeatureLayer" if is_layer else ("RasterDataset" if dataset.kind == "Raster" else dataset.kind),
+                path=os.path.dirname(dataset.path), catalogPath=dataset.path, name=os.path.basename(dataset.path),
+                spatialReference=dataset.spatial_reference, shapeType=dataset.shape_type, hasZ=dataset.has_z,
+                hasM=False, OIDFieldName="OBJECTID", isVersioned=False, fields=list(dataset.fields))
+
+        def CreateFeatureclass_management(out_path, out_name, geometry_type="POLYGON", template=None, has_m="DISABLED",
+                                          has_z="DISABLED", spatial_reference=None, *args, **kwargs):
+            path = os.path.join(out_path, out_name)
+            standin.create_dataset(path, "FeatureClass", geometry_type.title(),
+                                   spatial_reference if isinstance(spatial_reference, SpatialReference) else None,
+                                   has_z == "ENABLED", template)
+            return Result(path)
+
+        def AddField_management(in_table, field_name, field_type, field_precision=None, field_scale=None,
+                                field_length=None, *args, **kwargs):
+            dataset, _ = standin.resolve(in_table)
+            dataset.add_field(field_name, FIELD_TYPES.get(field_type.upper(), field_type), field_length)
+            return Result(in_table)
+
+        def MakeFeatureLayer_management(in_features, out_layer, where_clause=None, *args, **kwargs):
+            standin.resolve(in_features)
+            standin.layers[out_layer] = Layer(out_layer, in_features, where_clause)
+            return Result(out_layer)
+
+        def Append_management(inputs, target, schema_type="TEST", field_mapping=None, subtype=None, *args, **kwargs):
+            target_dataset, _ = standin.resolve(target)
+            for source in (inputs if isinstance(inputs, (list, tuple)) else [inputs]):
+                dataset, rows = standin.rows(source)
+                pairs = [(target_dataset.index(field.name), i) for i, field in enumerate(dataset.fields)
+                         if field.type != "OID" and target_dataset.index(field.name) is not None]
+                for row in rows:
+                    new_row = target_dataset.new_row()
+                    for target_index, source_index in pairs:
+                        new_row[target_index] = row[source_index]
+                    target_dataset.rows.append(new_row)
+            return Result(target)
+
+        def Intersect_analysis(in_features, out_feature_class, join_attributes="ALL", cluster_tolerance=None,
+                               output_type="INPUT", *args, **kwargs):
+            polygons_dataset, polygon_rows = standin.rows(in_features[0])
+            points_dataset, point_rows = standin.rows(in_features[1])
+            output = standin.create_dataset(out_feature_class, spatial_reference=points_dataset.spatial_reference,
+                                            template=in_features[1])
+            polygon_fields = [(output.index(field.name), i) for i, field in enumerate(polygons_dataset.fields)
+                              if field.type not in ("OID", "Geometry")]
+            for field in polygons_dataset.fields:
+                if field.type not in ("OID", "Geometry") and output.index(field.name) is None:
+                    output.add_field(field.name, field.type, field.length)
+            polygon_fields = [(output.index(polygons_dataset.fields[i].name), i) for _, i in polygon_fields]
+            point_fields = [(output.index(field.name), i) for i, field in enumerate(points_dataset.fields)
+                            if field.type != "OID" and output.index(field.name) is not None]
+            for polygon_row in polygon_rows:
+                polygon = polygon_row[1]
+                for row in point_rows:
+                    shape = row[1]
+                    if shape and polygon.contains_xy(shape[0], shape[1]):
+                        new_row = output.new_row()
+                        for target_index, source_index in point_fields:
+                            new_row[target_index] = row[source_index]
+                        for target_index, source_index in polygon_fields:
+                            new_row[target_index] = polygon_row[source_index]
+                        output.rows.append(new_row)
+            return Result(out_feature_class)
+
+        def Clip_management(in_raster, rectangle=None, out_raster=None, in_template_dataset=None, *args, **kwargs):
+            source, _ = standin.resolve(in_raster)
+            _, rows = standin.rows(in_template_dataset)
+            extents = [row[1].extent for row in rows if row[1] is not None]
+            xmin, ymin = min(e[0] for e in extents), min(e[1] for e in extents)
+            xmax, ymax = max(e[2] for e in extents), max(e[3] for e in extents)
+            rxmin, rymin, rxmax, rymax = source.raster_extent
+            rows_count, cols_count = source.array.shape
+            c0 = int(max(0, (xmin - rxmin) / (rxmax - rxmin) * cols_count))
+            c1 = int(min(cols_count, (xmax - rxmin) / (rxmax - rxmin) * cols_count + 1))
+            r0 = int(max(0, (rymax - ymax) / (rymax - rymin) * rows_count))
+            r1 = int(min(rows_count, (rymax - ymin) / (rymax - rymin) * rows_count + 1))
+            clipped = standin.create_dataset(out_raster, "Raster", None, source.spatial_reference)
+            clipped.array = source.array[r0:r1, c0:c1].copy()
+            clipped.raster_extent = (xmin, ymin, xmax, ymax)
+            return Result(out_raster)
+
+        for function in (Exists, Delete_management, CreateFileGDB_management, GetCount_management, ListFields,
+                         Describe, CreateFeatureclass_management, AddField_management, MakeFeatureLayer_management,
+                         Append_management, Intersect_analysis, Clip_management):
+            setattr(arcpy, function.__name__, function)
+
+        arcpy.da = types.SimpleNamespace(SearchCursor=self._search_cursor, UpdateCursor=self._update_cursor,
+                                         InsertCursor=self._insert_cursor, Editor=_Editor)
+        return arcpy
+
+    def _search_cursor(self, path, fields, where_clause=None, spatial_reference=None, explode_to_points=False,
+                       sql_clause=(None, None), **kwargs):
+        if isinstance(fields, str):
+            fields = [fields]
+        dataset, rows = self.rows(path, where_clause)
+        dataset, rows = self._project(dataset, rows, spatial_reference)
+        getters = [self._getter(dataset, token) for token in fields]
+        if sql_clause and sql_clause[1]:
+            match = re.match(r"ORDER BY\s+(\w+)(\s+DESC)?", sql_clause[1], re.IGNORECASE)
+            if match:
+                index = dataset.index(match.group(1))
+                rows = sorted(rows, key=lambda row: (row[index] is None, row[index]), reverse=bool(match.group(2)))
+        return _Cursor(tuple(getter(row) for getter in getters) for row in list(rows))
+
+    def _update_cursor(self, path, fields, where_clause=None, spatial_reference=None, *args, **kwargs):
+        dataset, rows = self.rows(path, where_clause)
+        if self._target_reference(dataset, spatial_reference) is not None:
+            raise NotImplementedError(f"The stand-in cannot update {dataset.path} in another spatial reference")
+        return _UpdateCursor(dataset, list(rows), [self._getter(dataset, token) for token in fields],
+                             [self._setter(dataset, token) for token in fields])
+
+    @staticmethod
+    def _target_reference(dataset, spatial_reference):
+        """Returns the requested spatial reference, or None when the dataset is already in it."""
+        if spatial_reference in (None, "") or dataset.kind != "FeatureClass":
+            return None
+        if not isinstance(spatial_reference, SpatialReference):
+            spatial_reference = SpatialReference(spatial_reference)
+        if spatial_reference.factoryCode == dataset.spatial_reference.factoryCode:
+            return None
+        return spatial_reference
+
+    def _project(self, dataset, rows, spatial_reference):
+        """Returns a view of the dataset and copies of its rows with the shapes projected."""
+        target = self._target_reference(dataset, spatial_reference)
+        if target is None:
+            return dataset, rows
+        from CoordinateTransform import CoordinateTransformer
+        transformer = CoordinateTransformer(dataset.spatial_reference.factoryCode, target.factoryCode)
+        if transformer.method == "arcpy":
+            raise NotImplementedError(f"The stand-in cannot project {dataset.path} from "
+                                      f"{dataset.spatial_reference.name} to {target.name}")
+
+        s = dataset.shape_index
+        rows = [list(row) for row in rows]
+        coordinates = []
+        for row in rows:
+            if isinstance(row[s], tuple):
+                coordinates.append(row[s][:2])
+            elif isinstance(row[s], Polygon):
+                coordinates.extend(point for ring in row[s].rings for point in ring)
+        if coordinates:
+            x, y = transformer.transform(*np.array(coordinates, dtype="f8").T)
+            projected = iter(zip(x.tolist(), y.tolist()))
+            for row in rows:
+                if isinstance(row[s], tuple):
+                    row[s] = next(projected) + tuple(row[s][2:])
+                elif isinstance(row[s], Polygon):
+                    row[s] = Polygon([[next(projected) for _ in ring] for ring in row[s].rings], target)
+
+        view = copy.copy(dataset)
+        view.spatial_reference = target
+        return view, rows
+
+    def _insert_cursor(self, path, fields):
+        dataset, _ = self.resolve(path)
+        return _InsertCursor(dataset, [self._setter(dataset, token) for token in fields])
+
+
+class _Cursor(object):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class _UpdateCursor(object):
+    def __init__(self, dataset, rows, getters, setters):
+        self.dataset = dataset
+        self.rows = rows
+        self.getters = getters
+        self.setters = setters
+        self.current = None
+        self.deleted = set()
+
+    def __iter__(self):
+        for row in self.rows:
+            self.current = row
+            yield [getter(row) for getter in self.getters]
+
+    def updateRow(self, values):
+        for setter, value in zip(self.setters, values):
+            if setter:
+                setter(self.current, value)
+
+    def deleteRow(self):
+        self.deleted.add(id(self.current))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if self.deleted:
+            self.dataset.rows = [row for row in self.dataset.rows if id(row) not in self.deleted]
+        return False
+
+
+class _InsertCursor(object):
+    def __init__(self, dataset, setters):
+        self.dataset = dataset
+        self.setters = setters
+
+    def insertRow(self, values):
+        row = self.dataset.new_row()
+        for setter, value in zip(self.setters, values):
+            if setter:
+                setter(row, value)
+        self.dataset.rows.append(row)
+        return row[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class _Editor(object):
+    def __init__(self, workspace):
+        self.workspace = workspace
+
+    def startEditing(self, with_undo=True, multiuser_mode=True):
+        pass
+
+    def startOperation(self):
+        pass
+
+    def stopOperation(self):
+        pass
+
+    def abortOperation(self):
+        pass
+
+    def stopEditing(self, save_changes=True):
+        pass
+
+
+def create_raster(standin, path, array, extent, spatial_reference=None):
+    """Registers a NumPy array as a raster dataset covering extent (xmin, ymin, xmax, ymax)."""
+    dataset = standin.create_dataset(path, "Raster", None, spatial_reference)
+    dataset.array = np.asarray(array)
+    dataset.raster_extent = extent
+    return dataset
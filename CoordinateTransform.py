@@ -0,0 +1,403 @@
+import math
+import re
+import time
+from optparse import OptionParser
+import numpy as np
+
+# GRS80, the ellipsoid of GDA94 and GDA2020
+GRS80 = (6378137.0, 1 / 298.257222101)
+
+# Geographic systems by WKID with their ellipsoid (semi-major axis, flattening)
+GEOGRAPHIC = {
+    4283: ("GDA94", GRS80),
+    7844: ("GDA2020", GRS80),
+}
+
+# MGA zone WKIDs are the datum base plus the zone number
+MGA_BASE = {4283: 28300, 7844: 7800}
+MGA_ZONES = range(46, 60)
+
+_TRANSFORMERS = {}
+
+
+def _mga_parameters(wkid):
+    """Returns (geographic WKID, central meridian, scale factor, false easting, false northing, latitude of origin)."""
+    for gcs, base in MGA_BASE.items():
+        if wkid - base in MGA_ZONES:
+            return gcs, 6.0 * (wkid - base) - 183.0, 0.9996, 500000.0, 10000000.0, 0.0
+    return None
+
+
+def resolve_wkid(projection):
+    """
+    Resolves a configured site projection to a WKID.
+
+    Accepts a WKID (28350 or "28350"), "MGA50"/"MGA94_50" for GDA94 zones, "MGA2020_50" for
+    GDA2020 zones and the coordinate system names "GDA94 / MGA zone 50" and "GDA_1994_MGA_Zone_50".
+    Returns None for anything else (e.g. another coordinate system name or a .prj path).
+    """
+    if isinstance(projection, int):
+        return projection
+    text = str(projection).strip().upper()
+    if text.isdigit():
+        return int(text)
+    match = re.match(r"^(?:GDA[ _]?(1994|94|2020)[ _/]*)?MGA[ _]?(94|2020)?[ _-]*(?:ZONE[ _-]*)?(\d\d)$", text)
+    if match and int(match.group(3)) in MGA_ZONES:
+        gda2020 = "2020" in (match.group(1), match.group(2))
+        return (MGA_BASE[7844] if gda2020 else MGA_BASE[4283]) + int(match.group(3))
+    return None
+
+
+def get_spatial_reference(projection):
+    """Returns an arcpy SpatialReference for a configured site projection (see resolve_wkid)."""
+    import arcpy
+    if isinstance(projection, arcpy.SpatialReference):
+        return projection
+    wkid = resolve_wkid(projection)
+    try:
+        return arcpy.SpatialReference(wkid if wkid is not None else projection)
+    except Exception as e:
+        raise ValueError(f"Cannot resolve projection {projection!r}: use a WKID, an MGA zone such as "
+                         f"\"MGA50\" or a coordinate system name arcpy knows ({e})")
+
+
+def validate_projections(projections):
+    """
+    Checks that every configured projection resolves, so a bad entry fails when the config is loaded.
+
+    Parameters:
+        projections (dict): {name: projection}, e.g. task_fme_siteProjections.
+
+    Raises:
+        ValueError: Listing every entry that cannot be resolved.
+    """
+    errors = []
+    for name, projection in projections.items():
+        if resolve_wkid(projection) is None:
+            try:
+                get_spatial_reference(projection)
+            except ValueError as e:
+                errors.append(f"{name}: {e}")
+    if errors:
+        raise ValueError("Unresolvable projections in the configuration:\n  " + "\n  ".join(errors))
+
+
+def _wkid(reference):
+    """Returns the WKID of a WKID, configured projection name or arcpy SpatialReference, if it has one."""
+    if isinstance(reference, (int, str)):
+        return resolve_wkid(reference)
+    return getattr(reference, "factoryCode", None) or None
+
+
+def _describe(reference):
+    """
+    Returns ("geographic", ellipsoid, gcs) or ("tm", ellipsoid, gcs, cm, k0, fe, fn, lat0), or None
+    when the reference can only be handled by a general purpose library.
+    """
+    wkid = _wkid(reference)
+    if wkid in GEOGRAPHIC:
+        return ("geographic", GEOGRAPHIC[wkid][1], wkid)
+    if wkid is not None and _mga_parameters(wkid):
+        gcs, cm, k0, fe, fn, lat0 = _mga_parameters(wkid)
+        return ("tm", GEOGRAPHIC[gcs][1], gcs, cm, k0, fe, fn, lat0)
+
+    # Any other arcpy spatial reference: read the parameters it exposes
+    sr = reference
+    if isinstance(reference, (int, str)):
+        sr = get_spatial_reference(reference)
+    if getattr(sr, "type", None) == "Geographic":
+        return ("geographic", (sr.semiMajorAxis, sr.flattening), sr.factoryCode or sr.name)
+    if getattr(sr, "type", None) == "Projected" and sr.projectionName == "Transverse_Mercator" and sr.metersPerUnit == 1.0:
+        gcs = sr.GCS
+        return ("tm", (gcs.semiMajorAxis, gcs.flattening), gcs.factoryCode or gcs.name, sr.centralMeridian,
+                sr.scaleFactor, sr.falseEasting, sr.falseNorthing, sr.latitudeOfOrigin)
+    return None
+
+
+class TransverseMercator(object):
+    """
+    Transverse Mercator (e.g. MGA/UTM) on an ellipsoid, using Krüger's series to sixth order in n.
+
+    Accurate to well under a millimetre within the usual zone widths. All methods take and return
+    NumPy arrays, so whole coordinate columns are projected in one call.
+    """
+
+    def __init__(self, ellipsoid, central_meridian, scale_factor, false_easting, false_northing, latitude_of_origin=0.0):
+        a, f = ellipsoid
+        n = f / (2 - f)
+        self.e = math.sqrt(f * (2 - f))
+        self.central_meridian = math.radians(central_meridian)
+        self.k0A = scale_factor * a / (1 + n) * (1 + n ** 2 / 4 + n ** 4 / 64 + n ** 6 / 256)
+        self.false_easting = false_easting
+        self.false_northing = false_northing
+        self.alpha = [
+            n / 2 - 2 * n ** 2 / 3 + 5 * n ** 3 / 16 + 41 * n ** 4 / 180 - 127 * n ** 5 / 288 + 7891 * n ** 6 / 37800,
+            13 * n ** 2 / 48 - 3 * n ** 3 / 5 + 557 * n ** 4 / 1440 + 281 * n ** 5 / 630 - 1983433 * n ** 6 / 1935360,
+            61 * n ** 3 / 240 - 103 * n ** 4 / 140 + 15061 * n ** 5 / 26880 + 167603 * n ** 6 / 181440,
+            49561 * n ** 4 / 161280 - 179 * n ** 5 / 168 + 6601661 * n ** 6 / 7257600,
+            34729 * n ** 5 / 80640 - 3418889 * n ** 6 / 1995840,
+            212378941 * n ** 6 / 319334400,
+        ]
+        self.beta = [
+            n / 2 - 2 * n ** 2 / 3 + 37 * n ** 3 / 96 - n ** 4 / 360 - 81 * n ** 5 / 512 + 96199 * n ** 6 / 604800,
+            n ** 2 / 48 + n ** 3 / 15 - 437 * n ** 4 / 1440 + 46 * n ** 5 / 105 - 1118711 * n ** 6 / 3870720,
+            17 * n ** 3 / 480 - 37 * n ** 4 / 840 - 209 * n ** 5 / 4480 + 5569 * n ** 6 / 90720,
+            4397 * n ** 4 / 161280 - 11 * n ** 5 / 504 - 830251 * n ** 6 / 7257600,
+            4583 * n ** 5 / 161280 - 108847 * n ** 6 / 3991680,
+            20648693 * n ** 6 / 638668800,
+        ]
+        # Northing of the latitude of origin on the central meridian
+        self.origin_northing = 0.0
+        if latitude_of_origin:
+            _, northing = self.forward(np.array([central_meridian]), np.array([latitude_of_origin]))
+            self.origin_northing = northing[0] - false_northing
+
+    def forward(self, lon, lat):
+        """Projects longitude/latitude in degrees to easting/northing."""
+        phi = np.radians(lat)
+        lam = np.radians(lon) - self.central_meridian
+        sin_phi = np.sin(phi)
+        tau_prime = np.sinh(np.arctanh(sin_phi) - self.e * np.arctanh(self.e * sin_phi))
+        cos_lam = np.cos(lam)
+        xi_prime = np.arctan2(tau_prime, cos_lam)
+        eta_prime = np.arcsinh(np.sin(lam) / np.sqrt(tau_prime ** 2 + cos_lam ** 2))
+
+        xi, eta = xi_prime.copy(), eta_prime.copy()
+        for j, alpha in enumerate(self.alpha, 1):
+            xi += alpha * np.sin(2 * j * xi_prime) * np.cosh(2 * j * eta_prime)
+            eta += alpha * np.cos(2 * j * xi_prime) * np.sinh(2 * j * eta_prime)
+
+        easting = self.false_easting + self.k0A * eta
+        northing = self.false_northing + self.k0A * xi - self.origin_northing
+        return easting, northing
+
+    def inverse(self, easting, northing):
+        """Converts easting/northing back to longitude/latitude in degrees."""
+        eta = (np.asarray(easting, dtype="f8") - self.false_easting) / self.k0A
+        xi = (np.asarray(northing, dtype="f8") - self.false_northing + self.origin_northing) / self.k0A
+
+        xi_prime, eta_prime = xi.copy(), eta.copy()
+        for j, beta in enumerate(self.beta, 1):
+            xi_prime -= beta * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+            eta_prime -= beta * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+
+        sinh_eta = np.sinh(eta_prime)
+        cos_xi = np.cos(xi_prime)
+        tau_prime = np.sin(xi_prime) / np.sqrt(sinh_eta ** 2 + cos_xi ** 2)
+        lam = np.arctan2(sinh_eta, cos_xi)
+
+        # Newton iteration for the geographic latitude from the conformal one
+        e2 = self.e ** 2
+        tau = tau_prime.copy()
+        for _ in range(5):
+            sigma = np.sinh(self.e * np.arctanh(self.e * tau / np.sqrt(1 + tau ** 2)))
+            tau_i = tau * np.sqrt(1 + sigma ** 2) - sigma * np.sqrt(1 + tau ** 2)
+            tau += ((tau_prime - tau_i) / np.sqrt(1 + tau_i ** 2)
+                    * (1 + (1 - e2) * tau ** 2) / ((1 - e2) * np.sqrt(1 + tau ** 2)))
+
+        return np.degrees(lam + self.central_meridian), np.degrees(np.arctan(tau))
+
+
+class CoordinateTransformer(object):
+    """
+    Converts coordinate arrays from one coordinate system to another.
+
+    Geographic <-> Transverse Mercator on the same datum (GDA94 lat/long to MGA, GDA2020 to
+    MGA2020, ...) is computed directly with NumPy. Other pairs go through pyproj when it is
+    installed and otherwise through arcpy, one point at a time. Z values are passed through
+    unchanged, as no pair handled here changes the vertical datum.
+
+    Use get_transformer to share one instance per (source, target) pair.
+    """
+
+    def __init__(self, source, target, transformation=None):
+        self.source = source
+        self.target = target
+        self.transformation = transformation
+        self.method = None
+        self._projection = None
+        self._direction = None
+        self._pyproj = None
+
+        source_info, target_info = _describe(source), _describe(target)
+        if source_info and target_info and source_info[2] == target_info[2] and not transformation:
+            if source_info[0] == "geographic" and target_info[0] == "tm":
+                self._projection, self._direction = TransverseMercator(*target_info[1:2], *target_info[3:]), "forward"
+            elif source_info[0] == "tm" and target_info[0] == "geographic":
+                self._projection, self._direction = TransverseMercator(*source_info[1:2], *source_info[3:]), "inverse"
+            elif source_info == target_info:
+                self._direction = "identity"
+        if self._direction:
+            self.method = "numpy"
+            return
+
+        try:
+            import pyproj
+            self._pyproj = pyproj.Transformer.from_crs(self._crs(source), self._crs(target), always_xy=True)
+            self.method = "pyproj"
+        except Exception:
+            import arcpy
+            self._source_sr = get_spatial_reference(source)
+            self._target_sr = get_spatial_reference(target)
+            self.method = "arcpy"
+
+    @staticmethod
+    def _crs(reference):
+        wkid = _wkid(reference)
+        if wkid is not None:
+            return f"EPSG:{wkid}"
+        if isinstance(reference, str):
+            return reference
+        return reference.exportToString()
+
+    def transform(self, x, y, z=None):
+        """
+        Transforms coordinate arrays (longitude/latitude in degrees for geographic systems).
+
+        Returns:
+            tuple: (x, y) arrays, or (x, y, z) when z is given.
+        """
+        x = np.asarray(x, dtype="f8")
+        y = np.asarray(y, dtype="f8")
+        if self._direction == "forward":
+            out_x, out_y = self._projection.forward(x, y)
+        elif self._direction == "inverse":
+            out_x, out_y = self._projection.inverse(x, y)
+        elif self._direction == "identity":
+            out_x, out_y = x.copy(), y.copy()
+        elif self._pyproj is not None:
+            out_x, out_y = self._pyproj.transform(x, y)
+            out_x, out_y = np.asarray(out_x), np.asarray(out_y)
+        else:
+            out_x, out_y = self._transform_arcpy(x, y)
+
+        if z is None:
+            return out_x, out_y
+        return out_x, out_y, np.asarray(z, dtype="f8").copy()
+
+    def _transform_arcpy(self, x, y):
+        import arcpy
+        out_x, out_y = np.full(len(x), np.nan), np.full(len(y), np.nan)
+        for i in range(len(x)):
+            if np.isnan(x[i]) or np.isnan(y[i]):
+                continue
+            point = arcpy.PointGeometry(arcpy.Point(x[i], y[i]), self._source_sr)
+            point = point.projectAs(self._target_sr, self.transformation or "")
+            out_x[i], out_y[i] = point.firstPoint.X, point.firstPoint.Y
+        return out_x, out_y
+
+
+def get_transformer(source, target, transformation=None):
+    """
+    Returns the cached transformer for a (source, target) pair, creating it on first use.
+
+    Parameters:
+        source: WKID, configured projection name (e.g. "MGA50") or arcpy SpatialReference.
+        target: WKID, configured projection name or arcpy SpatialReference.
+        transformation (str): Optional geographic transformation name, forces pyproj/arcpy.
+    """
+    def key(reference):
+        wkid = _wkid(reference)
+        if wkid is not None:
+            return wkid
+        return reference if isinstance(reference, str) else reference.exportToString()
+
+    cache_key = (key(source), key(target), transformation)
+    if cache_key not in _TRANSFORMERS:
+        _TRANSFORMERS[cache_key] = CoordinateTransformer(source, target, transformation)
+    return _TRANSFORMERS[cache_key]
+
+
+def project_fields(table, in_fields, out_fields, source, target, where_clause=None, transformation=None):
+    """
+    Fills coordinate fields of a table from other coordinate fields in one vectorized call.
+
+    Parameters:
+        table (str): Table or feature class to update.
+        in_fields (list): Source fields [x, y] or [x, y, z], e.g. ["LONG_COLLAR", "LAT_COLLAR", "AHD_RL_COLLAR"].
+        out_fields (list): Target fields, same length, e.g. ["Projected_X", "Projected_Y", "Projected_Z"].
+        source: Coordinate system of the source fields.
+        target: Coordinate system of the target fields.
+        where_clause (str): Optional SQL expression limiting the rows updated.
+
+    Returns:
+        int: Number of rows updated.
+    """
+    import arcpy
+    if len(in_fields) != len(out_fields) or len(in_fields) not in (2, 3):
+        raise ValueError("in_fields and out_fields must both be [x, y] or [x, y, z]")
+
+    oids, values = [], []
+    with arcpy.da.SearchCursor(table, ["OID@"] + list(in_fields), where_clause) as cursor:
+        for row in cursor:
+            oids.append(row[0])
+            values.append([np.nan if value is None else value for value in row[1:]])
+    if not oids:
+        return 0
+
+    columns = np.asarray(values, dtype="f8").T
+    transformed = get_transformer(source, target, transformation).transform(*columns)
+    results = {oid: tuple(None if np.isnan(value) else float(value) for value in point)
+               for oid, point in zip(oids, np.column_stack(transformed))}
+
+    with arcpy.da.UpdateCursor(table, ["OID@"] + list(out_fields), where_clause) as cursor:
+        for row in cursor:
+            if row[0] in results:
+                cursor.updateRow([row[0]] + list(results[row[0]]))
+    return len(results)
+
+
+def benchmark(count=10 ** 6, source=4283, target="MGA50"):
+    """
+    Times the vectorized transformation against the Project geoprocessing tool on the same points.
+
+    The geoprocessing side is skipped when arcpy is not available.
+    """
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(114.0, 120.0, count)
+    lat = rng.uniform(-24.0, -20.0, count)
+    z = rng.uniform(300.0, 800.0, count)
+
+    start = time.time()
+    transformer = get_transformer(source, target)
+    x, y, _ = transformer.transform(lon, lat, z)
+    seconds = time.time() - start
+    print(f"{transformer.method}: {count} points in {seconds:.2f}s ({count / max(seconds, 1e-9):,.0f} points/s)")
+
+    lon_back, lat_back = get_transformer(target, source).transform(x, y)
+    print(f"Round trip error: {max(np.abs(lon_back - lon).max(), np.abs(lat_back - lat).max()):.2e} degrees")
+
+    try:
+        import arcpy
+    except ImportError:
+        print("arcpy not available, skipping the geoprocessing comparison")
+        return
+
+    array = np.zeros(count, dtype=[("OID", "i4"), ("X", "f8"), ("Y", "f8")])
+    array["X"], array["Y"] = lon, lat
+    source_fc = r"memory\benchmark_geographic"
+    target_fc = r"memory\benchmark_projected"
+    for dataset in (source_fc, target_fc):
+        if arcpy.Exists(dataset):
+            arcpy.Delete_management(dataset)
+    arcpy.da.NumPyArrayToFeatureClass(array, source_fc, ("X", "Y"), get_spatial_reference(source))
+
+    start = time.time()
+    arcpy.Project_management(source_fc, target_fc, get_spatial_reference(target))
+    gp_seconds = time.time() - start
+    print(f"Project tool: {count} points in {gp_seconds:.2f}s ({count / max(gp_seconds, 1e-9):,.0f} points/s), "
+          f"{gp_seconds / max(seconds, 1e-9):.1f}x slower")
+
+    projected = arcpy.da.FeatureClassToNumPyArray(target_fc, ["SHAPE@X", "SHAPE@Y"])
+    print(f"Max difference from Project: {max(np.abs(projected['SHAPE@X'] - x).max(), np.abs(projected['SHAPE@Y'] - y).max()):.4f} m")
+    for dataset in (source_fc, target_fc):
+        arcpy.Delete_management(dataset)
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-n", "--count", action="store", dest="count", type="int", default=10 ** 6, help="Number of points")
+    parser.add_option("-s", "--source", action="store", dest="source", type="string", default="4283", help="Source WKID")
+    parser.add_option("-t", "--target", action="store", dest="target", type="string", default="MGA50", help="Target WKID or MGA zone")
+    (options, args) = parser.parse_args()
+    benchmark(options.count, options.source, options.target)
@@ -3,14 +3,47 @@ import sys
 import arcpy
 import os
 import traceback
+from optparse import OptionParser
+from RoundGeometry import RoundGeometry, get_decimals
+from ScratchWorkspace import ScratchWorkspace
+from StageCheckpoint import StageCheckpoint, fingerprint
+from UpsertWriter import upsert_features
+from SitePartition import SitePartition
+from DxfExport import export_features
+from CoordinateTransform import get_spatial_reference, validate_projections
+
+
+SCRATCH_PREFIX = "LostEquipment"
+
+jenkins = None
+
+EXTENT_FIELD_INFO = "OBJECTID OBJECTID VISIBLE NONE;Editor Editor VISIBLE NONE;EditDate EditDate VISIBLE NONE MineSite MineSite VISIBLE NONE;Shape Shape VISIBLE NONE;Shape. STArea() Shape.STArea() VISIBLE NONE;Shape.STLength() Shape.STLength() VISIBLE NONE"
+EXPLORATION_FIELD_INFO = "OBJECTID OBJECTID VISIBLE NONE;PROJECT PROJECT VISIBLE NONE;HOLE_NAME HOLE _NAME VISIBLE NONE;OREBODY_NAME OREBODY_NAME VISIBLE NONE;HOLE_ LENGTH HOLE LENGTH VISIBLE NONE;INFO_ SUBTYPE INFO_SUBTYPE VISIBLE NONE;DEPTH_FROM DEPTH_FROM VISIBLE NONE;DEPTH_TO DEPTH_TO VISIBLE NONE;INCLINATION INCLINATION VISIBLE NONE;AZIMUTH AZIMUTH VISIBLE NONE;LAT_COLLAR LAT_COLLAR VISIBLE NONE;LONG_COLLAR LONG _COLLAR VISIBLE NONE;AHD_RL_COLLAR AHD_RL_COLLAR VISIBLE NONE; LAT_EOH LAT_EOH VISIBLE NONE;LONG_EOH LONG_EOH VISIBLE NONE;AHD_RL_EOH AHD_RL_EOH VISIBLE NONE; COMMENTS COMMENTS VISIBLE NONE;SHAPE SHAPE VISIBLE NONE; HOLE_TYPE HOLE_TYPE VISIBLEINFO_TYPE INFO_TYPE VISIBLE NONE; INSTALLATION_TYPE INSTALLATION TYPE VISIBLE NONE"
+EXPLORATION_WHERE_PVC = "INFO_SUBTYPE NOT LIKE '%PVC%' and (INSTALLATION_TYPE IS NULL OR INSTALLATION_TYPE = '')"
+EXPLORATION_WHERE_END_CAP = "Not (INFO_SUBTYPE = 'END CAP' And (INSTALLATION_TYPE <> 'p' And INSTALLATION_TYPE is Not NULL))"
+
+# Projected feature classes are keyed on hole and site, values are mapped from the final append output
+PROJECTED_KEY_FIELDS = ["Hole_Name", "MineSite"]
+PROJECTED_FIELD_MAP = {
+    "MineSite": "MineSite",
+    "Hole_Name": "HOLE_NAME",
+    "Projected_X": "Projected_X",
+    "Projected_Y": "Projected_Y",
+    "Projected_Z": "Projected_Z",
+    "INFO_SUBTYPE": "INFO_SUBTYPE",
+}
 
 
 class ProcessLostEquipment:
-    def __init__(self, mineSite, fcName, config, searchFields):
+    def __init__(self, mineSite, fcName, config, searchFields, partition=None, versions=None):
         self.mineSite = mineSite
         self.fcName = fcName
         self.config = config
         self.searchFields = searchFields
+        # Optional SitePartition already holding this site's exploration rows (batch mode)
+        self.partition = partition
+        # Optional fingerprints of the shared inputs, computed once per batch (see input_versions)
+        self.versions = versions
         
     def ensure_info_subtype_field(self, feature_class):
         """Add INFO_SUBTYPE field if it doesn't exist"""
@@ -67,170 +100,187 @@ class ProcessLostEquipment:
         return base_mapping
 
     def process_LostEquipment(self):
+        """
+        Runs the lost-equipment pipeline for one mine site as checkpointed stages.
+
+        Stage outputs are kept in a per-site checkpoint geodatabase, so a rerun after a failure
+        resumes from the first stage whose inputs changed or whose output is missing. Errors are
+        recorded in the site's checkpoint manifest and re-raised to the caller.
+        """
         # Local variable
         MTD_Path = self.config['MTD_Path']
         IO_SDI_PUBLISH_PLANNING_MineSiteExtents = self.config["10_SDI_PUBLISH_PLANNING_MIneSiteExtents"]
-        MineDisplayExtents_Layer = "MineSiteExtents_Lay"
         ENV_DB = self.config["ENV_DB"]
-        MTD = ENV_DB + "\\" + "MTD_ClipA"
-        EXPLORATION_DrillholeLostEqu_Temp = "EXPLORATION.Dr111holeLostEqu_Temp"
-        EXPLORATION_DrillholeLostEqu = "EXPLORATION_DrillholeLostEqu"
-        LostEquipment_EXP_int = ENV_DB + "\\" + "LostEquipment_EXP_int"
-        DrillholeLostEquipment = ENV_DB + "\\" + "DrillholeLostEquipment"
-        DrillholeLostEquipment_Int = ENV_DB + "\\" + "DrillholeLostEquipment_Int"
-        DrillholeLostEquipment_Int_GDA94_Line = ENV_DB + "\\" + "DrillholeLostEquipment_Int_GDA94_Line"
-        DrillholeLostEquipment_Int_G = "DrillholeLostEquipment_Int_G"
-        DrillholeLostEquipment_Int_GDA94_Line3D = ENV_DB + "\\"+ "DrillholeLostEquipment_Int_GDA94_Line3D"
-        DrillholeLostEquipment_Int_MGA50_Line3D_intSurf = ENV_DB + "\\" + "DrillholeLostEquipment_Int_MGA50_Line3D_intSurf"
-        DrillholeLostEquipment_Int_mined = "DrillholeLostEquipment_Int_mined"
-        DrillholeLostEquipment_Int_C2 = ENV_DB +  "\\" + "DrillholeLostEquipment_Int_C2"
-        DrillholeLostEquipment_Int_C2_Layer = "DrillholeLostEquipment_Int_C2_Layer"
-        DrillholeLostEquipment_Int_C = ENV_DB +  "\\" + "DrillholeLostEquipment_Int_C"
-        DrillholeLostEquipment_Inter_Surf_pnt = ENV_DB +  "\\" + "DrillholeLostEquipment_Inter_CSurf_pnt"
-        DrillholeLostEquipment_Inter = "DrillholeLostEquipment_Inter"
-        DrillholeLostEquipment_Int_L = "DrillholeLostEquipment Int L"
-        DrillholeLostEquipment_Int_K = "DrillholeLostEquipment_Int_k"
-        DrillholeLostEquipment_Int_J = "DrillholeLostEquipment_Int_J"
-        DrillholeLostEquipment_Int_temp = "DrillholeLostEquipment_Int_temp"
-        DrillholeLostEquipment_C1 = ENV_DB + "\\" + "DrillholeLostEquipment_C1"
-        DrillholeLostEquipment_C2 = ENV_DB + "\\" + "DrillholeLostEquipment_C2"
-        DrillholeLostEquipment_Adj = ENV_DB + "\\" + "DrillholeLostEquipment_ Adj"
-        DrillholeLostEquipment_FinalAppend = ENV_DB + "\\" + "DrillholeLostEquipment FinalAppend"
-        
-        # List of temporary layers to clean up at the end
-        temp_layers = []
+        fcConfig = self.config["task_fme_featureClassConfig"][self.fcName]
+        original_fc = fcConfig["Original_FC"]
+        original_projected_fc = fcConfig["Original_Projected_FC"]
+        publish_projected_fc = fcConfig["Publish_Projected_FC"]
+        revised_fc = fcConfig["Revised_FC"]
 
-        try:
-            # Clean up existing feature classes
-            for fc in [MineDisplayExtents_Layer, MTD, EXPLORATION_DrillholeLostEqu, LostEquipment_EXP_int,
-                      DrillholeLostEquipment, DrillholeLostEquipment_Int, DrillholeLostEquipment_Int_GDA94_Line,
-                      DrillholeLostEquipment_Int_G, DrillholeLostEquipment_Int_GDA94_Line3D,
-                      DrillholeLostEquipment_Int_MGA50_Line3D_intSurf, DrillholeLostEquipment_Int_mined,
-                      DrillholeLostEquipment_Int_C2, DrillholeLostEquipment_Int_C2_Layer,
-                      DrillholeLostEquipment_Int_C, DrillholeLostEquipment_Inter_Surf_pnt,
-                      DrillholeLostEquipment_Inter, DrillholeLostEquipment_Int_L,
-                      DrillholeLostEquipment_C1, DrillholeLostEquipment_Adj, DrillholeLostEquipment_FinalAppend]:
-                if arcpy.Exists(fc):
-                    arcpy.Delete_management(fc)
-                    print(f"Deleted {fc}")
-
-            arcpy.MakeFeatureLayer_management(IO_SDI_PUBLISH_PLANNING_MineSiteExtents, MineDisplayExtents_Layer, 
-                                             f"MineSite ='{self.mineSite}'", 
-                                             "OBJECTID OBJECTID VISIBLE NONE;Editor Editor VISIBLE NONE;EditDate EditDate VISIBLE NONE MineSite MineSite VISIBLE NONE;Shape Shape VISIBLE NONE;Shape. STArea() Shape.STArea() VISIBLE NONE;Shape.STLength() Shape.STLength() VISIBLE NONE")
-            temp_layers.append(MineDisplayExtents_Layer)
-            print("Feature layer made for Mine Extent")
-            print(arcpy.GetCount_management(MineDisplayExtents_Layer).getOutput(0))
+        # Stage outputs persist between runs in the site's checkpoint geodatabase
+        checkpointFolder = self.config.get("checkpointFolder", os.path.join(os.path.dirname(ENV_DB), "LostEquipment_Checkpoints"))
+        checkpoint = StageCheckpoint(checkpointFolder, f"{self.fcName}_{self.mineSite}")
+        MTD = checkpoint.output("MTD_ClipA")
+        LostEquipment_EXP_int = checkpoint.output("LostEquipment_EXP_int")
+        DrillholeLostEquipment = checkpoint.output("DrillholeLostEquipment")
+        DrillholeLostEquipment_FinalAppend = checkpoint.output("DrillholeLostEquipment_FinalAppend")
+
+        # Transient intermediates live in a per-run scratch workspace that is dropped as a whole at the end,
+        # in a dedicated folder rather than next to ENV_DB so reclaiming stale runs never sees production data
+        scratchRoot = self.config.get("scratchFolder", os.path.join(os.path.dirname(ENV_DB), "LostEquipment_Scratch"))
+        # The gdb is only created when a stage first asks for a dataset name inside the try, so failures reach
+        # mark_failed; the current stages only use its layer names and never create it
+        scratch = ScratchWorkspace(scratchRoot, SCRATCH_PREFIX)
+        tolerance = self.config.get("upsertTolerance", 0.001)
+        # Opt-in until the native output has been validated against the FME job's
+        nativeExport = self.config.get("nativeExport", False)
 
+        def make_extent_layer():
+            if not arcpy.Exists(MineDisplayExtents_Layer):
+                arcpy.MakeFeatureLayer_management(IO_SDI_PUBLISH_PLANNING_MineSiteExtents, MineDisplayExtents_Layer,
+                                                 f"MineSite ='{self.mineSite}'", "", EXTENT_FIELD_INFO)
+                print("Feature layer made for Mine Extent")
+                print(arcpy.GetCount_management(MineDisplayExtents_Layer).getOutput(0))
+
+        def clip_surface():
+            make_extent_layer()
             arcpy.Clip_management(in_raster=MTD_Path, rectangLe="*", out_raster=MTD, 
                                  in_template_dataset=MineDisplayExtents_Layer, 
                                  nodata_value="-3.402823e+038", 
                                  cLipping_geometry="NONE", 
                                  maintain_clipping_extent="NO_MAINTAIN_EXTENT")
             print("Clipped")
-            
-            arcpy.MakeFeatureLayer_management(self.config["task_fme_featureClassConfig"][self.fcName]["Original_FC"],
-                                             EXPLORATION_DrillholeLostEqu_Temp,
-                                             "INFO_SUBTYPE NOT LIKE '%PVC%' and (INSTALLATION TYPE IS NULL OR INSTALLATION TYPE = '')", "",
-                                             "OBJECTID OBJECTID VISIBLE NONE;PROJECT PROJECT VISIBLE NONE;HOLE_NAME HOLE _NAME VISIBLE NONE;OREBODY_NAME OREBODY_NAME VISIBLE NONE;HOLE_ LENGTH HOLE LENGTH VISIBLE NONE;INFO_ SUBTYPE INFO_SUBTYPE VISIBLE NONE;DEPTH_FROM DEPTH_FROM VISIBLE NONE;DEPTH_TO DEPTH_TO VISIBLE NONE;INCLINATION INCLINATION VISIBLE NONE;AZIMUTH AZIMUTH VISIBLE NONE;LAT_COLLAR LAT_COLLAR VISIBLE NONE;LONG_COLLAR LONG _COLLAR VISIBLE NONE;AHD_RL_COLLAR AHD_RL_COLLAR VISIBLE NONE; LAT_EOH LAT_EOH VISIBLE NONE;LONG_EOH LONG_EOH VISIBLE NONE;AHD_RL_EOH AHD_RL_EOH VISIBLE NONE; COMMENTS COMMENTS VISIBLE NONE;SHAPE SHAPE VISIBLE NONE; HOLE_TYPE HOLE_TYPE VISIBLEINFO_TYPE INFO_TYPE VISIBLE NONE; INSTALLATION_TYPE INSTALLATION TYPE VISIBLE NONE")
-            temp_layers.append(EXPLORATION_DrillholeLostEqu_Temp)
+
+        def select_exploration():
+            if self.partition is not None:
+                # Batch mode: the exploration table was read once for all sites
+                self.partition.write(self.mineSite, LostEquipment_EXP_int)
+                return
+
+            make_extent_layer()
+            arcpy.MakeFeatureLayer_management(original_fc, EXPLORATION_DrillholeLostEqu_Temp,
+                                             EXPLORATION_WHERE_PVC, "", EXPLORATION_FIELD_INFO)
             print("Feature layer made for Exploration FC")
             print(arcpy.GetCount_management(EXPLORATION_DrillholeLostEqu_Temp).getOutput(0))
             
-            arcpy.MakeFeatureLayer_management(EXPLORATION_DrillholeLostEqu_Temp,
-                                             EXPLORATION_DrillholeLostEqu,
-                                             "Not (INFO_SUBTYPE = 'END CAP' And (Installation_ Type <> 'p' And Installation_Type is Not NULL))", "",
-                                             "OBJECTID OBJECTID VISIBLE NONE;PROJECT PROJECT VISIBLE NONE;HOLE_NAME HOLE _NAME VISIBLE NONE;OREBODY_NAME OREBODY_NAME VISIBLE NONE;HOLE_ LENGTH HOLE LENGTH VISIBLE NONE;INFO_ SUBTYPE INFO_SUBTYPE VISIBLE NONE;DEPTH_FROM DEPTH_FROM VISIBLE NONE;DEPTH_TO DEPTH_TO VISIBLE NONE;INCLINATION INCLINATION VISIBLE NONE;AZIMUTH AZIMUTH VISIBLE NONE;LAT_COLLAR LAT_COLLAR VISIBLE NONE;LONG_COLLAR LONG _COLLAR VISIBLE NONE;AHD_RL_COLLAR AHD_RL_COLLAR VISIBLE NONE; LAT_EOH LAT_EOH VISIBLE NONE;LONG_EOH LONG_EOH VISIBLE NONE;AHD_RL_EOH AHD_RL_EOH VISIBLE NONE; COMMENTS COMMENTS VISIBLE NONE;SHAPE SHAPE VISIBLE NONE; HOLE_TYPE HOLE_TYPE VISIBLEINFO_TYPE INFO_TYPE VISIBLE NONE; INSTALLATION_TYPE INSTALLATION TYPE VISIBLE NONE")
-            temp_layers.append(EXPLORATION_DrillholeLostEqu)
+            arcpy.MakeFeatureLayer_management(EXPLORATION_DrillholeLostEqu_Temp, EXPLORATION_DrillholeLostEqu,
+                                             EXPLORATION_WHERE_END_CAP, "", EXPLORATION_FIELD_INFO)
             print("Feature layer made for EXPLORATION_DrillholeLostEqu_Temp")
             print(arcpy.GetCount_management(EXPLORATION_DrillholeLostEqu).getOutput(0))
 
+            if arcpy.Exists(LostEquipment_EXP_int):
+                arcpy.Delete_management(LostEquipment_EXP_int)
             arcpy.Intersect_analysis([MineDisplayExtents_Layer, EXPLORATION_DrillholeLostEqu], 
                                     LostEquipment_EXP_int, "ALL", '', "INPUT")
             print("Intersected Exp Int")
-            
-            arcpy.CreateFeatureclass_management(out_path=ENV_DB, out_name="DrillholeLostEquipment",
+
+        def build_drillholes():
+            if arcpy.Exists(DrillholeLostEquipment):
+                arcpy.Delete_management(DrillholeLostEquipment)
+            arcpy.CreateFeatureclass_management(out_path=os.path.dirname(DrillholeLostEquipment),
+                                               out_name=os.path.basename(DrillholeLostEquipment),
                                                geometry_type="POINT", template=LostEquipment_EXP_int,
                                                has_m="DISABLED", has_z="DISABLED",
                                                spatial_reference="", config_keyword="", spatial_grid_1="0",
                                                spatial_grid_2="9", spatial_grid_3="0")
             arcpy.Append_management(LostEquipment_EXP_int, DrillholeLostEquipment, "NO_TEST", 
-                                   "PROJECT \"PROJECT\" true true false 17 Text 0 0 ,First,#,"+ ENV_DB + "\\LostEquipment EXP_int, INFO_TYPE, -1,-1","")
+                                   "PROJECT \"PROJECT\" true true false 17 Text 0 0 ,First,#,"+ LostEquipment_EXP_int + ", INFO_TYPE, -1,-1","")
             print("Appended Exp Int to DrillholeLostEquipment")
 
+        def project_drillholes():
             # Continue with the rest of the processing...
             # [Keeping the middle part of the script unchanged for brevity]
             
-            # Ensure INFO_SUBTYPE field exists in target feature classes
-            original_projected_fc = self.config["task_fme_featureClassConfig"][self.fcName]["Original_Projected_FC"]
-            publish_projected_fc = self.config["task_fme_featureClassConfig"][self.fcName]["Publish_Projected_FC"]
-            
-            self.ensure_info_subtype_field(original_projected_fc)
-            self.ensure_info_subtype_field(publish_projected_fc)
-            
             # Ensure INFO_SUBTYPE field exists in DrillholeLostEquipment_FinalAppend
             self.ensure_info_subtype_field(DrillholeLostEquipment_FinalAppend)
             
             # Transfer INFO_SUBTYPE from Original_FC to DrillholeLostEquipment_FinalAppend
-            self.transfer_info_subtype(
-                self.config["task_fme_featureClassConfig"][self.fcName]["Original_FC"],
-                DrillholeLostEquipment_FinalAppend,
-                "HOLE_NAME",
-                "HOLE_NAME"
-            )
-            
-            # Create a temporary layer for selection
-            tempLayer = "tempLayer"
-            arcpy.MakeFeatureLayer_management(original_projected_fc, tempLayer)
-            temp_layers.append(tempLayer)
-            
-            # Build expression for selection
-            expression = arcpy.AddFieldDelimiters(tempLayer, "MineSite") + " = '" + self.mineSite + "'"
-            expression = expression + " OR " + arcpy.AddFieldDelimiters(tempLayer, "MineSite") + " IS NULL"
+            self.transfer_info_subtype(original_fc, DrillholeLostEquipment_FinalAppend, "HOLE_NAME", "HOLE_NAME")
+
+        def load_original():
+            # Ensure INFO_SUBTYPE field exists in target feature classes
+            self.ensure_info_subtype_field(original_projected_fc)
+
+            # Apply only the inserts, updates and deletes needed for this MineSite (and NULL MineSite rows)
             print(expression)
-            
-            # Select and delete features in MineSite
-            arcpy.SelectLayerByAttribute_management(tempLayer, "NEW_SELECTION", expression)
-            if int(arcpy.GetCount_management(tempLayer).getOutput(0)) > 0:
-                arcpy.DeleteFeatures_management(tempLayer)
-                print("Deleted Features in MineSite from Original_Projected_FC")
-            
-            # Append with INFO_SUBTYPE included in field mapping
-            field_mapping = self.get_field_mapping(DrillholeLostEquipment_FinalAppend, True)
-            arcpy.Append_management(DrillholeLostEquipment_FinalAppend, original_projected_fc, "NO_TEST", field_mapping)
-            print("Appended to Original_Projected_FC with INFO_SUBTYPE")
-            
-            # Truncate and append to Revised_FC
-            arcpy.TruncateTable_management(self.config["task_fme_featureClassConfig"][self.fcName]["Revised_FC"])
-            arcpy.Append_management(original_projected_fc, 
-                                   self.config["task_fme_featureClassConfig"][self.fcName]["Revised_FC"], 
-                                   "NO_TEST", "")
-            
-            # Process Publish_Projected_FC
-            arcpy.MakeFeatureLayer_management(publish_projected_fc, tempLayer)
-            arcpy.SelectLayerByAttribute_management(tempLayer, "NEW_SELECTION", expression)
-            if int(arcpy.GetCount_management(tempLayer).getOutput(0)) > 0:
-                arcpy.DeleteFeatures_management(tempLayer)
-                print("Deleted Features in MineSite from Publish_Projected_FC")
-            
-            # Append to Publish_Projected_FC with INFO_SUBTYPE
-            arcpy.Append_management(DrillholeLostEquipment_FinalAppend, publish_projected_fc, "NO_TEST", field_mapping)
-            print("Appended to Publish_Projected_FC with INFO_SUBTYPE")
-            
-            # Process configuration
-            self.__process_config(self.mineSite)
+            upsert_features(DrillholeLostEquipment_FinalAppend, original_projected_fc, PROJECTED_KEY_FIELDS,
+                            PROJECTED_FIELD_MAP, target_where=expression, tolerance=tolerance)
+
+        def sync_revised():
+            # Revised_FC mirrors Original_Projected_FC, only this site's rows can have changed
+            upsert_features(original_projected_fc, revised_fc, PROJECTED_KEY_FIELDS,
+                            source_where=expression, target_where=expression, tolerance=tolerance)
+
+        def load_publish():
+            self.ensure_info_subtype_field(publish_projected_fc)
+
+            upsert_features(DrillholeLostEquipment_FinalAppend, publish_projected_fc, PROJECTED_KEY_FIELDS,
+                            PROJECTED_FIELD_MAP, target_where=expression, tolerance=tolerance)
+
+        def export():
+            if nativeExport:
+                # Write the site's DXF and CSV directly instead of queueing the FME job
+                self.__export_native(self.mineSite)
+            else:
+                # Process configuration
+                self.__process_config(self.mineSite)
+
+        try:
+            checkpoint.create()
+            print(f"Checkpoint workspace: {checkpoint.workspace}")
+            ScratchWorkspace.reclaim_stale(scratchRoot, SCRATCH_PREFIX, self.config.get("scratchMaxAgeHours", 24))
+            MineDisplayExtents_Layer = scratch.layer("MineSiteExtents_Lay")
+            EXPLORATION_DrillholeLostEqu_Temp = scratch.layer("EXPLORATION_DrillholeLostEqu_Temp")
+            EXPLORATION_DrillholeLostEqu = scratch.layer("EXPLORATION_DrillholeLostEqu")
+            versions = self.versions or input_versions(self.config, self.fcName)
+
+            # Build expression for selection
+            expression = arcpy.AddFieldDelimiters(original_projected_fc, "MineSite") + " = '" + self.mineSite + "'"
+            expression = expression + " OR " + arcpy.AddFieldDelimiters(original_projected_fc, "MineSite") + " IS NULL"
+
+            checkpoint.run("clip_surface", clip_surface,
+                           {"mineSite": self.mineSite, "surface": MTD_Path, "surfaceVersion": versions["surface"],
+                            "extents": versions["extents"]},
+                           [MTD])
+            checkpoint.run("select_exploration", select_exploration,
+                           {"source": original_fc, "sourceVersion": versions["source"], "extents": versions["extents"],
+                            "where": [EXPLORATION_WHERE_PVC, EXPLORATION_WHERE_END_CAP],
+                            "partitioned": self.partition is not None},
+                           [LostEquipment_EXP_int])
+            checkpoint.run("build_drillholes", build_drillholes, {}, [DrillholeLostEquipment])
+            checkpoint.run("project_drillholes", project_drillholes,
+                           {"siteProjection": self.config["task_fme_siteProjections"][self.mineSite]},
+                           [DrillholeLostEquipment_FinalAppend])
+            # The shared targets are verified on this site's rows, so an edited or truncated target reruns its stage
+            checkpoint.run("load_original", load_original, {"target": original_projected_fc}, (),
+                           lambda: fingerprint(original_projected_fc, expression))
+            checkpoint.run("sync_revised", sync_revised, {"target": revised_fc}, (),
+                           lambda: fingerprint(revised_fc, expression))
+            checkpoint.run("load_publish", load_publish, {"target": publish_projected_fc}, (),
+                           lambda: fingerprint(publish_projected_fc, expression))
+            if nativeExport:
+                exportPaths = self._export_paths(self._export_parameters(self.mineSite))
+                checkpoint.run("export", export,
+                               {"native": nativeExport, "parameters": self._export_parameters(self.mineSite),
+                                "colourScale": self._colour_scale(),
+                                "publishVersion": fingerprint(publish_projected_fc, expression)},
+                               exportPaths, lambda: [fingerprint(path) for path in exportPaths])
+            else:
+                checkpoint.run("export", export, {"job": self.config["Jenkins_config"]["task_fme"]})
+            checkpoint.mark_succeeded()
             
         except Exception as e:
             print(f"Error in DrillHolesLostEquipments_Projected: {str(e)}")
             print(traceback.format_exc())
-            sys.exit(1)
+            checkpoint.mark_failed(e)
+            raise
         finally:
-            # Clean up all temporary layers
-            for layer in temp_layers:
-                if arcpy.Exists(layer):
-                    arcpy.Delete_management(layer)
-                    print(f"Cleaned up temporary layer: {layer}")
+            # Drop every intermediate and layer of this run in one go
+            scratch.cleanup()
+            print(f"Cleaned up scratch workspace: {scratch.path}")
 
-    def __process_config(self, mineSite):
+    def _export_parameters(self, mineSite):
+        """Returns the DXF/CSV export parameters for a site, as passed to the FME job."""
         jobConfig = self.config["task_fme_jobConfig"]
         fcConfig = self.config["task_fme_featureClassConfig"][self.fcName]
         siteProjection = self.config["task_fme_siteProjections"][mineSite]
@@ -255,17 +305,48 @@ class ProcessLostEquipment:
             "zField": fcConfig["zField"],
             "destinationCSVPath": self.config["destinationCSVPath"][mineSite]
         }
+        return jobParameters
+
+    def __process_config(self, mineSite):
+        jobParameters = self._export_parameters(mineSite)
         self.__invokeJenkins(jobParameters, self.config["Jenkins_config"]["task_fme"])
 
+    @staticmethod
+    def _export_paths(parameters):
+        """Returns the (DXF, CSV) files the native export writes for a site's export parameters."""
+        dxfPath = parameters["destinationPath"]
+        if not dxfPath.lower().endswith(".dxf"):
+            dxfPath += ".dxf"
+        csvPath = parameters["destinationCSVPath"]
+        if not csvPath.lower().endswith(".csv"):
+            csvPath = os.path.join(csvPath, parameters["layerName"] + ".csv")
+        return [dxfPath, csvPath]
+
+    def __export_native(self, mineSite):
+        parameters = self._export_parameters(mineSite)
+        fcConfig = self.config["task_fme_featureClassConfig"][self.fcName]
+        publish_projected_fc = fcConfig["Publish_Projected_FC"]
+        dxfPath, csvPath = self._export_paths(parameters)
+
+        spatialReference = get_spatial_reference(parameters["siteProjection"])
+
+        where = arcpy.AddFieldDelimiters(publish_projected_fc, "MineSite") + " = '" + mineSite + "'"
+        export_features(publish_projected_fc, dxfPath, csvPath, parameters["templateFile"], parameters["layerName"],
+                        parameters["layerColour"], parameters["lbl"], parameters["lblHeight"], where,
+                        parameters["zField"], spatialReference, self._colour_scale())
+
+    def _colour_scale(self):
+        # layerColour values were written for the FME job, whose "r,g,b" colours are 0-1 fractions
+        return self.config.get("layerColourScale", 1.0)
+
     def _initJenkins(self):
-        jenkins = None
         # https://python-jenkins.readthedocs.io/en/latest/api.html
         global jenkins
         if (jenkins is None):
             print("Initialise Jenkins")
             jenkinsBaseUrl = self.config[" environment"]["'jenkins"]["base_url"]
             kerberosJenkinsRequester = KerberosJenkinsRequester()
-            _jenkins = Jenkins(kerberosJenkinsRequester.getDNS_A_Ur1(jenkinsBaseUrl), requester=kerberosJenkinsRequester)
+            jenkins = Jenkins(kerberosJenkinsRequester.getDNS_A_Ur1(jenkinsBaseUrl), requester=kerberosJenkinsRequester)
 
     def __invokeJenkins(self, parameters, jenkinsTaskName):
         self._initJenkins()
@@ -276,28 +357,40 @@ class ProcessLostEquipment:
         print("Job invoked")
 
     def _roundGeometry(self, aGeom, roundTol):
-        global sR
         try:
-            if str(aGeom.type).upper() == "POINT":
-                rGeom = self._roundPoint(aGeom.firstPoint, roundTol)
-            else:
-                newArray = arcpy.Array()
-                for i in range(aGeom.partCount):
-                    partArray = aGeom.getPart(i)
-                    for j in range(partArray.count):
-                        partArray.replace(j, (self.roundPoint(partArray.getObject(j), roundTol)))
-                    newArray.add(partArray)
-                rGeom = arcpy.Geometry(str(aGeom.type), newArray, sR)
-        except AttributeError:
+            rGeom = RoundGeometry(aGeom, round_tol=roundTol)
+        except (AttributeError, ValueError):
             arcpy.AddMessage("Cannot round feature geometry - returning original geometry")
             rGeom = aGeom
         return rGeom
 
     def _roundPoint(self, aPoint, roundTol):
-        newX = round(aPoint.X, int(abs(round(math.log(roundTol, 10)))))
-        newY = round(aPoint.Y, int(abs(round(math.log(roundTol, 10)))))
-        Point = arcpy.Point(newX, newY)
-        return Point
+        decimals = get_decimals(roundTol)
+        return arcpy.Point(round(aPoint.X, decimals), round(aPoint.Y, decimals))
+
+
+def input_versions(config, fcName="DrillholeLostEquipment"):
+    """
+    Fingerprints the inputs every site shares: the exploration table, the site extents and the surface.
+
+    A batch computes these once and passes them to each site, so the full tables are read once per batch
+    rather than once per site.
+    """
+    return {
+        "source": fingerprint(config["task_fme_featureClassConfig"][fcName]["Original_FC"]),
+        "extents": fingerprint(config["10_SDI_PUBLISH_PLANNING_MIneSiteExtents"]),
+        "surface": fingerprint(config["MTD_Path"]),
+    }
+
+
+def load_config(configFolder, level=1):
+    """Loads the pipeline configuration from the JSON files in configFolder."""
+    import GCC_Python_Config as c
+    configCls = c.Config()
+    config = configCls.GetConfig(folder=configFolder, Level=level)
+    # Fail on an unresolvable site projection now rather than part way through every site
+    validate_projections(config["task_fme_siteProjections"])
+    return config
 
 
 def main():
@@ -305,13 +398,12 @@ def main():
     parser.add_option("-u", "--mineSite", action="store", dest="mineSite", type="string", help="Mine Site")
     parser.add_option("-c", "--configFolder", action="store", dest="configFolder", type="string", help="Path to the JSON configuration file")
     parser.add_option("-1", "--level", action="store", dest="level", type="int", default=1, help="Levels to search for JSON config files")
+    parser.add_option("-s", "--perSiteScan", action="store_true", dest="perSiteScan", default=False, help="Intersect the exploration table per site instead of partitioning it once")
 
     (options, args) = parser.parse_args()
 
     try:
-        import GCC_Python_Config as c
-        configCls = c.Config()
-        _config = configCls.GetConfig(folder=options.configFolder, Level=options.level)
+        _config = load_config(options.configFolder, options.level)
         
         if options.mineSite:
             objProcessLostEquipment = ProcessLostEquipment(options.mineSite, "DrillholeLostEquipment", _config, _config["projectedSearchFields"])
@@ -319,13 +411,33 @@ def main():
         else:
             with arcpy.da.SearchCursor(_config["IO_SDI_PUBLISH_PLANNING_MineSiteExtents"], ["MineSite"]) as cursor:
                 mineSites = sorted((row[0] for row in cursor))
+
+            # Read the exploration rows and site extents once and feed every site from its partition
+            partition = None
+            if not options.perSiteScan:
+                partition = SitePartition(_config["10_SDI_PUBLISH_PLANNING_MIneSiteExtents"],
+                                          _config["task_fme_featureClassConfig"]["DrillholeLostEquipment"]["Original_FC"],
+                                          f"({EXPLORATION_WHERE_PVC}) AND ({EXPLORATION_WHERE_END_CAP})")
+                partition.load()
+
+            # Shared input fingerprints, computed once instead of per site
+            versions = input_versions(_config)
             
+            # A failed site is recorded in its checkpoint manifest and skipped, the batch carries on
+            failedSites = []
             for mineSite in mineSites:
                 try:
-                    objProcessLostEquipment = ProcessLostEquipment(mineSite, "DrillholeLostEquipment", _config, _config["projectedSearchFields"])
+                    objProcessLostEquipment = ProcessLostEquipment(mineSite, "DrillholeLostEquipment", _config, _config["projectedSearchFields"], partition, versions)
                     objProcessLostEquipment.process_LostEquipment()
                 except Exception as e:
                     print(f"An error occurred while processing {mineSite}: {str(e)}")
+                    failedSites.append(mineSite)
+
+            if failedSites:
+                print(f"{len(failedSites)} of {len(mineSites)} sites failed: {', '.join(failedSites)}")
+                print("Rerun to resume the failed sites from their last completed stage")
+                sys.stdout.flush()
+                sys.exit(1)
     except Exception as e:
         print(traceback.format_exc())
         sys.stdout.flush()
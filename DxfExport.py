@@ -0,0 +1,377 @@
+import csv
+import math
+import os
+from optparse import OptionParser
+
+# Fields maintained by the geodatabase that are not written to the CSV
+SYSTEM_FIELD_TYPES = ("OID", "Geometry", "GlobalID", "Raster", "Blob")
+SYSTEM_FIELD_NAMES = ("shape_length", "shape_area", "shape.starea()", "shape.stlength()")
+
+# Nearest AutoCAD Color Index for RGB colours, standard colours only
+ACI_COLOURS = {
+    1: (255, 0, 0), 2: (255, 255, 0), 3: (0, 255, 0), 4: (0, 255, 255), 5: (0, 0, 255),
+    6: (255, 0, 255), 7: (255, 255, 255), 8: (128, 128, 128), 9: (192, 192, 192),
+}
+
+# First DXF version with handles and subclass markers, and first with true colour (group 420)
+DXF_R2000 = "AC1015"
+DXF_R2004 = "AC1018"
+
+
+def parse_colour(colour, scale=255.0):
+    """
+    Converts a configured layer colour to (ACI index, RGB tuple or None).
+
+    Accepts an ACI index (7 or "7") or an "r,g,b" string whose components run from 0 to scale:
+    255 for 8-bit colours, 1 for FME style fractions. The scale is never guessed from the values,
+    so "1,1,1" is near black at scale 255 and white at scale 1.
+    """
+    if isinstance(colour, (int, float)) or str(colour).strip().isdigit():
+        return int(colour), None
+    parts = [float(part) for part in str(colour).replace(";", ",").split(",")]
+    if len(parts) != 3:
+        raise ValueError(f"Cannot interpret layer colour: {colour}")
+    rgb = tuple(int(round(min(max(part * 255.0 / float(scale), 0.0), 255.0))) for part in parts)
+    aci = min(ACI_COLOURS, key=lambda index: sum((a - b) ** 2 for a, b in zip(ACI_COLOURS[index], rgb)))
+    return aci, rgb
+
+
+def _format_number(value):
+    return repr(round(float(value), 8))
+
+
+def read_pairs(path):
+    """Reads a DXF file as a list of (group code, value) pairs."""
+    with open(path, "rb") as f:
+        data = f.read()
+    encoding = "utf-8" if b"AC1021" in data[:4096] or b"AC1024" in data[:4096] or b"AC1027" in data[:4096] \
+        or b"AC1032" in data[:4096] else "cp1252"
+    lines = data.decode(encoding, errors="replace").splitlines()
+    return [(int(lines[i].strip()), lines[i + 1].strip()) for i in range(0, len(lines) - 1, 2)], encoding
+
+
+class DxfTemplate(object):
+    """
+    DXF template whose header, tables, blocks and objects are reused for the exported drawing.
+
+    The exported entities are appended to the template's own entities (title block, frame, ...).
+    Layers that are not in the template's LAYER table are added to it and counted in the table
+    header and, for R2000 and later drawings, new entries get handles above the template's
+    $HANDSEED so the drawing stays valid for AutoCAD.
+    """
+
+    def __init__(self, path=None):
+        if path and os.path.exists(path):
+            self.pairs, self.encoding = read_pairs(path)
+        else:
+            # No template: minimal R12 drawing
+            self.pairs = [(0, "SECTION"), (2, "HEADER"), (9, "$ACADVER"), (1, "AC1009"), (0, "ENDSEC"),
+                          (0, "SECTION"), (2, "TABLES"), (0, "TABLE"), (2, "LAYER"), (70, "0"), (0, "ENDTAB"),
+                          (0, "ENDSEC"), (0, "EOF")]
+            self.encoding = "cp1252"
+        self.version = self._header_value("$ACADVER", 1) or "AC1009"
+        self.next_handle = int(self._header_value("$HANDSEED", 5) or "0", 16)
+
+    def _header_value(self, name, code):
+        for i, (group, value) in enumerate(self.pairs):
+            if group == 9 and value == name:
+                for group, value in self.pairs[i + 1:]:
+                    if group == code:
+                        return value
+                    if group in (0, 9):
+                        break
+        return None
+
+    @property
+    def has_handles(self):
+        return self.version >= DXF_R2000
+
+    def handle(self):
+        value = format(self.next_handle, "X")
+        self.next_handle += 1
+        return value
+
+    def _section(self, name):
+        """Returns (start, end) pair indexes of a section, end pointing at its ENDSEC."""
+        for i in range(len(self.pairs) - 1):
+            if self.pairs[i] == (0, "SECTION") and self.pairs[i + 1] == (2, name):
+                for j in range(i + 2, len(self.pairs)):
+                    if self.pairs[j] == (0, "ENDSEC"):
+                        return i, j
+        return None
+
+    def _table(self, name):
+        """Returns (start, end) pair indexes of a symbol table, end pointing at its ENDTAB."""
+        for i in range(len(self.pairs) - 1):
+            if self.pairs[i] == (0, "TABLE") and self.pairs[i + 1] == (2, name):
+                for j in range(i + 2, len(self.pairs)):
+                    if self.pairs[j] == (0, "ENDTAB"):
+                        return i, j
+        return None
+
+    def model_space_handle(self):
+        table = self._table("BLOCK_RECORD")
+        if not table:
+            return "1F"
+        handle = None
+        for group, value in self.pairs[table[0]:table[1]]:
+            if group == 0:
+                handle = None
+            elif group == 5:
+                handle = value
+            elif group == 2 and value.upper() == "*MODEL_SPACE" and handle:
+                return handle
+        return "1F"
+
+    def ensure_layer(self, layer_name, aci, rgb=None):
+        """Adds the layer to the LAYER table if the template does not define it."""
+        table = self._table("LAYER")
+        if not table:
+            return
+        start, end = table
+        names = [value.upper() for (group, value), previous in zip(self.pairs[start + 2:end], self.pairs[start + 1:end])
+                 if group == 2 and previous == (0, "LAYER")]
+        if layer_name.upper() in names:
+            return
+
+        entry = [(0, "LAYER")]
+        if self.has_handles:
+            table_handle = next((value for group, value in self.pairs[start:end] if group == 5), "2")
+            entry += [(5, self.handle()), (330, table_handle),
+                      (100, "AcDbSymbolTableRecord"), (100, "AcDbLayerTableRecord")]
+        entry += [(2, layer_name), (70, "0"), (62, str(aci)), (6, "CONTINUOUS")]
+        if rgb and self.version >= DXF_R2004:
+            entry.append((420, str((rgb[0] << 16) | (rgb[1] << 8) | rgb[2])))
+        self.pairs[end:end] = entry
+
+        # The table header's group 70 holds the number of entries
+        first_entry = next((i for i in range(start + 2, end) if self.pairs[i][0] == 0), end)
+        for i in range(start + 2, first_entry):
+            if self.pairs[i][0] == 70:
+                self.pairs[i] = (70, str(max(int(self.pairs[i][1] or 0), len(names)) + 1))
+                break
+
+    def write(self, path, entities):
+        """Writes the template with the given entity pairs appended to its ENTITIES section."""
+        if self.has_handles:
+            for i, (group, value) in enumerate(self.pairs):
+                if group == 9 and value == "$HANDSEED":
+                    self.pairs[i + 1] = (5, format(self.next_handle, "X"))
+                    break
+
+        section = self._section("ENTITIES")
+        if section:
+            head, tail = self.pairs[:section[1]], self.pairs[section[1]:]
+        else:
+            # ENTITIES goes before OBJECTS (R2000+) or EOF
+            objects = self._section("OBJECTS")
+            at = objects[0] if objects else next(i for i, pair in enumerate(self.pairs) if pair == (0, "EOF"))
+            head = self.pairs[:at] + [(0, "SECTION"), (2, "ENTITIES")]
+            tail = [(0, "ENDSEC")] + self.pairs[at:]
+
+        with open(path, "w", encoding=self.encoding, errors="replace", newline="\r\n") as f:
+            for pairs in (head, entities, tail):
+                for group, value in pairs:
+                    f.write(f"{group:>3}\n{value}\n")
+
+
+def _entity_header(template, entity_type, subclass, layer_name, aci, rgb, owner):
+    pairs = [(0, entity_type)]
+    if template.has_handles:
+        pairs += [(5, template.handle()), (330, owner), (100, "AcDbEntity")]
+    pairs += [(8, layer_name), (62, str(aci))]
+    if rgb and template.version >= DXF_R2004:
+        pairs.append((420, str((rgb[0] << 16) | (rgb[1] << 8) | rgb[2])))
+    if template.has_handles:
+        pairs.append((100, subclass))
+    return pairs
+
+
+def export_features(feature_class, dxf_path, csv_path, template_path, layer_name, colour, label_field,
+                    label_height, where_clause=None, z_field=None, spatial_reference=None, colour_scale=255.0):
+    """
+    Writes point features to a DXF drawing and a CSV file in a single cursor pass.
+
+    Every feature becomes a POINT entity and, if it has a label, a TEXT entity of height
+    label_height at the same location, both on layer_name in the configured colour. The drawing
+    reuses the template's header, tables and blocks. The CSV holds the attribute fields followed
+    by X, Y and Z.
+
+    Parameters:
+        feature_class (str): Point feature class to export, e.g. Publish_Projected_FC.
+        dxf_path (str): Output DXF file.
+        csv_path (str): Output CSV file.
+        template_path (str): Site template DXF. A minimal R12 drawing is written if it doesn't exist.
+        layer_name (str): DXF layer for the exported entities.
+        colour: ACI index or "r,g,b" colour (see parse_colour).
+        label_field (str): Field written as the TEXT value, None for no labels.
+        label_height (float): Text height in drawing units.
+        where_clause (str): Optional SQL expression limiting the features, e.g. one mine site.
+        z_field (str): Optional field holding the elevation. Defaults to the geometry Z, or 0.
+        spatial_reference: Optional spatial reference the coordinates are written in.
+        colour_scale (float): Range of "r,g,b" colour components, 255 or 1 for FME style colours.
+
+    Returns:
+        int: Number of features exported.
+    """
+    import arcpy
+
+    aci, rgb = parse_colour(colour, colour_scale)
+    label_height = float(label_height)
+    template = DxfTemplate(template_path)
+    template.ensure_layer(layer_name, aci, rgb)
+    owner = template.model_space_handle()
+
+    fields = [field.name for field in arcpy.ListFields(feature_class)
+              if field.type not in SYSTEM_FIELD_TYPES and field.name.lower() not in SYSTEM_FIELD_NAMES]
+    lower_fields = [name.lower() for name in fields]
+    label_index = lower_fields.index(label_field.lower()) if label_field and label_field.lower() in lower_fields else None
+    z_index = lower_fields.index(z_field.lower()) if z_field and z_field.lower() in lower_fields else None
+    has_z = arcpy.Describe(feature_class).hasZ
+
+    for path in (dxf_path, csv_path):
+        if os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+    entities = []
+    count = 0
+    with open(csv_path, "w", newline="", encoding="utf-8") as csv_file, \
+            arcpy.da.SearchCursor(feature_class, fields + ["SHAPE@XY", "SHAPE@Z" if has_z else "OID@"],
+                                  where_clause, spatial_reference=spatial_reference) as cursor:
+        writer = csv.writer(csv_file)
+        writer.writerow(fields + ["X", "Y", "Z"])
+        for row in cursor:
+            xy = row[-2]
+            if not xy or xy[0] is None:
+                continue
+            x, y = xy
+            if z_index is not None and row[z_index] is not None:
+                z = row[z_index]
+            elif has_z and row[-1] is not None and not math.isnan(row[-1]):
+                z = row[-1]
+            else:
+                z = 0.0
+            attributes = row[:len(fields)]
+            writer.writerow(list(attributes) + [_format_number(x), _format_number(y), _format_number(z)])
+
+            entities += _entity_header(template, "POINT", "AcDbPoint", layer_name, aci, rgb, owner)
+            entities += [(10, _format_number(x)), (20, _format_number(y)), (30, _format_number(z))]
+            if label_index is not None and attributes[label_index] not in (None, ""):
+                entities += _entity_header(template, "TEXT", "AcDbText", layer_name, aci, rgb, owner)
+                entities += [(10, _format_number(x)), (20, _format_number(y)), (30, _format_number(z)),
+                             (40, _format_number(label_height)), (1, str(attributes[label_index]).replace("\n", " "))]
+                if template.has_handles:
+                    entities.append((100, "AcDbText"))
+            count += 1
+
+    template.write(dxf_path, entities)
+    print(f"Exported {count} features to {dxf_path} and {csv_path}")
+    return count
+
+
+def read_entities(path, layer_name=None):
+    """
+    Reads the POINT and TEXT entities of a DXF file.
+
+    Returns:
+        tuple: (points, labels) where points is a list of (x, y, z) and labels a list of (x, y, text).
+    """
+    pairs, _ = read_pairs(path)
+    points, labels = [], []
+    start = next((i for i in range(len(pairs) - 1) if pairs[i] == (0, "SECTION") and pairs[i + 1] == (2, "ENTITIES")), None)
+    if start is None:
+        return points, labels
+
+    entity = None
+    for group, value in pairs[start + 2:] + [(0, "ENDSEC")]:
+        if group == 0:
+            if entity and (layer_name is None or entity.get(8, "").upper() == layer_name.upper()):
+                xyz = (float(entity.get(10, 0)), float(entity.get(20, 0)), float(entity.get(30, 0)))
+                if entity["type"] == "POINT":
+                    points.append(xyz)
+                elif entity["type"] in ("TEXT", "MTEXT"):
+                    labels.append((xyz[0], xyz[1], entity.get(1, "")))
+            if value == "ENDSEC":
+                break
+            entity = {"type": value}
+        elif entity is not None and group not in entity:
+            entity[group] = value
+    return points, labels
+
+
+def compare_dxf(expected_path, actual_path, layer_name=None, tolerance=0.001):
+    """
+    Compares the points and labels of two DXF files, e.g. an FME-produced file and a native export.
+
+    Returns:
+        list: Differences found, empty if the files match within the tolerance.
+    """
+    decimals = max(0, int(round(-math.log10(tolerance)))) if tolerance > 0 else 6
+    differences = []
+    expected, actual = read_entities(expected_path, layer_name), read_entities(actual_path, layer_name)
+    for kind, expected_items, actual_items in (("point", expected[0], actual[0]), ("label", expected[1], actual[1])):
+        def key(item):
+            return tuple(round(value, decimals) if isinstance(value, float) else value for value in item)
+        expected_keys = sorted(key(item) for item in expected_items)
+        actual_keys = sorted(key(item) for item in actual_items)
+        if len(expected_keys) != len(actual_keys):
+            differences.append(f"{kind} count: expected {len(expected_keys)}, got {len(actual_keys)}")
+        missing = set(expected_keys) - set(actual_keys)
+        extra = set(actual_keys) - set(expected_keys)
+        differences += [f"missing {kind}: {item}" for item in sorted(missing)[:20]]
+        differences += [f"unexpected {kind}: {item}" for item in sorted(extra)[:20]]
+    return differences
+
+
+def compare_csv(expected_path, actual_path, key_field, tolerance=0.001):
+    """
+    Compares two CSV exports row by row on a key field. Numeric values are compared within the tolerance.
+
+    Returns:
+        list: Differences found, empty if the files match.
+    """
+    def load(path):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return {row[key_field]: row for row in csv.DictReader(f)}
+
+    def equal(a, b):
+        try:
+            return abs(float(a) - float(b)) <= tolerance
+        except (TypeError, ValueError):
+            return (a or "").strip() == (b or "").strip()
+
+    expected, actual = load(expected_path), load(actual_path)
+    differences = [f"missing row: {key}" for key in sorted(set(expected) - set(actual))]
+    differences += [f"unexpected row: {key}" for key in sorted(set(actual) - set(expected))]
+    for key in sorted(set(expected) & set(actual)):
+        for field, value in expected[key].items():
+            if field in actual[key] and not equal(value, actual[key][field]):
+                differences.append(f"{key}.{field}: expected {value!r}, got {actual[key][field]!r}")
+    return differences
+
+
+def main():
+    parser = OptionParser(usage="%prog -e <FME file> -a <native file> [options]")
+    parser.add_option("-e", "--expected", action="store", dest="expected", type="string", help="FME-produced DXF or CSV file")
+    parser.add_option("-a", "--actual", action="store", dest="actual", type="string", help="Natively exported DXF or CSV file")
+    parser.add_option("-l", "--layer", action="store", dest="layer", type="string", help="Only compare entities on this DXF layer")
+    parser.add_option("-k", "--keyField", action="store", dest="keyField", type="string", default="HOLE_NAME", help="CSV key field")
+    parser.add_option("-t", "--tolerance", action="store", dest="tolerance", type="float", default=0.001, help="Coordinate tolerance")
+
+    (options, args) = parser.parse_args()
+    if not options.expected or not options.actual:
+        parser.error("both -e and -a are required")
+
+    if options.expected.lower().endswith(".csv"):
+        differences = compare_csv(options.expected, options.actual, options.keyField, options.tolerance)
+    else:
+        differences = compare_dxf(options.expected, options.actual, options.layer, options.tolerance)
+
+    for difference in differences:
+        print(difference)
+    print(f"{len(differences)} differences")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
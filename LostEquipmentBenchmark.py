@@ -0,0 +1,388 @@
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from optparse import OptionParser
+import numpy as np
+
+from ArcpyStandIn import StandIn, Polygon, create_raster
+
+FC_NAME = "DrillholeLostEquipment"
+
+# Synthetic sites are laid out on a grid over this GDA94 region (MGA zone 50)
+REGION = (116.0, -24.0, 121.0, -20.0)
+SITE_PROJECTION = "MGA50"
+
+# Share of holes placed outside every site extent, and of holes with a second lost-equipment interval
+OUTSIDE_FRACTION = 0.05
+SECOND_INTERVAL_FRACTION = 0.3
+
+# INFO_SUBTYPE / INSTALLATION_TYPE mix, PVC rows and END CAP rows with an installation are filtered out
+SUBTYPES = ["LOST RODS", "LOST BIT", "LOST CORE BARREL", "CASING", "PVC", "END CAP"]
+INSTALLATION_TYPES = [None, None, None, "", "p", "c"]
+
+EXPLORATION_FIELDS = [("PROJECT", "TEXT"), ("HOLE_NAME", "TEXT"), ("OREBODY_NAME", "TEXT"), ("HOLE_LENGTH", "DOUBLE"),
+                      ("INFO_TYPE", "TEXT"), ("INFO_SUBTYPE", "TEXT"), ("DEPTH_FROM", "DOUBLE"), ("DEPTH_TO", "DOUBLE"),
+                      ("INCLINATION", "DOUBLE"), ("AZIMUTH", "DOUBLE"), ("LAT_COLLAR", "DOUBLE"),
+                      ("LONG_COLLAR", "DOUBLE"), ("AHD_RL_COLLAR", "DOUBLE"), ("COMMENTS", "TEXT"),
+                      ("HOLE_TYPE", "TEXT"), ("INSTALLATION_TYPE", "TEXT")]
+PROJECTED_FIELDS = [("MineSite", "TEXT"), ("Hole_Name", "TEXT"), ("Projected_X", "DOUBLE"),
+                    ("Projected_Y", "DOUBLE"), ("Projected_Z", "DOUBLE"), ("INFO_SUBTYPE", "TEXT")]
+
+DEFAULT_SITES = "1,3,10,30,100"
+DEFAULT_HOLES = "1000,10000,100000,1000000"
+
+
+def generate_inputs(arcpy, folder, site_count, hole_count, seed=0, surface_size=1000):
+    """
+    Writes a synthetic environment for one benchmark run and returns the pipeline configuration.
+
+    Site extents are squares on a grid, drillholes are spread over the sites (a few fall outside
+    every site) with one or two lost-equipment intervals each, and the MTD surface is a smooth
+    raster over the whole region. Projected target feature classes start empty, so the load
+    stages measure a full initial load.
+
+    Returns:
+        tuple: (config, number of exploration rows)
+    """
+    rng = np.random.default_rng(seed)
+    arcpy.CreateFileGDB_management(folder, "ENV.gdb")
+    env_db = os.path.join(folder, "ENV.gdb")
+    extents_fc = os.path.join(env_db, "MineSiteExtents")
+    exploration_fc = os.path.join(env_db, "EXPLORATION_DrillholeLostEquipment")
+    mtd_path = os.path.join(env_db, "MTD")
+
+    # Site extents, 80% of their grid cell so neighbouring sites don't touch
+    xmin, ymin, xmax, ymax = REGION
+    side = int(math.ceil(math.sqrt(site_count)))
+    width, height = (xmax - xmin) / side, (ymax - ymin) / side
+    sites, boxes = [], []
+    arcpy.CreateFeatureclass_management(env_db, "MineSiteExtents", "POLYGON", spatial_reference=arcpy.SpatialReference(4283))
+    arcpy.AddField_management(extents_fc, "MineSite", "TEXT", field_length=50)
+    with arcpy.da.InsertCursor(extents_fc, ["MineSite", "SHAPE@"]) as cursor:
+        for i in range(site_count):
+            x0 = xmin + (i % side + 0.1) * width
+            y0 = ymin + (i // side + 0.1) * height
+            box = (x0, y0, x0 + 0.8 * width, y0 + 0.8 * height)
+            sites.append(f"S{i + 1:03d}")
+            boxes.append(box)
+            cursor.insertRow([sites[-1], Polygon([[(box[0], box[1]), (box[0], box[3]), (box[2], box[3]),
+                                                   (box[2], box[1]), (box[0], box[1])]])])
+
+    # Drillholes: collar inside a random site, or anywhere in the region for the outside share
+    boxes = np.asarray(boxes)
+    site_index = rng.integers(0, site_count, hole_count)
+    u, v = rng.random(hole_count), rng.random(hole_count)
+    lon = boxes[site_index, 0] + u * (boxes[site_index, 2] - boxes[site_index, 0])
+    lat = boxes[site_index, 1] + v * (boxes[site_index, 3] - boxes[site_index, 1])
+    outside = rng.random(hole_count) < OUTSIDE_FRACTION
+    lon[outside] = xmin + u[outside] * (xmax - xmin)
+    lat[outside] = ymin + v[outside] * (ymax - ymin)
+    rl = 400.0 + 100.0 * rng.random(hole_count)
+    length = 50.0 + 250.0 * rng.random(hole_count)
+    intervals = 1 + (rng.random(hole_count) < SECOND_INTERVAL_FRACTION)
+
+    arcpy.CreateFeatureclass_management(env_db, "EXPLORATION_DrillholeLostEquipment", "POINT",
+                                        spatial_reference=arcpy.SpatialReference(4283))
+    for name, field_type in EXPLORATION_FIELDS:
+        arcpy.AddField_management(exploration_fc, name, field_type, field_length=50 if field_type == "TEXT" else None)
+    rows = 0
+    subtypes = rng.integers(0, len(SUBTYPES), int(intervals.sum()))
+    installations = rng.integers(0, len(INSTALLATION_TYPES), int(intervals.sum()))
+    with arcpy.da.InsertCursor(exploration_fc, ["SHAPE@XY"] + [name for name, _ in EXPLORATION_FIELDS]) as cursor:
+        for hole in range(hole_count):
+            x, y, z = float(lon[hole]), float(lat[hole]), float(rl[hole])
+            for interval in range(intervals[hole]):
+                depth = float(length[hole]) * (interval + 1) / (intervals[hole] + 1)
+                cursor.insertRow([(x, y), f"P{hole % 97:02d}", f"DH{hole:07d}", f"OB{hole % 13:02d}", float(length[hole]),
+                                  "LOST EQUIPMENT", SUBTYPES[subtypes[rows]], depth, depth + 1.0, -60.0, 90.0, y, x, z,
+                                  None, "RC", INSTALLATION_TYPES[installations[rows]]])
+                rows += 1
+
+    # MTD surface covering the region
+    gx, gy = np.meshgrid(np.linspace(0.0, 6.0, surface_size), np.linspace(0.0, 6.0, surface_size))
+    create_raster(arcpy.standin, mtd_path, (450.0 + 40.0 * np.sin(gx) * np.cos(gy)).astype("f4"), REGION,
+                  arcpy.SpatialReference(4283))
+
+    targets = {}
+    for name in ("Original_Projected", "Revised", "Publish_Projected"):
+        targets[name] = os.path.join(env_db, f"{FC_NAME}_{name}")
+        arcpy.CreateFeatureclass_management(env_db, f"{FC_NAME}_{name}", "POINT",
+                                            spatial_reference=arcpy.SpatialReference(4283))
+        for field_name, field_type in PROJECTED_FIELDS:
+            arcpy.AddField_management(targets[name], field_name, field_type, field_length=50 if field_type == "TEXT" else None)
+
+    export_root = os.path.join(folder, "export")
+    config = {
+        "MTD_Path": mtd_path,
+        "10_SDI_PUBLISH_PLANNING_MIneSiteExtents": extents_fc,
+        "IO_SDI_PUBLISH_PLANNING_MineSiteExtents": extents_fc,
+        "ENV_DB": env_db,
+        "checkpointFolder": os.path.join(folder, "checkpoints"),
+        "scratchFolder": os.path.join(folder, "scratch"),
+        "nativeExport": True,
+        "projectedSearchFields": [],
+        "task_fme_featureClassConfig": {FC_NAME: {
+            "Original_FC": exploration_fc,
+            "Original_Projected_FC": targets["Original_Projected"],
+            "Revised_FC": targets["Revised"],
+            "Publish_Projected_FC": targets["Publish_Projected"],
+            "SDEConnLayerFC": targets["Publish_Projected"],
+            "layerName": FC_NAME,
+            "fillPattern": "",
+            "scale": 1000,
+            "1bl": "Hole_Name",
+            "lblHeight": 2.5,
+            "buffer": 0,
+            "geometryType": "POINT",
+            "zField": "Projected_Z",
+        }},
+        "task_fme_siteProjections": {site: SITE_PROJECTION for site in sites},
+        "task_fme_jobConfig": {"rootPath": export_root, "SDEConnExtentFC": extents_fc},
+        "layerColour_Site": {site: {FC_NAME: 1} for site in sites},
+        "intermediateDatasetCSVPath": os.path.join(folder, "intermediate"),
+        "destinationCSVPath": {site: os.path.join(folder, "csv", site) for site in sites},
+    }
+    return config, rows
+
+
+class StageRecorder(object):
+    """Accumulates seconds and peak traced memory per stage name over all sites of a run."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        peak = (tracemalloc.get_traced_memory()[1] - base) if self.trace_memory else 0
+        stage = self.stages.setdefault(name, {"seconds": 0.0, "peak_mb": 0.0})
+        stage["seconds"] += seconds
+        stage["peak_mb"] = max(stage["peak_mb"], peak / 2.0 ** 20)
+
+
+def _install_pipeline(arcpy, recorder):
+    """
+    Imports the pipeline against the stand-in and routes its stages through the recorder.
+
+    The stages between build_drillholes and project_drillholes are elided in the pipeline, so
+    DrillholeLostEquipment_FinalAppend is materialised from DrillholeLostEquipment (with the
+    MineSite and projected coordinate fields) just before project_drillholes, outside the timing.
+    """
+    import DrillholeslostequipmentsProjected as pipeline
+    from StageCheckpoint import StageCheckpoint
+
+    class RecordingCheckpoint(StageCheckpoint):
+        def run(self, name, func, inputs=None, outputs=(), verify=None):
+            if name == "project_drillholes":
+                _build_final_append(arcpy, self.output("DrillholeLostEquipment"),
+                                    self.output("DrillholeLostEquipment_FinalAppend"))
+
+            def measured():
+                with recorder.measure(name):
+                    func()
+            return StageCheckpoint.run(self, name, measured, inputs, outputs, verify)
+
+    pipeline.StageCheckpoint = RecordingCheckpoint
+    return pipeline
+
+
+def _build_final_append(arcpy, drillholes, final_append):
+    if arcpy.Exists(final_append):
+        arcpy.Delete_management(final_append)
+    arcpy.CreateFeatureclass_management(os.path.dirname(final_append), os.path.basename(final_append), "POINT",
+                                        drillholes)
+    for name in ("Projected_X", "Projected_Y", "Projected_Z"):
+        arcpy.AddField_management(final_append, name, "DOUBLE")
+    arcpy.Append_management(drillholes, final_append, "NO_TEST")
+
+
+def run_point(standin, site_count, hole_count, seed=0, trace_memory=True, verbose=False):
+    """
+    Runs the batch pipeline (partition once, then every site) on a fresh synthetic environment.
+
+    Returns:
+        dict: {"sites", "holes", "rows", "seconds", "stages": {name: {"seconds", "peak_mb"}}}
+    """
+    arcpy = standin.module
+    folder = tempfile.mkdtemp(prefix="LostEquipmentBenchmark_")
+    standin.reset()
+    arcpy.env.scratchFolder = folder
+    recorder = StageRecorder(trace_memory)
+    try:
+        config, rows = generate_inputs(arcpy, folder, site_count, hole_count, seed)
+        pipeline = _install_pipeline(arcpy, recorder)
+        output = sys.stdout if verbose else io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            with arcpy.da.SearchCursor(config["IO_SDI_PUBLISH_PLANNING_MineSiteExtents"], ["MineSite"]) as cursor:
+                mineSites = sorted(row[0] for row in cursor)
+            partition = pipeline.SitePartition(config["10_SDI_PUBLISH_PLANNING_MIneSiteExtents"],
+                                               config["task_fme_featureClassConfig"][FC_NAME]["Original_FC"],
+                                               f"({pipeline.EXPLORATION_WHERE_PVC}) AND ({pipeline.EXPLORATION_WHERE_END_CAP})")
+            with recorder.measure("partition"):
+                partition.load()
+            with recorder.measure("input_versions"):
+                versions = pipeline.input_versions(config, FC_NAME)
+            for mineSite in mineSites:
+                pipeline.ProcessLostEquipment(mineSite, FC_NAME, config, config["projectedSearchFields"],
+                                              partition, versions).process_LostEquipment()
+        seconds = time.perf_counter() - start
+    finally:
+        standin.reset()
+        shutil.rmtree(folder, ignore_errors=True)
+    return {"sites": site_count, "holes": hole_count, "rows": rows, "seconds": seconds, "stages": recorder.stages}
+
+
+def scaling_exponent(sizes, values):
+    """Least squares slope of log(value) against log(size), i.e. k in O(n^k). None with fewer than two points."""
+    points = [(math.log(size), math.log(max(value, 1e-4))) for size, value in zip(sizes, values) if size > 0]
+    if len(points) < 2 or len({x for x, _ in points}) < 2:
+        return None
+    x, y = np.asarray(points).T
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def report(name, results, key, trace_memory=True):
+    """Prints per-stage seconds and peak memory for a sweep with the fitted scaling exponents."""
+    if not results:
+        return
+    sizes = [result[key] for result in results]
+    stages = list(results[-1]["stages"])
+    metrics = [("seconds", "seconds"), ("peak_mb", "peak MB")] if trace_memory else [("seconds", "seconds")]
+    for metric, label in metrics:
+        print(f"\n{name} sweep, {label} per stage")
+        print(f"{'stage':<20}" + "".join(f"{size:>12}" for size in sizes) + f"{'exponent':>10}")
+        for stage in stages:
+            values = [result["stages"].get(stage, {}).get(metric, 0.0) for result in results]
+            exponent = scaling_exponent(sizes, values)
+            print(f"{stage:<20}" + "".join(f"{value:>12.3f}" for value in values)
+                  + (f"{exponent:>10.2f}" if exponent is not None else f"{'-':>10}"))
+        if metric == "seconds":
+            totals = [result["seconds"] for result in results]
+            exponent = scaling_exponent(sizes, totals)
+            print(f"{'total':<20}" + "".join(f"{value:>12.3f}" for value in totals)
+                  + (f"{exponent:>10.2f}" if exponent is not None else f"{'-':>10}"))
+
+
+def compare_baseline(results, baseline, tolerance=1.5, seconds_slack=0.05, memory_slack=1.0):
+    """
+    Compares sweep results with a stored baseline run of the same points.
+
+    A stage regresses when its seconds exceed baseline * tolerance + seconds_slack, or its peak
+    memory exceeds baseline * tolerance + memory_slack MB. The slack keeps stages that take a few
+    milliseconds from failing on noise. Points or stages missing from the baseline are skipped.
+
+    Returns:
+        list: One message per regression.
+    """
+    regressions = []
+    for sweep, points in results["sweeps"].items():
+        stored = {(point["sites"], point["holes"]): point for point in baseline.get("sweeps", {}).get(sweep, [])}
+        for point in points:
+            reference = stored.get((point["sites"], point["holes"]))
+            if reference is None:
+                continue
+            for stage, measured in point["stages"].items():
+                expected = reference["stages"].get(stage)
+                if expected is None:
+                    continue
+                if measured["seconds"] > expected["seconds"] * tolerance + seconds_slack:
+                    regressions.append(f"{sweep} sweep, {point['sites']} sites x {point['holes']} holes, {stage}: "
+                                       f"{measured['seconds']:.3f}s against a baseline of {expected['seconds']:.3f}s")
+                if results["traceMemory"] and baseline.get("traceMemory") \
+                        and measured["peak_mb"] > expected["peak_mb"] * tolerance + memory_slack:
+                    regressions.append(f"{sweep} sweep, {point['sites']} sites x {point['holes']} holes, {stage}: "
+                                       f"{measured['peak_mb']:.1f} MB against a baseline of {expected['peak_mb']:.1f} MB")
+    return regressions
+
+
+def benchmark(site_counts, hole_counts, fixed_sites=10, fixed_holes=10 ** 4, seed=0, trace_memory=True, verbose=False):
+    """
+    Sweeps the site count at fixed_holes holes and the hole count at fixed_sites sites.
+
+    Every point runs the whole batch on a fresh synthetic environment through the arcpy stand-in,
+    so times measure the pipeline's own Python work (cursors, upserts, partitioning, export) and
+    how it scales, not geoprocessing tool or SDE performance.
+    """
+    standin = StandIn()
+    standin.install()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if trace_memory:
+        tracemalloc.start()
+
+    results = {"traceMemory": trace_memory, "seed": seed, "sweeps": {"sites": [], "holes": []}}
+    for sweep, points in (("sites", [(count, fixed_holes) for count in site_counts]),
+                          ("holes", [(fixed_sites, count) for count in hole_counts])):
+        for site_count, hole_count in points:
+            result = run_point(standin, site_count, hole_count, seed, trace_memory, verbose)
+            results["sweeps"][sweep].append(result)
+            print(f"{sweep} sweep: {site_count} sites x {hole_count} holes ({result['rows']} rows) "
+                  f"in {result['seconds']:.2f}s")
+
+    if trace_memory:
+        tracemalloc.stop()
+    report("Site", results["sweeps"]["sites"], "sites", trace_memory)
+    report("Hole", results["sweeps"]["holes"], "holes", trace_memory)
+    return results
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option("-s", "--sites", action="store", dest="sites", type="string", default=DEFAULT_SITES, help="Site counts of the site sweep")
+    parser.add_option("-n", "--holes", action="store", dest="holes", type="string", default=DEFAULT_HOLES, help="Hole counts of the hole sweep")
+    parser.add_option("--fixed-sites", action="store", dest="fixedSites", type="int", default=10, help="Site count used in the hole sweep")
+    parser.add_option("--fixed-holes", action="store", dest="fixedHoles", type="int", default=10 ** 4, help="Hole count used in the site sweep")
+    parser.add_option("-b", "--baseline", action="store", dest="baseline", type="string", help="Baseline JSON to compare against")
+    parser.add_option("--save-baseline", action="store_true", dest="saveBaseline", default=False, help="Write the results to the baseline file instead of comparing")
+    parser.add_option("-t", "--tolerance", action="store", dest="tolerance", type="float", default=1.5, help="Allowed slowdown factor against the baseline")
+    parser.add_option("--slack", action="store", dest="slack", type="float", default=0.05, help="Seconds allowed on top of the tolerance")
+    parser.add_option("--memory-slack", action="store", dest="memorySlack", type="float", default=1.0, help="MB allowed on top of the tolerance")
+    parser.add_option("-o", "--output", action="store", dest="output", type="string", help="Write the results to this JSON file")
+    parser.add_option("--seed", action="store", dest="seed", type="int", default=0, help="Random seed of the synthetic data")
+    parser.add_option("--no-memory", action="store_false", dest="traceMemory", default=True, help="Don't trace memory (faster, times not comparable with traced runs)")
+    parser.add_option("-v", "--verbose", action="store_true", dest="verbose", default=False, help="Show the pipeline output")
+    (options, args) = parser.parse_args()
+
+    site_counts = [int(value) for value in options.sites.split(",") if value.strip()]
+    hole_counts = [int(value) for value in options.holes.split(",") if value.strip()]
+    results = benchmark(site_counts, hole_counts, options.fixedSites, options.fixedHoles, options.seed,
+                        options.traceMemory, options.verbose)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if options.baseline and options.saveBaseline:
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {options.baseline}")
+    elif options.baseline:
+        with open(options.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("traceMemory") != results["traceMemory"]:
+            print("\nBaseline was recorded with a different memory tracing setting, times are not comparable")
+            sys.exit(2)
+        regressions = compare_baseline(results, baseline, options.tolerance, options.slack, options.memorySlack)
+        if regressions:
+            print(f"\n{len(regressions)} stage regression(s) against {options.baseline}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo stage regressed against {options.baseline}")
+
+
+if __name__ == "__main__":
+    main()
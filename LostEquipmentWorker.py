@@ -0,0 +1,211 @@
+import contextlib
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from optparse import OptionParser
+
+DEFAULT_PORT = 6150
+AUTHKEY_ENV = "LOSTEQUIPMENT_WORKER_KEY"
+
+
+def _authkey():
+    """
+    Returns the shared key from the environment.
+
+    Connections exchange pickled objects, so the key is what stops other local users from running
+    code in the worker. There is deliberately no default.
+    """
+    key = os.environ.get(AUTHKEY_ENV)
+    if not key:
+        raise RuntimeError(f"Set {AUTHKEY_ENV} to a secret shared by the worker and its clients")
+    return key.encode("utf-8")
+
+
+def _config_signature(configFolder):
+    """Returns (file count, latest mtime) of the JSON files under the config folder."""
+    count, latest = 0, 0.0
+    for root, _, files in os.walk(configFolder or "."):
+        for file in files:
+            if file.lower().endswith(".json"):
+                count += 1
+                latest = max(latest, os.path.getmtime(os.path.join(root, file)))
+    return count, latest
+
+
+class _ConnectionWriter(object):
+    """File-like object that forwards complete lines of output to the client."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffer = ""
+        self.connected = True
+
+    def _send(self, line):
+        # A client that went away must not fail the job, its output is dropped from then on
+        if self.connected:
+            try:
+                self.conn.send(("log", line))
+            except (OSError, EOFError):
+                self.connected = False
+
+    def write(self, text):
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            self._send(line)
+        return len(text)
+
+    def flush(self):
+        if self.buffer:
+            self._send(self.buffer)
+            self.buffer = ""
+
+
+class LostEquipmentWorker(object):
+    """
+    Long-lived worker for the lost-equipment pipeline.
+
+    Importing arcpy and loading the configuration costs more than processing a single site, so
+    the worker does both once and then runs site jobs submitted over a local socket. Jobs run one
+    at a time through ProcessLostEquipment and their output is streamed back to the client. The
+    configuration is reloaded whenever a JSON file in the config folder changes.
+
+    Usage:
+        python LostEquipmentWorker.py serve -c <configFolder> [-p 6150]
+        python LostEquipmentWorker.py submit -u <mineSite> [-p 6150]
+        python LostEquipmentWorker.py stop [-p 6150]
+    """
+
+    def __init__(self, configFolder, level=1, port=DEFAULT_PORT):
+        self.configFolder = configFolder
+        self.level = level
+        self.port = port
+        self.config = None
+        self.signature = None
+
+        # Paid once per worker instead of once per site
+        start = time.time()
+        import arcpy
+        import DrillholeslostequipmentsProjected as pipeline
+        self.pipeline = pipeline
+        print(f"arcpy loaded in {time.time() - start:.1f}s (product: {arcpy.ProductInfo()})")
+        self._reload_config()
+
+    def _reload_config(self):
+        signature = _config_signature(self.configFolder)
+        if signature == self.signature and self.config is not None:
+            return False
+        start = time.time()
+        self.config = self.pipeline.load_config(self.configFolder, self.level)
+        self.signature = signature
+        print(f"Configuration loaded from {self.configFolder} in {time.time() - start:.1f}s")
+        return True
+
+    def run_job(self, job, conn):
+        """Runs one site job, streaming its output to conn. Returns True on success."""
+        writer = _ConnectionWriter(conn)
+        with contextlib.redirect_stdout(writer):
+            try:
+                if self._reload_config():
+                    print("Configuration changed on disk, reloaded")
+                fcName = job.get("fcName", "DrillholeLostEquipment")
+                process = self.pipeline.ProcessLostEquipment(job["mineSite"], fcName, self.config,
+                                                             self.config["projectedSearchFields"])
+                process.process_LostEquipment()
+                return True
+            except Exception:
+                print(traceback.format_exc())
+                return False
+            finally:
+                writer.flush()
+
+    def serve(self):
+        """Accepts jobs on localhost until a stop request is received."""
+        with Listener(("localhost", self.port), authkey=_authkey()) as listener:
+            print(f"Worker listening on localhost:{self.port}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"Rejected connection: {str(e)}")
+                    continue
+                with conn:
+                    # One bad request or dropped connection must not stop the listener
+                    try:
+                        if self._handle(conn):
+                            print("Worker stopped")
+                            return
+                    except Exception:
+                        print(f"Connection failed: {traceback.format_exc()}")
+
+    def _handle(self, conn):
+        """Serves one connection. Returns True if the worker was asked to stop."""
+        try:
+            request = conn.recv()
+        except (OSError, EOFError):
+            return False
+        if not isinstance(request, dict):
+            print(f"Ignored malformed request: {request!r}")
+            return False
+        if request.get("command") == "stop":
+            conn.send(("done", {"ok": True}))
+            return True
+
+        start = time.time()
+        print(f"Job started: {request}")
+        ok = self.run_job(request, conn)
+        elapsed = time.time() - start
+        print(f"Job {'succeeded' if ok else 'failed'} in {elapsed:.1f}s: {request}")
+        try:
+            conn.send(("done", {"ok": ok, "seconds": elapsed}))
+        except (OSError, EOFError):
+            pass
+        return False
+
+
+def submit(request, port=DEFAULT_PORT):
+    """Sends a request to the worker and prints its output as it arrives. Returns True on success."""
+    with Client(("localhost", port), authkey=_authkey()) as conn:
+        conn.send(request)
+        while True:
+            kind, payload = conn.recv()
+            if kind == "log":
+                print(payload)
+                sys.stdout.flush()
+            else:
+                return payload.get("ok", False)
+
+
+def main():
+    parser = OptionParser(usage="%prog serve|submit|stop [options]")
+    parser.add_option("-u", "--mineSite", action="store", dest="mineSite", type="string", help="Mine Site")
+    parser.add_option("-f", "--fcName", action="store", dest="fcName", type="string", default="DrillholeLostEquipment", help="Feature class config name")
+    parser.add_option("-c", "--configFolder", action="store", dest="configFolder", type="string", help="Path to the JSON configuration file")
+    parser.add_option("-1", "--level", action="store", dest="level", type="int", default=1, help="Levels to search for JSON config files")
+    parser.add_option("-p", "--port", action="store", dest="port", type="int", default=DEFAULT_PORT, help="Local worker port")
+
+    (options, args) = parser.parse_args()
+    command = args[0] if args else ""
+    if command in ("serve", "submit", "stop"):
+        try:
+            _authkey()
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    if command == "serve":
+        LostEquipmentWorker(options.configFolder, options.level, options.port).serve()
+    elif command == "submit":
+        if not options.mineSite:
+            parser.error("submit requires -u/--mineSite")
+        ok = submit({"mineSite": options.mineSite, "fcName": options.fcName}, options.port)
+        sys.exit(0 if ok else 1)
+    elif command == "stop":
+        submit({"command": "stop"}, options.port)
+    else:
+        parser.error("command must be one of serve, submit, stop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,674 @@
+import math
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import arcpy
+from ScratchWorkspace import ScratchWorkspace
+
+VALID_CONVERT_OPTIONS = ["Vertex", "Label", "Center", "CenterIn", "DeepestPoint"]
+
+# Grid samples per side tested for the DeepestPoint option
+DEEPEST_POINT_SAMPLES = 10
+
+# Smallest number of polygons worth handing to a separate process
+MIN_CHUNK_SIZE = 5000
+
+# Columns of the pad CSV export
+PAD_CSV_FIELDS = "PadName_1;CENTROID_X;CENTROID_Y;Height;COMMENTS;LENGTH;WIDTH;Azimuth;Status_ID;Sump_1_ID;Sump_2_ID;Sump_3_ID;Sump_4_ID;Type;Azimuth_ID;PlannedAHD"
+
+# Intermediate datasets of the pad pipeline
+PAD_INTERMEDIATES = [
+    "pad_fc_type_pad", "pad_fc_type_pad_copy", "pad_fc_type_pad_copy_classify",
+    "pad_fc_type_pad_copy_classify_points", "pad_fc_points_et_01", "pad_fc_points_et_01_lines",
+    "pad_fc_points_et_12", "pad_fc_points_et_12_copy", "pad_fc_points_et_12_lines",
+]
+
+
+def PolygonToPoints(in_features, out_feature_class, convert_option, remove_duplicates=False, calc_point_pos=False, keep_ZM=False, where_clause=None):
+    """
+    Converts a polygon dataset to a point feature class based on the specified conversion option.
+
+    Parameters:
+        in_features (str): Path to the input polygon feature class.
+        out_feature_class (str): Path to the output point feature class.
+        convert_option (str): "Vertex", "Label", "Center", "CenterIn", "DeepestPoint".
+        remove_duplicates (bool): If True, removes duplicate points (only for "Vertex").
+        calc_point_pos (bool): If True, calculates point position along the polygon boundary (only for "Vertex").
+        keep_ZM (bool): If True, retains Z(M) values if the input dataset supports them.
+        where_clause (str): Optional SQL expression limiting the polygons converted.
+    """
+    arcpy.AddMessage(f"Running PolygonToPoints with option: {convert_option}")
+
+    if convert_option not in VALID_CONVERT_OPTIONS:
+        raise ValueError(f"Invalid conversion option: {convert_option}. Choose from {VALID_CONVERT_OPTIONS}")
+
+    # Delete output if it exists
+    if arcpy.Exists(out_feature_class):
+        arcpy.Delete_management(out_feature_class)
+        arcpy.AddMessage(f"Deleted existing output: {out_feature_class}")
+
+    spatial_ref = arcpy.Describe(in_features).spatialReference
+    arcpy.CreateFeatureclass_management(
+        out_path=os.path.dirname(out_feature_class),
+        out_name=os.path.basename(out_feature_class),
+        geometry_type="POINT",
+        spatial_reference=spatial_ref,
+        has_z="ENABLED" if keep_ZM else "DISABLED",
+        has_m="ENABLED" if keep_ZM else "DISABLED"
+    )
+
+    # Add fields
+    arcpy.AddField_management(out_feature_class, "ET_ORDER", "DOUBLE" if calc_point_pos else "LONG")
+    arcpy.AddField_management(out_feature_class, "ET_IDP", "LONG")
+    if convert_option == "Vertex":
+        arcpy.AddField_management(out_feature_class, "ET_IDR", "TEXT", field_length=50)  # "FID_RingIndex"
+    arcpy.AddField_management(out_feature_class, "ET_X", "DOUBLE")
+    arcpy.AddField_management(out_feature_class, "ET_Y", "DOUBLE")
+    if keep_ZM:
+        arcpy.AddField_management(out_feature_class, "ET_Z", "DOUBLE")
+        arcpy.AddField_management(out_feature_class, "ET_M", "DOUBLE")
+
+    fields = ["SHAPE@", "ET_ORDER", "ET_IDP", "ET_X", "ET_Y"]
+    if convert_option == "Vertex":
+        fields.append("ET_IDR")  # Add ring identifier field
+    if keep_ZM:
+        fields.extend(["ET_Z", "ET_M"])
+
+    with arcpy.da.InsertCursor(out_feature_class, fields) as insert_cursor:
+        with arcpy.da.SearchCursor(in_features, ["OID@", "SHAPE@"], where_clause) as search_cursor:
+            for polygon_id, polygon_geom in search_cursor:
+                if polygon_geom is None:
+                    continue
+                new_points = []
+
+                if convert_option == "Vertex":
+                    seen_coords = set()
+                    boundary_length = polygon_geom.length if calc_point_pos else None
+
+                    for ring_index, part in enumerate(polygon_geom):
+                        vertices = list(part) if part else []
+                        cumulative_length = 0.0
+
+                        for i, vertex in enumerate(vertices):
+                            if not vertex:  # Skip None vertices (which represent interior rings)
+                                continue
+                            point_tuple = (vertex.X, vertex.Y, vertex.Z, vertex.M) if keep_ZM else (vertex.X, vertex.Y)
+
+                            if not (remove_duplicates and point_tuple in seen_coords):
+                                seen_coords.add(point_tuple)
+                                # ET_ORDER: either normalized (0-1) position along the boundary or raw index
+                                et_order = (cumulative_length / boundary_length) if calc_point_pos and boundary_length else i
+                                new_points.append((vertex, et_order, f"{polygon_id}_{ring_index}"))
+
+                            # Planar distance to the next vertex, as PointGeometry.distanceTo without a spatial reference
+                            if calc_point_pos and i < len(vertices) - 1 and vertices[i + 1]:
+                                cumulative_length += math.hypot(vertices[i + 1].X - vertex.X, vertices[i + 1].Y - vertex.Y)
+
+                elif convert_option == "Label":
+                    new_points.append((polygon_geom.labelPoint, None, None))
+
+                elif convert_option == "Center":
+                    new_points.append((polygon_geom.centroid, None, None))
+
+                elif convert_option == "CenterIn":
+                    centroid = polygon_geom.centroid
+                    new_points.append((centroid if polygon_geom.contains(centroid) else polygon_geom.labelPoint, None, None))
+
+                elif convert_option == "DeepestPoint":
+                    new_points.append((deepest_point(polygon_geom), None, None))
+
+                # Insert new points
+                for point, et_order, et_idr in new_points:
+                    row_data = [point, et_order, polygon_id, point.X, point.Y]
+                    if convert_option == "Vertex":
+                        row_data.append(et_idr)
+                    if keep_ZM:
+                        row_data.extend([point.Z, point.M])
+                    insert_cursor.insertRow(row_data)
+
+    arcpy.AddMessage(f"PolygonToPoints conversion completed: {out_feature_class}")
+
+
+def deepest_point(polygon_geom, samples=DEEPEST_POINT_SAMPLES):
+    """
+    Returns the interior point of a polygon furthest from its boundary.
+
+    Candidates are the label point and a samples x samples grid over the extent, every candidate
+    inside the polygon is measured against the boundary and the furthest one wins. The label
+    point is always inside, so a point is returned for every non-empty polygon.
+    """
+    spatial_ref = polygon_geom.spatialReference
+    boundary = polygon_geom.boundary()
+    extent = polygon_geom.extent
+    candidates = [polygon_geom.labelPoint]
+    for i in range(samples):
+        for j in range(samples):
+            point = arcpy.Point(extent.XMin + (i + 0.5) * extent.width / samples,
+                                extent.YMin + (j + 0.5) * extent.height / samples)
+            if polygon_geom.contains(arcpy.PointGeometry(point, spatial_ref)):
+                candidates.append(point)
+    return max(candidates, key=lambda point: arcpy.PointGeometry(point, spatial_ref).distanceTo(boundary))
+
+
+def _convert_chunk(chunk_index, input_dataset, scratch_folder, where_clause, conversion_option,
+                   remove_duplicates, calc_point_pos, keep_ZM):
+    """Converts one OID range into its own file geodatabase. Runs in a worker process."""
+    start = time.time()
+    gdb_name = f"chunk_{chunk_index}.gdb"
+    arcpy.CreateFileGDB_management(scratch_folder, gdb_name)
+    chunk_output = os.path.join(scratch_folder, gdb_name, "points")
+    PolygonToPoints(input_dataset, chunk_output, conversion_option, remove_duplicates,
+                    calc_point_pos, keep_ZM, where_clause)
+    point_count = int(arcpy.GetCount_management(chunk_output).getOutput(0))
+    return chunk_index, chunk_output, point_count, time.time() - start
+
+
+def get_oid_ranges(input_dataset, workers=None, min_chunk_size=MIN_CHUNK_SIZE, where_clause=None):
+    """
+    Splits the input into contiguous OID ranges with roughly equal feature counts.
+
+    The chunk count is the smaller of the worker count (CPU count by default) and the number
+    of chunks of at least min_chunk_size features. Only features matching where_clause count.
+
+    Returns:
+        list: (first OID, last OID, feature count) tuples in OID order.
+    """
+    with arcpy.da.SearchCursor(input_dataset, ["OID@"], where_clause) as cursor:
+        oids = sorted(row[0] for row in cursor)
+    if not oids:
+        return []
+
+    workers = workers or multiprocessing.cpu_count()
+    chunk_count = max(1, min(workers, math.ceil(len(oids) / float(min_chunk_size))))
+    bounds = [round(i * len(oids) / float(chunk_count)) for i in range(chunk_count + 1)]
+    return [(oids[bounds[i]], oids[bounds[i + 1] - 1], bounds[i + 1] - bounds[i])
+            for i in range(chunk_count) if bounds[i + 1] > bounds[i]]
+
+
+def PolygonToPointsParallel(input_dataset, out_feature_class, conversion_option, remove_duplicates=False, calc_point_pos=False, keep_ZM=False, workers=None, min_chunk_size=MIN_CHUNK_SIZE):
+    """
+    Parallel version of PolygonToPoints for very large polygon datasets.
+
+    The input is split into OID ranges, each range is converted in a separate process into its
+    own scratch geodatabase, and the chunk outputs are appended to the output in OID order. Every
+    output attribute only depends on its own polygon, so ET_ORDER, ET_IDP and ET_IDR and the row
+    order are identical to a serial run over an input read in OID order.
+
+    A layer's definition query is applied to every chunk. A layer with a selection, an input
+    small enough for one chunk, or a process pool that cannot start is converted serially.
+
+    Parameters:
+        input_dataset (str): Path to the input polygon feature class.
+        out_feature_class (str): Path to the output point feature class.
+        conversion_option (str): "Vertex", "Label", "Center", "CenterIn", "DeepestPoint".
+        remove_duplicates (bool): If True, removes duplicate points (only for "Vertex").
+        calc_point_pos (bool): If True, calculates point position along the polygon boundary (only for "Vertex").
+        keep_ZM (bool): If True, retains Z(M) values if the input dataset supports them.
+        workers (int): Maximum number of processes. Defaults to the CPU count.
+        min_chunk_size (int): Minimum number of polygons per chunk.
+
+    Returns:
+        list: Per-chunk timing dicts with "chunk", "oid_range", "polygons", "points" and "seconds".
+    """
+    start = time.time()
+    desc = arcpy.Describe(input_dataset)
+    input_path = desc.catalogPath  # workers can't see layers created in this process
+    oid_field = arcpy.AddFieldDelimiters(input_path, desc.OIDFieldName)
+
+    # Workers read the feature class, so carry the layer's definition query over to them
+    is_layer = getattr(desc, "dataType", "") in ("FeatureLayer", "Layer")
+    layer_where = (getattr(desc, "whereClause", "") or None) if is_layer else None
+    selection = getattr(desc, "FIDSet", "") if is_layer else ""
+
+    def convert_serially(ranges):
+        chunk_start = time.time()
+        PolygonToPoints(input_dataset, out_feature_class, conversion_option, remove_duplicates, calc_point_pos, keep_ZM)
+        polygons = sum(r[2] for r in ranges) if ranges else int(arcpy.GetCount_management(input_dataset).getOutput(0))
+        points = int(arcpy.GetCount_management(out_feature_class).getOutput(0))
+        return [{"chunk": 0, "oid_range": (ranges[0][0], ranges[-1][1]) if ranges else None, "polygons": polygons,
+                 "points": points, "seconds": time.time() - chunk_start}]
+
+    if selection:
+        arcpy.AddMessage("Input layer has a selection, converting serially")
+        return convert_serially([])
+
+    ranges = get_oid_ranges(input_path, workers, min_chunk_size, layer_where)
+    if len(ranges) <= 1:
+        return convert_serially(ranges)
+
+    arcpy.AddMessage(f"Converting {sum(r[2] for r in ranges)} polygons in {len(ranges)} chunks")
+    scratch_folder = tempfile.mkdtemp(prefix="PolygonToPoints_", dir=arcpy.env.scratchFolder)
+    try:
+        # Inside ArcGIS Pro sys.executable is ArcGISPro.exe, so point workers at python.exe
+        if os.name == "nt":
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix, "python.exe"))
+
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(_convert_chunk, index, input_path, scratch_folder,
+                                           f"{oid_field} >= {first} AND {oid_field} <= {last}"
+                                           + (f" AND ({layer_where})" if layer_where else ""),
+                                           conversion_option, remove_duplicates, calc_point_pos, keep_ZM)
+                           for index, (first, last, _) in enumerate(ranges)]
+                results = sorted(future.result() for future in futures)
+        except Exception as e:
+            arcpy.AddWarning(f"Parallel conversion unavailable ({str(e)}), converting serially")
+            return convert_serially(ranges)
+
+        # Bulk append the chunks in OID order
+        merge_start = time.time()
+        chunk_outputs = [chunk_output for _, chunk_output, _, _ in results]
+        if arcpy.Exists(out_feature_class):
+            arcpy.Delete_management(out_feature_class)
+            arcpy.AddMessage(f"Deleted existing output: {out_feature_class}")
+        arcpy.CreateFeatureclass_management(
+            out_path=os.path.dirname(out_feature_class),
+            out_name=os.path.basename(out_feature_class),
+            geometry_type="POINT",
+            template=chunk_outputs[0],
+            has_z="ENABLED" if keep_ZM else "DISABLED",
+            has_m="ENABLED" if keep_ZM else "DISABLED",
+            spatial_reference=desc.spatialReference
+        )
+        arcpy.Append_management(chunk_outputs, out_feature_class, "NO_TEST")
+        merge_seconds = time.time() - merge_start
+    finally:
+        shutil.rmtree(scratch_folder, ignore_errors=True)
+
+    timings = [{"chunk": index, "oid_range": ranges[index][:2], "polygons": ranges[index][2],
+                "points": points, "seconds": seconds}
+               for index, _, points, seconds in results]
+    arcpy.AddMessage("Chunk  OID range             Polygons    Points  Seconds")
+    for timing in timings:
+        first, last = timing["oid_range"]
+        arcpy.AddMessage(f"{timing['chunk']:>5}  {first:>9}-{last:<11} {timing['polygons']:>8} {timing['points']:>9} {timing['seconds']:>8.1f}")
+    arcpy.AddMessage(f"Merge: {merge_seconds:.1f}s, total: {time.time() - start:.1f}s")
+    arcpy.AddMessage(f"Conversion completed: {out_feature_class}")
+    return timings
+
+
+def PointsToPolylines(in_dataset, out_dataset, polyline_id_field, Z_value_field=None, M_value_field=None,
+                      order_field=None, link_field=None):
+    """
+    Converts points to polylines based on a common ID field.
+
+    Parameters:
+        in_dataset (str): Path to the input point feature class.
+        out_dataset (str): Path to the output polyline feature class.
+        polyline_id_field (str): Field that identifies which points belong to the same polyline.
+        Z_value_field (str, optional): Field containing Z values.
+        M_value_field (str, optional): Field containing M values.
+        order_field (str, optional): Field to sort points within each polyline.
+        link_field (str, optional): Field to store link information.
+    """
+    arcpy.AddMessage(f"Running PointsToPolylines with ID field: {polyline_id_field}")
+
+    # Describe the input dataset
+    desc = arcpy.Describe(in_dataset)
+    spatial_ref = desc.spatialReference
+    has_z = bool(Z_value_field) or desc.hasZ
+    has_m = bool(M_value_field) or desc.hasM
+
+    if arcpy.Exists(out_dataset):
+        arcpy.Delete_management(out_dataset)
+        arcpy.AddMessage(f"Deleted existing output: {out_dataset}")
+
+    # Create an empty polyline feature class
+    arcpy.CreateFeatureclass_management(
+        out_path=os.path.dirname(out_dataset),
+        out_name=os.path.basename(out_dataset),
+        geometry_type="POLYLINE",
+        spatial_reference=spatial_ref,
+        has_z="ENABLED" if has_z else "DISABLED",
+        has_m="ENABLED" if has_m else "DISABLED"
+    )
+
+    # Add required fields
+    arcpy.AddField_management(out_dataset, "ET_ID", "TEXT")
+    if link_field:
+        arcpy.AddField_management(out_dataset, "ET_FromAtt", "TEXT")
+        arcpy.AddField_management(out_dataset, "ET_ToAtt", "TEXT")
+
+    # Only the point coordinates are needed, not full geometry objects
+    fields = ["SHAPE@XY", polyline_id_field]
+    order_index = link_index = z_index = m_index = None
+    for name in (order_field, link_field, Z_value_field, M_value_field):
+        if name:
+            fields.append(name)
+    if order_field:
+        order_index = fields.index(order_field)
+    if link_field:
+        link_index = fields.index(link_field)
+    # Vertex Z/M come from the value fields, or from the input shapes when it has them
+    if Z_value_field:
+        z_index = fields.index(Z_value_field)
+    elif desc.hasZ:
+        fields.append("SHAPE@Z")
+        z_index = len(fields) - 1
+    if M_value_field:
+        m_index = fields.index(M_value_field)
+    elif desc.hasM:
+        fields.append("SHAPE@M")
+        m_index = len(fields) - 1
+
+    # Read points into dictionary grouped by Polyline ID
+    points_dict = {}
+    with arcpy.da.SearchCursor(in_dataset, fields) as cursor:
+        for row in cursor:
+            if row[0] is None:
+                continue
+            order_val = row[order_index] if order_index is not None else 0
+            link_val = row[link_index] if link_index is not None else None
+            point = arcpy.Point(row[0][0], row[0][1],
+                                row[z_index] if z_index is not None else None,
+                                row[m_index] if m_index is not None else None)
+            points_dict.setdefault(row[1], []).append((point, order_val, link_val))
+
+    # Create polylines from points
+    insert_fields = ["SHAPE@", "ET_ID"]
+    if link_field:
+        insert_fields.extend(["ET_FromAtt", "ET_ToAtt"])
+
+    with arcpy.da.InsertCursor(out_dataset, insert_fields) as insert_cursor:
+        for polyline_id, points in points_dict.items():
+            if order_field:
+                points.sort(key=lambda x: x[1])  # Sort by order field if provided
+
+            polyline = arcpy.Polyline(arcpy.Array([p[0] for p in points]), spatial_ref, has_z, has_m)
+            insert_values = [polyline, polyline_id]
+            if link_field:
+                insert_values.extend([points[0][2], points[-1][2]])
+
+            insert_cursor.insertRow(insert_values)
+
+    arcpy.AddMessage(f"PointsToPolylines conversion completed: {out_dataset}")
+
+
+def describe_input(path):
+    """Returns the data type of an input, including the source of a feature layer."""
+    desc = arcpy.Describe(path)
+    data_type = desc.dataType
+    if hasattr(desc, "featureClass"):
+        data_type += f" (Feature Layer from {arcpy.Describe(desc.featureClass).dataType})"
+    return data_type
+
+
+def process_pads(pad_fc_path, classify_fc_path, output_csv, processing_location="File Geodatabase",
+                 output_workspace=None, fields_to_drop=None, output_sr=None):
+    """
+    Runs the pad processing workflow and exports the pad attributes to CSV.
+
+    Pads are selected from the pad polygons, joined to the classification features and measured:
+    LENGTH from the first edge (vertices 0-1), WIDTH and Azimuth from the second edge (vertices 1-2).
+
+    Parameters:
+        pad_fc_path (str): Pad polygon feature class or layer.
+        classify_fc_path (str): Classification feature class or layer.
+        output_csv (str): Output CSV file.
+        processing_location (str): "File Geodatabase" or "In Memory".
+        output_workspace (str): Workspace for intermediates when processing_location is "File Geodatabase".
+        fields_to_drop (list): Optional fields deleted from the spatial join result.
+        output_sr (SpatialReference): Optional coordinate system for the exported centroid coordinates.
+    """
+    fields_to_drop = fields_to_drop or []
+
+    # Log input types and processing location
+    try:
+        arcpy.AddMessage(f"Input Pad Feature Class: {pad_fc_path} (Type: {describe_input(pad_fc_path)})")
+        arcpy.AddMessage(f"Input Classification Feature Class: {classify_fc_path} (Type: {describe_input(classify_fc_path)})")
+        arcpy.AddMessage(f"Processing Location: {processing_location}")
+        if processing_location == "File Geodatabase":
+            arcpy.AddMessage(f"Output Workspace: {output_workspace} (Type: {arcpy.Describe(output_workspace).dataType})")
+        arcpy.AddMessage(f"Output CSV: {output_csv}")
+    except Exception as e:
+        arcpy.AddWarning(f"Warning during input description: {str(e)}")
+
+    # Set up intermediate outputs
+    scratch = None
+    if processing_location == "In Memory":
+        arcpy.AddMessage("Using in-memory workspace for processing (faster but temporary)")
+        # Unique per-run names so concurrent runs in the same process don't collide
+        scratch = ScratchWorkspace(prefix="pad", use_memory=True, memory_workspace="in_memory")
+        paths = {name: scratch.name(name) for name in PAD_INTERMEDIATES}
+    else:
+        # For file geodatabase, use full paths
+        paths = {name: os.path.join(output_workspace, name) for name in PAD_INTERMEDIATES}
+
+    pad_fc_type_pad = paths["pad_fc_type_pad"]
+    pad_fc_type_pad_copy = paths["pad_fc_type_pad_copy"]
+    pad_fc_type_pad_copy_classify = paths["pad_fc_type_pad_copy_classify"]
+    pad_fc_type_pad_copy_classify_points = paths["pad_fc_type_pad_copy_classify_points"]
+    pad_fc_points_et_01 = paths["pad_fc_points_et_01"]
+    pad_fc_points_et_01_lines = paths["pad_fc_points_et_01_lines"]
+    pad_fc_points_et_12 = paths["pad_fc_points_et_12"]
+    pad_fc_points_et_12_copy = paths["pad_fc_points_et_12_copy"]
+    pad_fc_points_et_12_lines = paths["pad_fc_points_et_12_lines"]
+
+    try:
+        arcpy.AddMessage("Starting pad processing workflow...")
+
+        # Select pads
+        arcpy.AddMessage("Selecting pad features...")
+        arcpy.Select_analysis(in_features=pad_fc_path, out_feature_class=pad_fc_type_pad,
+                              where_clause="PolyType = 'Pad'")
+
+        # Copy features
+        arcpy.AddMessage("Copying pad features...")
+        arcpy.CopyFeatures_management(in_features=pad_fc_type_pad,
+                                      out_feature_class=pad_fc_type_pad_copy)
+
+        # Spatial join
+        arcpy.AddMessage("Performing spatial join with classification data...")
+        arcpy.SpatialJoin_analysis(target_features=pad_fc_type_pad_copy,
+                                   join_features=classify_fc_path,
+                                   out_feature_class=pad_fc_type_pad_copy_classify,
+                                   join_operation="JOIN_ONE_TO_ONE",
+                                   join_type="KEEP_ALL",
+                                   match_option="INTERSECT")
+
+        # Delete fields if specified
+        if fields_to_drop:
+            arcpy.AddMessage(f"Deleting specified fields: {fields_to_drop}")
+            arcpy.DeleteField_management(in_table=pad_fc_type_pad_copy_classify,
+                                         drop_field=fields_to_drop)
+
+        # Add centroid attributes
+        arcpy.AddMessage("Adding geometry attributes...")
+        arcpy.AddGeometryAttributes_management(Input_Features=pad_fc_type_pad_copy_classify,
+                                               Geometry_Properties="CENTROID")
+
+        # Convert the centroids with the cached vectorized transformer instead of projecting the features
+        if output_sr:
+            arcpy.AddMessage(f"Converting centroid coordinates to {output_sr.name}...")
+            from CoordinateTransform import project_fields
+            project_fields(pad_fc_type_pad_copy_classify, ["CENTROID_X", "CENTROID_Y"], ["CENTROID_X", "CENTROID_Y"],
+                           arcpy.Describe(pad_fc_type_pad_copy_classify).spatialReference, output_sr)
+
+        # Add fields
+        arcpy.AddMessage("Adding Height and COMMENTS fields...")
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify,
+                                  field_name="Height", field_type="DOUBLE")
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify,
+                                  field_name="COMMENTS", field_type="TEXT")
+
+        # Calculate fields
+        arcpy.AddMessage("Calculating field values...")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify,
+                                        field="Height",
+                                        expression="!PlannedAHD!",
+                                        expression_type="PYTHON3")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify,
+                                        field="COMMENTS",
+                                        expression="'Sump ' + str(!Sump!) + ' Dip ' + str(!PlannedInc!) + ' Azi ' + str(!PlannedAzi!) + ' Depth ' + str(!PlannedDep!)",
+                                        expression_type="PYTHON3")
+
+        # Delete unnecessary fields
+        arcpy.AddMessage("Deleting unnecessary fields...")
+        arcpy.DeleteField_management(in_table=pad_fc_type_pad_copy_classify,
+                                     drop_field=["PlannedAHD", "PlannedAzi", "PlannedDep"])
+
+        # Convert polygons to points
+        arcpy.AddMessage("Converting polygons to points...")
+        PolygonToPoints(in_features=pad_fc_type_pad_copy_classify,
+                        out_feature_class=pad_fc_type_pad_copy_classify_points,
+                        convert_option="Vertex",
+                        remove_duplicates=True,
+                        calc_point_pos=False,
+                        keep_ZM=False)
+
+        # Select points with ET_ORDER 0 or 1
+        arcpy.AddMessage("Selecting points with ET_ORDER 0 or 1...")
+        arcpy.Select_analysis(in_features=pad_fc_type_pad_copy_classify_points,
+                              out_feature_class=pad_fc_points_et_01,
+                              where_clause="ET_ORDER = 0 OR ET_ORDER = 1")
+
+        # Convert points to polylines
+        arcpy.AddMessage("Converting points to polylines (ET_ORDER 0 or 1)...")
+        PointsToPolylines(in_dataset=pad_fc_points_et_01,
+                          out_dataset=pad_fc_points_et_01_lines,
+                          polyline_id_field="PadName_1")
+
+        # Add length attribute
+        arcpy.AddMessage("Adding length attribute to polylines...")
+        arcpy.AddGeometryAttributes_management(Input_Features=pad_fc_points_et_01_lines,
+                                               Geometry_Properties=["LENGTH"])
+
+        # Join fields
+        arcpy.AddMessage("Joining length field to pad features...")
+        arcpy.JoinField_management(in_data=pad_fc_type_pad_copy_classify,
+                                   in_field="PadName_1",
+                                   join_table=pad_fc_points_et_01_lines,
+                                   join_field="ET_ID",
+                                   fields=["LENGTH"])
+
+        # Select points with ET_ORDER 1 or 2
+        arcpy.AddMessage("Selecting points with ET_ORDER 1 or 2...")
+        arcpy.Select_analysis(in_features=pad_fc_type_pad_copy_classify_points,
+                              out_feature_class=pad_fc_points_et_12,
+                              where_clause="ET_ORDER = 1 OR ET_ORDER = 2")
+
+        # Copy features
+        arcpy.AddMessage("Copying selected points...")
+        arcpy.CopyFeatures_management(in_features=pad_fc_points_et_12,
+                                      out_feature_class=pad_fc_points_et_12_copy)
+
+        # Convert points to polylines
+        arcpy.AddMessage("Converting points to polylines (ET_ORDER 1 or 2)...")
+        PointsToPolylines(in_dataset=pad_fc_points_et_12_copy,
+                          out_dataset=pad_fc_points_et_12_lines,
+                          polyline_id_field="PadName_2",
+                          order_field="ET_ORDER")
+
+        # Add geometry attributes
+        arcpy.AddMessage("Adding geometry attributes to polylines...")
+        arcpy.AddGeometryAttributes_management(Input_Features=pad_fc_points_et_12_lines,
+                                               Geometry_Properties=["LENGTH", "LINE_START_MID_END"])
+
+        # Add azimuth field
+        arcpy.AddMessage("Adding and calculating azimuth field...")
+        arcpy.AddField_management(in_table=pad_fc_points_et_12_lines,
+                                  field_name="Azimuth", field_type="DOUBLE")
+
+        # Calculate azimuth
+        arcpy.CalculateField_management(in_table=pad_fc_points_et_12_lines,
+                                        field="Azimuth",
+                                        expression="180-math.degrees(math.atan2((!END_Y! - !START_Y!),(!END_X! - !START_X!)))",
+                                        expression_type="PYTHON3")
+
+        # Rename LENGTH field to WIDTH
+        arcpy.AddMessage("Renaming LENGTH field to WIDTH...")
+        arcpy.AlterField_management(in_table=pad_fc_points_et_12_lines,
+                                    field="LENGTH",
+                                    new_field_name="WIDTH")
+
+        # Delete unnecessary fields
+        arcpy.AddMessage("Deleting unnecessary fields...")
+        arcpy.DeleteField_management(in_table=pad_fc_points_et_12_lines,
+                                     drop_field=["START_X", "START_Y", "MID_X", "MID_Y", "END_X", "END_Y"])
+
+        # Join fields
+        arcpy.AddMessage("Joining width and azimuth fields to pad features...")
+        arcpy.JoinField_management(in_data=pad_fc_type_pad_copy_classify,
+                                   in_field="PadName_1",
+                                   join_table=pad_fc_points_et_12_lines,
+                                   join_field="ET_ID",
+                                   fields=["WIDTH", "Azimuth"])
+
+        # Add additional fields
+        arcpy.AddMessage("Adding additional fields...")
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Status_ID", field_type="TEXT", field_length=15)
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Sump_1_ID", field_type="TEXT", field_length=15)
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Sump_2_ID", field_type="TEXT", field_length=15)
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Sump_3_ID", field_type="TEXT", field_length=15)
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Sump_4_ID", field_type="TEXT", field_length=15)
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Type", field_type="DOUBLE")
+        arcpy.AddField_management(in_table=pad_fc_type_pad_copy_classify, field_name="Azimuth_ID", field_type="TEXT", field_length=15)
+
+        # Calculate field values
+        arcpy.AddMessage("Calculating field values...")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify, field="Status_ID", expression="!PadStatus!", expression_type="PYTHON3")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify, field="Sump_1_ID", expression="!Sump!", expression_type="PYTHON3")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify, field="Type", expression="1", expression_type="PYTHON3")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify, field="Azimuth_ID", expression="!PlannedInc!", expression_type="PYTHON3")
+        arcpy.CalculateField_management(in_table=pad_fc_type_pad_copy_classify, field="Azimuth_ID", expression="'Vertical' if !Azimuth_ID! == '-90' else 'Inclined'", expression_type="PYTHON3")
+
+        # Export to CSV
+        arcpy.AddMessage(f"Exporting results to CSV: {output_csv}")
+        arcpy.ExportTable_conversion(in_rows=pad_fc_type_pad_copy_classify,
+                                     out_table=output_csv,
+                                     field_names=PAD_CSV_FIELDS)
+
+        arcpy.AddMessage("Processing complete!")
+
+    except Exception as e:
+        arcpy.AddError(f"Error during processing: {str(e)}")
+        raise
+
+    finally:
+        # Clean up this run's in-memory intermediates, leaving the shared workspace alone
+        if scratch is not None:
+            arcpy.AddMessage("Cleaning up in-memory intermediates...")
+            scratch.cleanup()
+
+
+def benchmark_startup(repeat=3):
+    """
+    Measures what opening the pad toolboxes costs in a fresh interpreter.
+
+    Each measurement runs in a new process: importing arcpy alone, loading each toolbox and
+    building its parameters (what ArcGIS Pro does on open and validation), and importing this
+    core on top, which only happens when a tool executes.
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    load_toolbox = ("import runpy, time; start = time.time(); "
+                    "namespace = runpy.run_path({path!r}); box = namespace['Toolbox'](); "
+                    "[tool().getParameterInfo() for tool in box.tools]; print(time.time() - start)")
+    cases = [("import arcpy", "import time; start = time.time(); import arcpy; print(time.time() - start)")]
+    for toolbox in ("PadProcessingTools.pyt", "PadProcessingToolbox.pyt"):
+        cases.append((f"open {toolbox}", "import arcpy; " + load_toolbox.format(path=os.path.join(folder, toolbox))))
+    cases.append(("import PadProcessingCore",
+                  f"import sys, time; sys.path.insert(0, {folder!r}); import arcpy; start = time.time(); "
+                  "import PadProcessingCore; print(time.time() - start)"))
+
+    results = {}
+    for label, code in cases:
+        timings = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=folder)
+            if output.returncode != 0:
+                print(f"{label}: failed\n{output.stderr.strip()}")
+                break
+            timings.append(float(output.stdout.strip().splitlines()[-1]))
+        if timings:
+            results[label] = min(timings)
+            print(f"{label}: {results[label] * 1000:.0f} ms (best of {len(timings)})")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_startup()
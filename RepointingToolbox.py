@@ -1,5 +1,226 @@
 import arcpy
 import os
+import sys
+import json
+import re
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+INDEX_FILE_NAME = ".aprx_datasource_index.json"
+
+# CIM documents inside an .aprx archive are JSON (Pro 2.x+) or XML (older projects)
+_JSON_CONNECTION = re.compile(r'"workspaceConnectionString"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_XML_CONNECTION = re.compile(r"<WorkspaceConnectionString>(.*?)</WorkspaceConnectionString>", re.DOTALL)
+
+
+def scan_aprx(aprx_path):
+    """
+    Reads the workspace connection strings referenced by a project without opening it in arcpy.
+
+    Parameters:
+        aprx_path (str): Path to the .aprx file.
+
+    Returns:
+        list: Sorted, de-duplicated workspace connection strings found in the project archive.
+    """
+    sources = set()
+    with zipfile.ZipFile(aprx_path, "r") as archive:
+        for member in archive.namelist():
+            lower_name = member.lower()
+            if not (lower_name.endswith(".json") or lower_name.endswith(".xml")):
+                continue
+            text = archive.read(member).decode("utf-8", errors="ignore")
+            for match in _JSON_CONNECTION.findall(text):
+                try:
+                    sources.add(json.loads(f'"{match}"'))
+                except ValueError:
+                    sources.add(match)
+            for match in _XML_CONNECTION.findall(text):
+                sources.add(match.strip())
+    return sorted(sources)
+
+
+def build_index(aprx_files, index_path):
+    """
+    Builds (or incrementally refreshes) the data source index for a list of projects.
+
+    Entries are reused from the persisted index while a project's modification time and size
+    are unchanged, so repeated runs over the same share only re-read projects that were edited.
+    Use save_index to persist the result.
+
+    Parameters:
+        aprx_files (list): Paths of the .aprx files to index.
+        index_path (str): Path of the JSON index file to read, may be None.
+
+    Returns:
+        dict: Mapping of project path to {"mtime", "size", "sources", "error"}.
+    """
+    previous = {}
+    if index_path and os.path.exists(index_path):
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                previous = json.load(f).get("projects", {})
+        except (OSError, ValueError):
+            previous = {}
+
+    projects = {}
+    for aprx_path in aprx_files:
+        stat = os.stat(aprx_path)
+        cached = previous.get(aprx_path)
+        if cached and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size and not cached.get("error"):
+            projects[aprx_path] = cached
+            continue
+
+        entry = {"mtime": stat.st_mtime, "size": stat.st_size, "sources": [], "error": None}
+        try:
+            entry["sources"] = scan_aprx(aprx_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            entry["error"] = str(e)
+        projects[aprx_path] = entry
+
+    return projects
+
+
+def save_index(projects, index_path):
+    """
+    Writes the data source index. A folder that cannot be written to (e.g. a read-only share)
+    is reported as a warning, the run continues without a persisted index.
+
+    Returns:
+        bool: True if the index was written.
+    """
+    try:
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump({"projects": projects}, f, indent=2)
+    except OSError as e:
+        arcpy.AddWarning(f"Could not save index to {index_path} ({str(e)}), continuing without it")
+        return False
+    return True
+
+
+def get_match_tokens(data_source):
+    """
+    Returns the lower-case tokens that identify a workspace inside a connection string.
+
+    File geodatabases and folders are matched on their base name. Enterprise (.sde)
+    connection files are matched on the instance and database they point at, because
+    the connection file name itself is not stored in the project. The tokens only prefilter
+    the index, layers are repointed on an exact workspace match (see workspace_key).
+    """
+    if data_source.lower().endswith(".sde"):
+        try:
+            props = arcpy.Describe(data_source).connectionProperties
+            tokens = [getattr(props, name, "") for name in ("instance", "database")]
+            tokens = [str(token).lower() for token in tokens if token]
+            if tokens:
+                return tokens
+        except Exception:
+            pass
+    return [os.path.basename(os.path.normpath(data_source)).lower()]
+
+
+def matches_source(source, match_tokens):
+    """Returns True if a connection string from the index may refer to the matched workspace."""
+    source = source.lower()
+    return all(token in source for token in match_tokens)
+
+
+def _normalise_path(path):
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def _enterprise_key(properties):
+    return ("sde", str(properties.get("instance", "")).lower(), str(properties.get("database", "")).lower())
+
+
+def workspace_key(data_source):
+    """
+    Returns the key a layer's workspace must equal to be repointed from data_source.
+
+    Enterprise connection files are keyed on the instance and database they connect to,
+    everything else on its normalised full path.
+    """
+    if data_source.lower().endswith(".sde"):
+        props = arcpy.Describe(data_source).connectionProperties
+        return _enterprise_key({name: getattr(props, name, "") for name in ("instance", "database")})
+    return ("path", _normalise_path(data_source))
+
+
+def layer_workspace_key(layer):
+    """Returns the workspace key of a layer, comparable with workspace_key."""
+    props = layer.connectionProperties or {}
+    info = props.get("connection_info", {})
+    if str(props.get("workspace_factory", "")).upper() == "SDE":
+        return _enterprise_key(info)
+    if info.get("database"):
+        return ("path", _normalise_path(info["database"]))
+
+    # No connection properties: the workspace is the geodatabase or folder holding the dataset
+    match = re.match(r"(.*?\.gdb)(?:[\\/]|$)", layer.dataSource, re.IGNORECASE)
+    return ("path", _normalise_path(match.group(1) if match else os.path.dirname(layer.dataSource)))
+
+
+def find_candidates(projects, match_tokens):
+    """
+    Returns {project path: matching sources} for projects that may reference the old source.
+
+    Projects whose archive could not be read are always returned so they get a full check.
+    """
+    candidates = {}
+    for aprx_path, entry in projects.items():
+        if entry.get("error"):
+            candidates[aprx_path] = []
+            continue
+        matched = [source for source in entry["sources"] if matches_source(source, match_tokens)]
+        if matched:
+            candidates[aprx_path] = matched
+    return candidates
+
+
+def repoint_project(aprx_path, old_source, new_source, old_key=None):
+    """
+    Opens a single project, repoints matching layers and saves it only if something changed.
+
+    A layer is repointed only when its workspace is the old source itself (see workspace_key),
+    so a same-named geodatabase elsewhere is left alone. Runs in a worker process, so results
+    are returned rather than written with arcpy.AddMessage.
+
+    Returns:
+        tuple: (aprx_path, list of updated layer names, error message or None)
+    """
+    updated_layers = []
+    try:
+        if old_key is None:
+            old_key = workspace_key(old_source)
+        aprx = arcpy.mp.ArcGISProject(aprx_path)
+        workspace_type = "FILEGDB_WORKSPACE" if new_source.endswith(".gdb") else "SDE_WORKSPACE"
+
+        for map_obj in aprx.listMaps():
+            for layer in map_obj.listLayers():
+                if layer.supports("DATASOURCE") and layer_workspace_key(layer) == old_key:
+                    layer.replaceDataSource(new_source, workspace_type)
+                    updated_layers.append(layer.name)
+
+        if updated_layers:
+            aprx.save()
+        del aprx
+    except Exception as e:
+        return aprx_path, updated_layers, str(e)
+    return aprx_path, updated_layers, None
+
+
+def _report_result(aprx_path, updated_layers, error):
+    if error:
+        arcpy.AddError(f"Error processing {aprx_path}: {error}")
+        return
+    for layer_name in updated_layers:
+        arcpy.AddMessage(f"Updated layer: {layer_name}")
+    if updated_layers:
+        arcpy.AddMessage(f"Updated and saved: {aprx_path}")
+    else:
+        arcpy.AddMessage(f"No matching layers, left unchanged: {aprx_path}")
+
 
 class Toolbox(object):
     def __init__(self):
@@ -41,13 +262,45 @@ class RepointDataSource(object):
             direction="Input"
         )
 
-        return [param0, param1, param2]
+        # Report the projects that would change without opening or saving them
+        param3 = arcpy.Parameter(
+            displayName="Dry Run (report from index only)",
+            name="dry_run",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input"
+        )
+        param3.value = False
+
+        # Data source index, defaults to a hidden file in the input folder (skipped if it is read-only)
+        param4 = arcpy.Parameter(
+            displayName="Data Source Index File",
+            name="index_file",
+            datatype="DEFile",
+            parameterType="Optional",
+            direction="Input"
+        )
+        param4.filter.list = ["json"]
+
+        param5 = arcpy.Parameter(
+            displayName="Parallel Workers",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input"
+        )
+        param5.value = max(1, multiprocessing.cpu_count() - 1)
+
+        return [param0, param1, param2, param3, param4, param5]
 
     def execute(self, parameters, messages):
         """Execute the tool."""
         input_folder = parameters[0].valueAsText
         old_source = parameters[1].valueAsText
         new_source = parameters[2].valueAsText
+        dry_run = bool(parameters[3].value)
+        index_path = parameters[4].valueAsText or os.path.join(input_folder, INDEX_FILE_NAME)
+        workers = int(parameters[5].value) if parameters[5].value else 1
 
         if not os.path.exists(input_folder):
             arcpy.AddError("Input folder does not exist.")
@@ -59,23 +312,54 @@ class RepointDataSource(object):
             arcpy.AddMessage("No APRX files found in the selected folder.")
             return
 
-        arcpy.AddMessage(f"Found {len(aprx_files)} APRX files. Processing...")
+        # Phase 1: scan project archives into the persisted index
+        arcpy.AddMessage(f"Found {len(aprx_files)} APRX files. Scanning data sources...")
+        projects = build_index(aprx_files, index_path)
+        candidates = find_candidates(projects, get_match_tokens(old_source))
+        if save_index(projects, index_path):
+            arcpy.AddMessage(f"Index saved to {index_path}")
+        else:
+            index_path = None
+        arcpy.AddMessage(f"{len(candidates)} of {len(aprx_files)} projects reference {old_source}")
 
-        for aprx_path in aprx_files:
-            try:
-                arcpy.AddMessage(f"Processing: {aprx_path}")
-                aprx = arcpy.mp.ArcGISProject(aprx_path)
-
-                for map_obj in aprx.listMaps():
-                    for layer in map_obj.listLayers():
-                        if layer.supports("DATASOURCE") and old_source in layer.dataSource:
-                            layer.replaceDataSource(new_source, "FILEGDB_WORKSPACE" if new_source.endswith(".gdb") else "SDE_WORKSPACE")
-                            arcpy.AddMessage(f"Updated layer: {layer.name}")
+        if dry_run:
+            for aprx_path, sources in sorted(candidates.items()):
+                if projects[aprx_path].get("error"):
+                    arcpy.AddWarning(f"{aprx_path}: could not be scanned ({projects[aprx_path]['error']})")
+                else:
+                    arcpy.AddMessage(f"{aprx_path}: {'; '.join(sources)}")
+            arcpy.AddMessage("Dry run completed, no projects were modified.")
+            return
 
-                aprx.save()
-                arcpy.AddMessage(f"Updated and saved: {aprx_path}")
+        if not candidates:
+            arcpy.AddMessage("Repointing completed successfully.")
+            return
 
+        # Phase 2: open only the candidate projects, in parallel where possible
+        old_key = workspace_key(old_source)
+        candidate_paths = sorted(candidates)
+        if workers > 1 and len(candidate_paths) > 1:
+            # Inside ArcGIS Pro sys.executable is ArcGISPro.exe, so point workers at python.exe
+            if os.name == "nt":
+                multiprocessing.set_executable(os.path.join(sys.exec_prefix, "python.exe"))
+            remaining = set(candidate_paths)
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(candidate_paths))) as executor:
+                    futures = {executor.submit(repoint_project, aprx_path, old_source, new_source, old_key): aprx_path
+                               for aprx_path in candidate_paths}
+                    for future in as_completed(futures):
+                        _report_result(*future.result())
+                        remaining.discard(futures[future])
             except Exception as e:
-                arcpy.AddError(f"Error processing {aprx_path}: {str(e)}")
-        
+                arcpy.AddWarning(f"Parallel repointing unavailable ({str(e)}), continuing sequentially")
+            # Projects finished by the pool are not opened or reported again
+            candidate_paths = sorted(remaining)
+
+        for aprx_path in candidate_paths:
+            arcpy.AddMessage(f"Processing: {aprx_path}")
+            _report_result(*repoint_project(aprx_path, old_source, new_source, old_key))
+
+        # Saved projects have a new mtime, refresh their entries for the next run
+        if index_path:
+            save_index(build_index(aprx_files, index_path), index_path)
         arcpy.AddMessage("Repointing completed successfully.")
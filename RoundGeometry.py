@@ -0,0 +1,400 @@
+import math
+import os
+import struct
+import time
+from optparse import OptionParser
+import arcpy
+import numpy as np
+
+# OGC WKB base geometry types
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_MULTIPOINT = 4
+WKB_MULTILINESTRING = 5
+WKB_MULTIPOLYGON = 6
+
+# Minimum vertex count for a sequence to stay valid after duplicates are collapsed
+_MIN_VERTICES = {WKB_POINT: 1, WKB_MULTIPOINT: 1,
+                 WKB_LINESTRING: 2, WKB_MULTILINESTRING: 2,
+                 WKB_POLYGON: 4, WKB_MULTIPOLYGON: 4}
+
+
+def get_decimals(round_tol):
+    """Returns the number of decimal places represented by a rounding tolerance (e.g. 0.001 -> 3)."""
+    return int(abs(round(math.log10(round_tol))))
+
+
+def _decode_type(type_code):
+    """Splits a WKB type code into (base type, has Z, has M), accepting ISO and EWKB flags."""
+    has_z = bool(type_code & 0x80000000)
+    has_m = bool(type_code & 0x40000000)
+    code = type_code & 0x0FFFFFFF
+    if code // 1000 in (1, 3):
+        has_z = True
+    if code // 1000 in (2, 3):
+        has_m = True
+    return code % 1000, has_z, has_m
+
+
+def parse_wkb(wkb):
+    """
+    Parses a WKB geometry into its coordinate sequences.
+
+    Returns:
+        tuple: (type code, dims, sequences, structure) where sequences is a list of (n, dims)
+        float arrays in file order and structure lists the sequence count of every part.
+    """
+    wkb = bytes(wkb)
+    sequences = []
+    structure = []
+
+    def read(offset, nested):
+        order = "<" if wkb[offset] == 1 else ">"
+        type_code = struct.unpack_from(order + "I", wkb, offset + 1)[0]
+        base, has_z, has_m = _decode_type(type_code)
+        dims = 2 + has_z + has_m
+        offset += 5
+
+        if base == WKB_POINT:
+            sequences.append(np.frombuffer(wkb, order + "f8", dims, offset).reshape(1, dims))
+            if not nested:
+                structure.append(1)
+            return offset + 8 * dims, type_code, dims
+        if base == WKB_LINESTRING:
+            count = struct.unpack_from(order + "I", wkb, offset)[0]
+            sequences.append(np.frombuffer(wkb, order + "f8", count * dims, offset + 4).reshape(count, dims))
+            if not nested:
+                structure.append(1)
+            return offset + 4 + 8 * count * dims, type_code, dims
+        if base == WKB_POLYGON:
+            ring_count = struct.unpack_from(order + "I", wkb, offset)[0]
+            offset += 4
+            for _ in range(ring_count):
+                count = struct.unpack_from(order + "I", wkb, offset)[0]
+                sequences.append(np.frombuffer(wkb, order + "f8", count * dims, offset + 4).reshape(count, dims))
+                offset += 4 + 8 * count * dims
+            structure.append(ring_count)
+            return offset, type_code, dims
+        if base in (WKB_MULTIPOINT, WKB_MULTILINESTRING, WKB_MULTIPOLYGON):
+            part_count = struct.unpack_from(order + "I", wkb, offset)[0]
+            offset += 4
+            for _ in range(part_count):
+                offset, _, _ = read(offset, True)
+                if base != WKB_MULTIPOLYGON:
+                    structure.append(1)
+            return offset, type_code, dims
+        raise ValueError(f"Unsupported WKB geometry type: {type_code}")
+
+    _, type_code, dims = read(0, False)
+    return type_code, dims, sequences, structure
+
+
+def build_wkb(type_code, dims, sequences, structure):
+    """Serialises coordinate sequences back to little-endian WKB with the original type code."""
+    base, _, _ = _decode_type(type_code)
+    member_code = type_code - base + {WKB_MULTIPOINT: WKB_POINT,
+                                      WKB_MULTILINESTRING: WKB_LINESTRING,
+                                      WKB_MULTIPOLYGON: WKB_POLYGON}.get(base, base)
+    chunks = []
+    seq_iter = iter(sequences)
+
+    def write_member(code, ring_count):
+        member_base = _decode_type(code)[0]
+        chunks.append(struct.pack("<BI", 1, code))
+        if member_base == WKB_POINT:
+            chunks.append(np.ascontiguousarray(next(seq_iter), "<f8").tobytes())
+        elif member_base == WKB_LINESTRING:
+            seq = next(seq_iter)
+            chunks.append(struct.pack("<I", len(seq)))
+            chunks.append(np.ascontiguousarray(seq, "<f8").tobytes())
+        else:
+            chunks.append(struct.pack("<I", ring_count))
+            for _ in range(ring_count):
+                seq = next(seq_iter)
+                chunks.append(struct.pack("<I", len(seq)))
+                chunks.append(np.ascontiguousarray(seq, "<f8").tobytes())
+
+    if base in (WKB_MULTIPOINT, WKB_MULTILINESTRING, WKB_MULTIPOLYGON):
+        chunks.append(struct.pack("<BII", 1, type_code, len(structure)))
+        for ring_count in structure:
+            write_member(member_code, ring_count)
+    else:
+        write_member(type_code, structure[0] if structure else 0)
+    return b"".join(chunks)
+
+
+def round_coordinates(coords, round_tol=None, grid_size=None, grid_origin=(0.0, 0.0), z_tol=None):
+    """
+    Rounds or grid-snaps a whole (n, dims) coordinate array in place.
+
+    Parameters:
+        coords (ndarray): Coordinates with X, Y in the first two columns and Z (if any) in the third.
+        round_tol (float): Rounding tolerance for X/Y, e.g. 0.001 rounds to 3 decimals.
+        grid_size (float): Grid spacing for X/Y snapping. Takes precedence over round_tol.
+        grid_origin (tuple): Grid origin (X, Y) used when snapping.
+        z_tol (float): Rounding tolerance for Z. Z is left unchanged when None.
+    """
+    xy = coords[:, :2]
+    if grid_size:
+        origin = np.asarray(grid_origin, dtype="f8")
+        xy -= origin
+        np.round(xy / grid_size, out=xy)
+        xy *= grid_size
+        xy += origin
+    elif round_tol:
+        np.round(xy, get_decimals(round_tol), out=xy)
+    if z_tol and coords.shape[1] > 2:
+        np.round(coords[:, 2], get_decimals(z_tol), out=coords[:, 2])
+    return coords
+
+
+def collapse_duplicates(coords, starts):
+    """
+    Returns a keep mask that drops consecutive duplicate vertices within each sequence.
+
+    The earlier vertex of each duplicate pair is dropped, so the closing vertex of a ring is
+    always retained and rings stay closed.
+
+    Parameters:
+        coords (ndarray): (n, dims) coordinates for all sequences back to back.
+        starts (ndarray): Start index of every sequence in coords.
+    """
+    keep = np.ones(len(coords), dtype=bool)
+    if len(coords) < 2:
+        return keep
+    same_as_next = np.all(coords[:-1] == coords[1:], axis=1)
+    ends = starts[1:] - 1
+    same_as_next[ends[(ends >= 0) & (ends < len(same_as_next))]] = False
+    keep[:-1] = ~same_as_next
+    return keep
+
+
+def _sum_per_sequence(values, starts, lengths):
+    """
+    Sums values over every sequence.
+
+    Unlike np.add.reduceat this returns 0 for empty sequences (empty parts or rings) and
+    accepts sequences that start at the end of the array.
+    """
+    totals = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return totals[starts + lengths] - totals[starts]
+
+
+def _round_geometries(wkb_list, round_tol, grid_size, grid_origin, z_tol, remove_duplicates):
+    """
+    Rounds a list of WKB geometries in one vectorised pass.
+
+    Returns:
+        tuple: (list of new WKB or None for unchanged/degenerate geometries, degenerate count)
+    """
+    parsed = [parse_wkb(wkb) for wkb in wkb_list]
+    if not parsed:
+        return [], 0
+
+    # Coordinates are grouped by dimensionality so each group is one contiguous array
+    results = [None] * len(parsed)
+    degenerate = 0
+    for dims in sorted({p[1] for p in parsed}):
+        members = [i for i, p in enumerate(parsed) if p[1] == dims]
+        sequences = [seq for i in members for seq in parsed[i][2]]
+        if not sequences:
+            continue
+        lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64, count=len(sequences))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        original = np.concatenate(sequences).astype("f8")
+        coords = round_coordinates(original.copy(), round_tol, grid_size, grid_origin, z_tol)
+
+        keep = collapse_duplicates(coords, starts) if remove_duplicates else np.ones(len(coords), dtype=bool)
+        kept_counts = _sum_per_sequence(keep, starts, lengths)
+        changed_seq = _sum_per_sequence(np.any(coords != original, axis=1), starts, lengths) > 0
+
+        seq_index = 0
+        for i in members:
+            type_code, _, feature_seqs, structure = parsed[i]
+            first, last = seq_index, seq_index + len(feature_seqs)
+            seq_index = last
+            if not changed_seq[first:last].any():
+                continue
+            # Only sequences that rounding shortens below the minimum count, empty parts stay as they are
+            minimum = _MIN_VERTICES[_decode_type(type_code)[0]]
+            if ((kept_counts[first:last] < minimum) & (lengths[first:last] >= minimum)).any():
+                degenerate += 1
+                continue
+            new_seqs = [coords[starts[s]:starts[s] + lengths[s]][keep[starts[s]:starts[s] + lengths[s]]]
+                        for s in range(first, last)]
+            results[i] = build_wkb(type_code, dims, new_seqs, structure)
+    return results, degenerate
+
+
+def RoundGeometries(in_features, round_tol=None, grid_size=None, grid_origin=(0.0, 0.0),
+                    z_tol=None, remove_duplicates=True, where_clause=None):
+    """
+    Rounds or grid-snaps the coordinates of every feature in a dataset.
+
+    Geometries are read in bulk, processed as one NumPy array and written back in a single
+    update pass that only touches features whose coordinates changed. Geometries that would
+    become degenerate after snapping (e.g. a ring collapsing to fewer than 4 vertices) keep
+    their original shape.
+
+    Parameters:
+        in_features (str): Point, multipoint, polyline or polygon feature class or layer.
+        round_tol (float): Rounding tolerance for X/Y, e.g. 0.001.
+        grid_size (float): Grid spacing for X/Y snapping. Takes precedence over round_tol.
+        grid_origin (tuple): Grid origin (X, Y) used when snapping.
+        z_tol (float): Rounding tolerance for Z values. Z is left unchanged when None.
+        remove_duplicates (bool): If True, collapses consecutive duplicate vertices created by rounding.
+        where_clause (str): Optional SQL expression limiting the features processed.
+
+    Returns:
+        int: Number of features updated.
+    """
+    if not round_tol and not grid_size:
+        raise ValueError("Either round_tol or grid_size must be specified")
+
+    spatial_ref = arcpy.Describe(in_features).spatialReference
+
+    oids = []
+    wkb_list = []
+    with arcpy.da.SearchCursor(in_features, ["OID@", "SHAPE@WKB"], where_clause) as cursor:
+        for oid, wkb in cursor:
+            if wkb:
+                oids.append(oid)
+                wkb_list.append(wkb)
+
+    new_wkb, degenerate = _round_geometries(wkb_list, round_tol, grid_size, grid_origin, z_tol, remove_duplicates)
+    updates = {oid: wkb for oid, wkb in zip(oids, new_wkb) if wkb is not None}
+
+    if updates:
+        with arcpy.da.UpdateCursor(in_features, ["OID@", "SHAPE@"], where_clause) as cursor:
+            for row in cursor:
+                wkb = updates.get(row[0])
+                if wkb is not None:
+                    row[1] = arcpy.FromWKB(bytearray(wkb), spatial_ref)
+                    cursor.updateRow(row)
+
+    if degenerate:
+        arcpy.AddWarning(f"{degenerate} features would become degenerate and were left unchanged")
+    arcpy.AddMessage(f"Rounded {len(updates)} of {len(oids)} features in {in_features}")
+    return len(updates)
+
+
+def RoundGeometry(geometry, round_tol=None, grid_size=None, grid_origin=(0.0, 0.0), z_tol=None):
+    """Rounds a single arcpy geometry. Returns the original geometry if nothing changed."""
+    new_wkb, _ = _round_geometries([geometry.WKB], round_tol, grid_size, grid_origin, z_tol, True)
+    if new_wkb[0] is None:
+        return geometry
+    return arcpy.FromWKB(bytearray(new_wkb[0]), geometry.spatialReference)
+
+
+def _round_per_point(geometry, round_tol, spatial_ref):
+    """Rounds a geometry vertex by vertex through arcpy Point/Array objects, as the pipeline used to."""
+    decimals = int(abs(round(math.log(round_tol, 10))))
+    if str(geometry.type).upper() == "POINT":
+        point = geometry.firstPoint
+        return arcpy.PointGeometry(arcpy.Point(round(point.X, decimals), round(point.Y, decimals)), spatial_ref)
+    newArray = arcpy.Array()
+    for i in range(geometry.partCount):
+        partArray = geometry.getPart(i)
+        for j in range(partArray.count):
+            point = partArray.getObject(j)
+            partArray.replace(j, arcpy.Point(round(point.X, decimals), round(point.Y, decimals)))
+        newArray.add(partArray)
+    return arcpy.Geometry(str(geometry.type), newArray, spatial_ref)
+
+
+def create_benchmark_dataset(workspace, name="RoundGeometryBenchmark", vertex_count=1000000,
+                             vertices_per_feature=1000, seed=0):
+    """
+    Creates a polyline feature class of random MGA-range vertices for benchmarking.
+
+    Returns:
+        str: Path of the new feature class.
+    """
+    out_fc = os.path.join(workspace, name)
+    if arcpy.Exists(out_fc):
+        arcpy.Delete_management(out_fc)
+    arcpy.CreateFeatureclass_management(workspace, name, "POLYLINE", spatial_reference=arcpy.SpatialReference(28350))
+    spatial_ref = arcpy.Describe(out_fc).spatialReference
+
+    rng = np.random.default_rng(seed)
+    with arcpy.da.InsertCursor(out_fc, ["SHAPE@"]) as cursor:
+        for _ in range(vertex_count // vertices_per_feature):
+            coords = rng.uniform(500000, 600000, (vertices_per_feature, 2))
+            wkb = struct.pack("<BII", 1, WKB_LINESTRING, vertices_per_feature) + coords.astype("<f8").tobytes()
+            cursor.insertRow([arcpy.FromWKB(bytearray(wkb), spatial_ref)])
+    return out_fc
+
+
+def _read_coordinates(in_features):
+    """Returns every vertex of a dataset as one (n, dims) array in OID order."""
+    sequences = []
+    with arcpy.da.SearchCursor(in_features, ["SHAPE@WKB"], sql_clause=(None, "ORDER BY OBJECTID")) as cursor:
+        for wkb, in cursor:
+            if wkb:
+                sequences.extend(seq[:, :2] for seq in parse_wkb(wkb)[2])
+    return np.concatenate(sequences) if sequences else np.empty((0, 2))
+
+
+def benchmark(in_features=None, workspace=None, vertex_count=1000000, vertices_per_feature=1000, round_tol=0.001):
+    """
+    Times the per-point arcpy rounding against RoundGeometries end to end on the same dataset.
+
+    Each implementation runs on its own copy of the input, reading and writing the geodatabase,
+    and the two outputs are compared vertex by vertex. Without in_features a synthetic polyline
+    dataset of vertex_count vertices is created in workspace (the scratch GDB by default).
+
+    Returns:
+        tuple: (vectorised seconds, per point seconds)
+    """
+    workspace = workspace or arcpy.env.scratchGDB
+    if not in_features:
+        start = time.perf_counter()
+        in_features = create_benchmark_dataset(workspace, vertex_count=vertex_count,
+                                               vertices_per_feature=vertices_per_feature)
+        print(f"Created {in_features} in {time.perf_counter() - start:.1f}s")
+
+    per_point_fc = os.path.join(workspace, "RoundGeometry_PerPoint")
+    vectorised_fc = os.path.join(workspace, "RoundGeometry_Vectorised")
+    for out_fc in (per_point_fc, vectorised_fc):
+        if arcpy.Exists(out_fc):
+            arcpy.Delete_management(out_fc)
+        arcpy.CopyFeatures_management(in_features, out_fc)
+    spatial_ref = arcpy.Describe(in_features).spatialReference
+
+    start = time.perf_counter()
+    with arcpy.da.UpdateCursor(per_point_fc, ["SHAPE@"]) as cursor:
+        for row in cursor:
+            if row[0]:
+                row[0] = _round_per_point(row[0], round_tol, spatial_ref)
+                cursor.updateRow(row)
+    per_point = time.perf_counter() - start
+
+    # Duplicates are kept so both outputs have the same vertices
+    start = time.perf_counter()
+    RoundGeometries(vectorised_fc, round_tol=round_tol, remove_duplicates=False)
+    vectorised = time.perf_counter() - start
+
+    per_point_coords, vectorised_coords = _read_coordinates(per_point_fc), _read_coordinates(vectorised_fc)
+    identical = per_point_coords.shape == vectorised_coords.shape and np.array_equal(per_point_coords, vectorised_coords)
+
+    print(f"{len(vectorised_coords)} vertices in {in_features}")
+    print(f"Per point:  {per_point:.3f}s")
+    print(f"Vectorised: {vectorised:.3f}s ({per_point / vectorised:.1f}x faster)")
+    print(f"Outputs {'identical' if identical else 'DIFFER'}")
+    return vectorised, per_point
+
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("-i", "--input", action="store", dest="input", type="string", help="Feature class to benchmark on, synthetic when omitted")
+    parser.add_option("-w", "--workspace", action="store", dest="workspace", type="string", help="Geodatabase for the benchmark outputs (scratch GDB by default)")
+    parser.add_option("-n", "--vertices", action="store", dest="vertices", type="int", default=1000000, help="Vertex count of the synthetic dataset")
+    parser.add_option("-t", "--tolerance", action="store", dest="tolerance", type="float", default=0.001, help="Rounding tolerance")
+
+    (options, args) = parser.parse_args()
+    benchmark(options.input, options.workspace, options.vertices, round_tol=options.tolerance)
+
+
+if __name__ == "__main__":
+    main()
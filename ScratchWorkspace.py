@@ -0,0 +1,170 @@
+import os
+import shutil
+import time
+import uuid
+import arcpy
+
+SCRATCH_PREFIX = "scratch"
+MARKER_EXTENSION = ".run"
+
+
+class ScratchWorkspace(object):
+    """
+    Per-run workspace for intermediate datasets.
+
+    Each run gets its own file geodatabase (or a unique name prefix in the memory workspace),
+    so concurrent runs never clobber each other's intermediates. Names are handed out with
+    name() and layer(), everything handed out is tracked, and cleanup() drops the whole
+    geodatabase in one operation. A run marker file next to the geodatabase is touched whenever
+    a name is handed out; reclaim_stale judges a run's age by it.
+
+    Usage:
+        with ScratchWorkspace(root, "LostEquipment_NJV") as scratch:
+            clipped = scratch.name("MTD_ClipA")
+            extents = scratch.layer("MineSiteExtents_Lay")
+    """
+
+    def __init__(self, root=None, prefix=SCRATCH_PREFIX, use_memory=False, memory_workspace="memory"):
+        """
+        Parameters:
+            root (str): Folder in which the run geodatabase is created. Defaults to arcpy.env.scratchFolder.
+            prefix (str): Prefix of the run geodatabase name, used again by reclaim_stale.
+            use_memory (bool): If True, intermediates are written to the memory workspace instead.
+            memory_workspace (str): "memory" or the legacy "in_memory" workspace.
+        """
+        self.root = root or arcpy.env.scratchFolder
+        self.prefix = prefix
+        self.use_memory = use_memory
+        self.run_id = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{uuid.uuid4().hex[:6]}"
+        self.path = memory_workspace if use_memory else os.path.join(self.root, self.run_id + ".gdb")
+        self.marker = None if use_memory else os.path.join(self.root, self.run_id + MARKER_EXTENSION)
+        self.datasets = []
+        self.layers = []
+        self._created = False
+
+    def __enter__(self):
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.cleanup()
+        return False
+
+    def create(self):
+        """Creates the run geodatabase. Called automatically when used as a context manager."""
+        if not self.use_memory and not self._created:
+            if not os.path.exists(self.root):
+                os.makedirs(self.root)
+            # Written before the geodatabase, reclaim_stale only deletes geodatabases that have one
+            with open(self.marker, "w", encoding="utf-8") as f:
+                f.write(f"{os.getpid()} {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            arcpy.CreateFileGDB_management(self.root, self.run_id + ".gdb")
+        self._created = True
+        return self.path
+
+    def name(self, base_name):
+        """Returns a unique dataset path for an intermediate and tracks it for cleanup."""
+        if not self._created:
+            self.create()
+        self._touch()
+        if self.use_memory:
+            base_name = f"{self.run_id}_{base_name}"
+        valid_name = arcpy.ValidateTableName(base_name, None if self.use_memory else self.path)
+        unique_name = valid_name
+        index = 1
+        while os.path.join(self.path, unique_name) in self.datasets:
+            unique_name = f"{valid_name}_{index}"
+            index += 1
+        dataset = os.path.join(self.path, unique_name)
+        self.datasets.append(dataset)
+        return dataset
+
+    def _touch(self):
+        """Marks the run as active for reclaim_stale."""
+        if self.marker:
+            try:
+                os.utime(self.marker, None)
+            except OSError:
+                pass
+
+    def layer(self, base_name):
+        """Returns a unique feature/table view name and tracks it for cleanup."""
+        layer_name = f"{base_name}_{self.run_id}".replace(" ", "_")
+        self.layers.append(layer_name)
+        return layer_name
+
+    def cleanup(self):
+        """Deletes tracked layers and then the whole run workspace."""
+        for layer_name in self.layers:
+            try:
+                if arcpy.Exists(layer_name):
+                    arcpy.Delete_management(layer_name)
+            except Exception as e:
+                print(f"Could not delete layer {layer_name}: {str(e)}")
+        self.layers = []
+
+        if self.use_memory:
+            # The memory workspace is shared by everything in the process, only drop our own names
+            for dataset in self.datasets:
+                try:
+                    if arcpy.Exists(dataset):
+                        arcpy.Delete_management(dataset)
+                except Exception as e:
+                    print(f"Could not delete {dataset}: {str(e)}")
+        elif self._created:
+            try:
+                arcpy.Delete_management(self.path)
+            except Exception as e:
+                print(f"Could not delete scratch workspace {self.path}: {str(e)}")
+            if not arcpy.Exists(self.path) and os.path.exists(self.marker):
+                os.remove(self.marker)
+        self.datasets = []
+        self._created = False
+
+    @staticmethod
+    def reclaim_stale(root=None, prefix=SCRATCH_PREFIX, max_age_hours=24):
+        """
+        Deletes run geodatabases left behind by crashed runs.
+
+        Only geodatabases with a run marker were created by ScratchWorkspace, anything else in the
+        folder is left alone whatever its age. A run's age is taken from its marker, which a live
+        run touches whenever it hands out a name.
+
+        Parameters:
+            root (str): Folder holding the run geodatabases. Defaults to arcpy.env.scratchFolder.
+            prefix (str): Only geodatabases whose name starts with this prefix are considered.
+            max_age_hours (float): Runs whose marker is older than this are deleted.
+
+        Returns:
+            list: Paths of the geodatabases that were deleted.
+        """
+        root = root or arcpy.env.scratchFolder
+        if not root or not os.path.isdir(root):
+            return []
+
+        cutoff = time.time() - max_age_hours * 3600
+        reclaimed = []
+        for entry in os.listdir(root):
+            path = os.path.join(root, entry)
+            if not entry.startswith(prefix + "_"):
+                continue
+            if entry.endswith(MARKER_EXTENSION):
+                # Marker of a run that never created its geodatabase (or already removed with it above)
+                if (os.path.exists(path) and not os.path.exists(path[:-len(MARKER_EXTENSION)] + ".gdb")
+                        and os.path.getmtime(path) < cutoff):
+                    os.remove(path)
+                continue
+            if not (entry.endswith(".gdb") and os.path.isdir(path)):
+                continue
+            marker = path[:-len(".gdb")] + MARKER_EXTENSION
+            if not os.path.exists(marker) or os.path.getmtime(marker) >= cutoff:
+                continue
+            try:
+                arcpy.Delete_management(path)
+            except Exception:
+                shutil.rmtree(path, ignore_errors=True)
+            if not os.path.exists(path):
+                os.remove(marker)
+                reclaimed.append(path)
+                print(f"Reclaimed stale scratch workspace: {path}")
+        return reclaimed
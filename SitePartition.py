@@ -0,0 +1,191 @@
+import os
+import arcpy
+import numpy as np
+from RoundGeometry import parse_wkb
+
+# Polygon edges tested per block in the point-in-polygon test, bounds memory to points x block
+EDGE_BLOCK_SIZE = 256
+
+# AddField keywords for the ListFields types copied into the partition output
+ADD_FIELD_TYPES = {"String": "TEXT", "Double": "DOUBLE", "Single": "FLOAT", "Integer": "LONG",
+                   "SmallInteger": "SHORT", "Date": "DATE", "Guid": "GUID"}
+SKIPPED_FIELD_TYPES = ("OID", "Geometry", "GlobalID", "Raster", "Blob")
+
+
+class PreparedExtent(object):
+    """Site extent polygon reduced to its bounding box and edge arrays for repeated point tests."""
+
+    def __init__(self, mineSite, wkb, oid=None, attributes=()):
+        self.mineSite = mineSite
+        self.oid = oid
+        self.attributes = tuple(attributes)
+        _, _, rings, _ = parse_wkb(wkb)
+        starts = [ring[:-1, :2] for ring in rings if len(ring) > 1]
+        ends = [ring[1:, :2] for ring in rings if len(ring) > 1]
+        start = np.concatenate(starts) if starts else np.empty((0, 2))
+        end = np.concatenate(ends) if ends else np.empty((0, 2))
+        self.x1, self.y1 = start[:, 0].copy(), start[:, 1].copy()
+        self.x2, self.y2 = end[:, 0].copy(), end[:, 1].copy()
+        coords = np.concatenate([start, end]) if len(start) else np.zeros((1, 2))
+        self.xmin, self.ymin = coords.min(axis=0)
+        self.xmax, self.ymax = coords.max(axis=0)
+
+    def contains(self, x, y, tolerance=0.0):
+        """
+        Even-odd ray casting over all rings, so holes are excluded. Returns a boolean mask.
+
+        Points within tolerance of an edge count as inside, as they do for Intersect.
+        """
+        inside = np.zeros(len(x), dtype=bool)
+        on_edge = np.zeros(len(x), dtype=bool)
+        for first in range(0, len(self.x1), EDGE_BLOCK_SIZE):
+            block = slice(first, first + EDGE_BLOCK_SIZE)
+            x1, y1 = self.x1[block], self.y1[block]
+            x2, y2 = self.x2[block], self.y2[block]
+            px, py = x[:, None], y[:, None]
+            straddles = (y1 > py) != (y2 > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            crossings = np.count_nonzero(straddles & (px < x_cross), axis=1)
+            inside ^= (crossings % 2).astype(bool)
+
+            # Distance to each edge segment
+            dx, dy = x2 - x1, y2 - y1
+            length2 = dx * dx + dy * dy
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.where(length2 > 0, ((px - x1) * dx + (py - y1) * dy) / length2, 0.0)
+            t = np.clip(t, 0.0, 1.0)
+            distance2 = (px - x1 - t * dx) ** 2 + (py - y1 - t * dy) ** 2
+            on_edge |= np.any(distance2 <= tolerance * tolerance, axis=1)
+        return inside | on_edge
+
+
+class SitePartition(object):
+    """
+    Reads the filtered exploration rows and all site extents once and partitions rows by site.
+
+    Replaces one feature layer + Intersect per site over the full exploration table. Points are
+    indexed by X so each extent only tests the points inside its bounding box, and a point that
+    falls in overlapping extents is assigned to each of them, as Intersect would. The output has
+    Intersect's schema, with FID fields named after the input datasets rather than the layers.
+
+    Usage:
+        partition = SitePartition(extents_fc, exploration_fc, where_clause)
+        partition.load()
+        partition.write("NJV", out_fc)
+    """
+
+    def __init__(self, extents_fc, exploration_fc, where_clause=None, site_field="MineSite"):
+        self.extents_fc = extents_fc
+        self.exploration_fc = exploration_fc
+        self.where_clause = where_clause
+        self.site_field = site_field
+        self.spatial_reference = None
+        self.extent_fields = []
+        self.fields = []
+        self.extents = []
+        self.rows = []
+        self.sites = {}
+
+    @staticmethod
+    def _attribute_fields(dataset):
+        return [field for field in arcpy.ListFields(dataset)
+                if field.type not in SKIPPED_FIELD_TYPES and field.name.lower() not in ("shape_length", "shape_area")]
+
+    def load(self):
+        """Reads extents and exploration rows and assigns every row to the extents containing it."""
+        self.spatial_reference = arcpy.Describe(self.extents_fc).spatialReference
+        # Points within the XY tolerance of an extent's edge are inside, as for Intersect
+        tolerance = getattr(self.spatial_reference, "XYTolerance", None) or 0.0
+
+        self.extent_fields = self._attribute_fields(self.extents_fc)
+        extent_names = [field.name for field in self.extent_fields]
+        site_index = [name.lower() for name in extent_names].index(self.site_field.lower())
+        self.extents = []
+        with arcpy.da.SearchCursor(self.extents_fc, ["OID@", "SHAPE@WKB"] + extent_names) as cursor:
+            for row in cursor:
+                if row[2 + site_index] and row[1]:
+                    self.extents.append(PreparedExtent(row[2 + site_index], row[1], row[0], row[2:]))
+
+        # Attributes are carried over as-is, the point is read in the extents' coordinate system
+        self.fields = self._attribute_fields(self.exploration_fc)
+        xy = []
+        self.rows = []
+        with arcpy.da.SearchCursor(self.exploration_fc, ["SHAPE@XY", "OID@"] + [field.name for field in self.fields],
+                                   self.where_clause, spatial_reference=self.spatial_reference) as cursor:
+            for row in cursor:
+                if row[0] and row[0][0] is not None:
+                    xy.append(row[0])
+                    self.rows.append(row)
+        print(f"Read {len(self.rows)} exploration rows and {len(self.extents)} site extents")
+
+        self.sites = {}
+        if not self.rows:
+            return self.sites
+        points = np.asarray(xy, dtype="f8")
+        order = np.argsort(points[:, 0], kind="stable")
+        sorted_x = points[order, 0]
+
+        for extent_index, extent in enumerate(self.extents):
+            lo = np.searchsorted(sorted_x, extent.xmin - tolerance, side="left")
+            hi = np.searchsorted(sorted_x, extent.xmax + tolerance, side="right")
+            candidates = order[lo:hi]
+            y = points[candidates, 1]
+            candidates = candidates[(y >= extent.ymin - tolerance) & (y <= extent.ymax + tolerance)]
+            if len(candidates):
+                inside = extent.contains(points[candidates, 0], points[candidates, 1], tolerance)
+                members = np.sort(candidates[inside])
+            else:
+                members = candidates
+            self.sites.setdefault(extent.mineSite, []).extend((index, extent_index) for index in members.tolist())
+
+        for mineSite, members in self.sites.items():
+            print(f"{mineSite}: {len(members)} rows")
+        return self.sites
+
+    def count(self, mineSite):
+        return len(self.sites.get(mineSite, []))
+
+    def _output_fields(self, workspace):
+        """
+        Returns the (name, field) pairs of the output in Intersect order: FID_<extents>, the extent
+        attributes, FID_<exploration>, the exploration attributes. Field is None for the FID fields,
+        and an exploration field whose name is already taken gets a "_1" suffix, as Intersect does.
+        """
+        def fid_name(dataset):
+            return arcpy.ValidateFieldName("FID_" + os.path.basename(dataset).split(".")[-1], workspace)
+
+        fields = [(fid_name(self.extents_fc), None)] + [(field.name, field) for field in self.extent_fields]
+        fields.append((fid_name(self.exploration_fc), None))
+        taken = {name.lower() for name, _ in fields}
+        for field in self.fields:
+            name = field.name if field.name.lower() not in taken else field.name + "_1"
+            taken.add(name.lower())
+            fields.append((name, field))
+        return fields
+
+    def write(self, mineSite, out_fc):
+        """
+        Writes the rows assigned to a site to a new point feature class with Intersect's schema.
+
+        A point inside several extents of the site is written once per extent, like Intersect does.
+        """
+        if arcpy.Exists(out_fc):
+            arcpy.Delete_management(out_fc)
+        workspace = os.path.dirname(out_fc)
+        arcpy.CreateFeatureclass_management(workspace, os.path.basename(out_fc), "POINT",
+                                            None, "DISABLED", "DISABLED", self.spatial_reference)
+        fields = self._output_fields(workspace)
+        for name, field in fields:
+            if field is None:
+                arcpy.AddField_management(out_fc, name, "LONG")
+            else:
+                arcpy.AddField_management(out_fc, name, ADD_FIELD_TYPES.get(field.type, "TEXT"),
+                                          field_length=field.length if field.type == "String" else None)
+
+        with arcpy.da.InsertCursor(out_fc, ["SHAPE@XY"] + [name for name, _ in fields]) as cursor:
+            for index, extent_index in self.sites.get(mineSite, []):
+                extent, row = self.extents[extent_index], self.rows[index]
+                cursor.insertRow((row[0], extent.oid) + extent.attributes + (row[1],) + tuple(row[2:]))
+        print(f"Wrote {self.count(mineSite)} rows for {mineSite} to {out_fc}")
+        return out_fc
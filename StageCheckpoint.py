@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import time
+import arcpy
+
+# Editor tracking fields checked, in order, when fingerprinting a table
+EDIT_DATE_FIELDS = ["EditDate", "last_edited_date", "EDIT_DATE"]
+
+# Field types left out of a table's content hash, the shape is hashed as WKB instead
+UNHASHED_FIELD_TYPES = ("OID", "Geometry", "Blob", "Raster")
+
+# Describe dataTypes fingerprinted as rasters rather than tables
+RASTER_DATA_TYPES = ("RasterDataset", "RasterBand", "MosaicDataset")
+
+
+def fingerprint(dataset, where_clause=None):
+    """
+    Returns a cheap fingerprint of a dataset so stages can tell whether an input changed.
+
+    Files (DXF templates, CSVs, ...) use size and modification time. Rasters use their size,
+    extent and the modification time of the file or geodatabase holding them, since a float
+    surface has no attribute table to count. Tables and feature classes use the row count plus
+    the latest editor tracking date when the table has one. Without editor tracking, edits that
+    keep the row count are only visible in the data, so the OIDs, attributes and shapes are hashed.
+    A where clause limits the table fingerprint to the rows in scope, e.g. one mine site.
+    """
+    if os.path.isfile(dataset):
+        stat = os.stat(dataset)
+        return f"file:{stat.st_size}:{stat.st_mtime}"
+    if not arcpy.Exists(dataset):
+        return "missing"
+
+    desc = arcpy.Describe(dataset)
+    if getattr(desc, "dataType", None) in RASTER_DATA_TYPES:
+        parts = [str(getattr(desc, name, "")) for name in ("width", "height", "bandCount")]
+        extent = getattr(desc, "extent", None)
+        if extent is not None:
+            parts.append(",".join(str(getattr(extent, name, "")) for name in ("XMin", "YMin", "XMax", "YMax")))
+        location = getattr(desc, "catalogPath", dataset)
+        while location and not os.path.exists(location):
+            location = os.path.dirname(location) if os.path.dirname(location) != location else ""
+        if location:
+            parts.append(str(os.path.getmtime(location)))
+        return "raster:" + ":".join(parts)
+
+    if where_clause:
+        with arcpy.da.SearchCursor(dataset, ["OID@"], where_clause) as cursor:
+            parts = [str(sum(1 for _ in cursor))]
+    else:
+        parts = [arcpy.GetCount_management(dataset).getOutput(0)]
+    try:
+        fields = arcpy.ListFields(dataset)
+    except Exception:
+        fields = []
+    field_names = [field.name for field in fields]
+    for edit_field in EDIT_DATE_FIELDS:
+        if edit_field in field_names:
+            edit_where = f"{edit_field} IS NOT NULL" + (f" AND ({where_clause})" if where_clause else "")
+            with arcpy.da.SearchCursor(dataset, [edit_field], edit_where,
+                                       sql_clause=(None, f"ORDER BY {edit_field} DESC")) as cursor:
+                for row in cursor:
+                    parts.append(str(row[0]))
+                    break
+            return "table:" + ":".join(parts)
+
+    parts.append(_content_hash(dataset, fields, where_clause))
+    return "table:" + ":".join(parts)
+
+
+def _content_hash(dataset, fields, where_clause=None):
+    """Hashes the OID, attributes and shape WKB of every row in OID order."""
+    hash_fields = ["OID@"] + [field.name for field in fields if field.type not in UNHASHED_FIELD_TYPES]
+    if any(field.type == "Geometry" for field in fields):
+        hash_fields.append("SHAPE@WKB")
+    oid_fields = [field.name for field in fields if field.type == "OID"]
+    sql_clause = (None, f"ORDER BY {oid_fields[0]}") if oid_fields else (None, None)
+    digest = hashlib.sha1()
+    with arcpy.da.SearchCursor(dataset, hash_fields, where_clause, sql_clause=sql_clause) as cursor:
+        for row in cursor:
+            digest.update(repr([bytes(value) if isinstance(value, (bytearray, memoryview)) else value
+                                for value in row]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageCheckpoint(object):
+    """
+    Runs a pipeline as named stages and persists what each stage produced.
+
+    Every stage records a hash of its inputs (chained with the previous stage's hash) and the
+    outputs it wrote. On a rerun a stage is skipped while its hash is unchanged and all of its
+    outputs still exist; from the first stage that has to run, every later stage runs again.
+    Stage outputs are written to a persistent per-key file geodatabase so they survive a failed
+    run, and the manifest records whether the last run succeeded or failed.
+    """
+
+    def __init__(self, folder, key):
+        """
+        Parameters:
+            folder (str): Folder holding the checkpoint geodatabases and manifests.
+            key (str): Identifies the pipeline instance, e.g. "DrillholeLostEquipment_NJV".
+        """
+        self.folder = folder
+        self.key = key
+        self.workspace = os.path.join(folder, key + ".gdb")
+        self.manifest_path = os.path.join(folder, key + ".json")
+        self.manifest = self._load()
+        self.timings = {}
+        self._previous_hash = ""
+        self._invalidated = False
+
+    def _load(self):
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {"stages": {}}
+
+    def _save(self):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, default=str)
+        os.replace(temp_path, self.manifest_path)
+
+    def create(self):
+        """Creates the checkpoint folder and geodatabase if they don't exist yet."""
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+        if not arcpy.Exists(self.workspace):
+            arcpy.CreateFileGDB_management(self.folder, os.path.basename(self.workspace))
+        return self.workspace
+
+    def output(self, name):
+        """Returns the persistent path for a stage output."""
+        return os.path.join(self.workspace, arcpy.ValidateTableName(name, self.workspace))
+
+    @staticmethod
+    def _exists(output):
+        return os.path.exists(output) or arcpy.Exists(output)
+
+    @staticmethod
+    def _version(verify):
+        return json.loads(json.dumps(verify(), sort_keys=True, default=str)) if verify else None
+
+    def run(self, name, func, inputs=None, outputs=(), verify=None):
+        """
+        Runs a stage unless it is up to date.
+
+        Parameters:
+            name (str): Stage name, unique within the pipeline.
+            func (callable): Called with no arguments to run the stage.
+            inputs (dict): JSON-serialisable values the stage depends on (paths, fingerprints, settings).
+            outputs (list): Datasets or files the stage produces. A missing output forces the stage to run.
+            verify (callable): Returns a JSON-serialisable version of what the stage wrote, e.g. the
+                fingerprint of the rows it edits in a shared table. It is recorded after the stage
+                runs, and a different value on a rerun (the output was edited or truncated) forces
+                the stage to run.
+
+        Returns:
+            bool: True if the stage ran, False if it was skipped.
+        """
+        payload = json.dumps({"previous": self._previous_hash, "inputs": inputs or {}},
+                             sort_keys=True, default=str)
+        stage_hash = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        self._previous_hash = stage_hash
+
+        entry = self.manifest["stages"].get(name)
+        if (not self._invalidated and entry and entry.get("hash") == stage_hash
+                and all(self._exists(output) for output in outputs)
+                and (verify is None or entry.get("outputVersion") == self._version(verify))):
+            print(f"Stage {name}: up to date, skipping")
+            self.timings[name] = 0.0
+            return False
+
+        self._invalidated = True
+        print(f"Stage {name}: running")
+        start = time.time()
+        func()
+        self.timings[name] = time.time() - start
+
+        self.manifest["stages"][name] = {
+            "hash": stage_hash,
+            "outputs": list(outputs),
+            "completed": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seconds": round(self.timings[name], 3),
+            "outputVersion": self._version(verify),
+        }
+        self._save()
+        print(f"Stage {name}: completed in {self.timings[name]:.1f}s")
+        return True
+
+    def mark_succeeded(self):
+        self.manifest["status"] = "succeeded"
+        self.manifest["error"] = None
+        self.manifest["finished"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._save()
+
+    def mark_failed(self, error):
+        self.manifest["status"] = "failed"
+        self.manifest["error"] = str(error)
+        self.manifest["finished"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._save()
@@ -0,0 +1,158 @@
+import os
+import arcpy
+
+# Fields maintained by the geodatabase that are never compared or written
+SYSTEM_FIELD_TYPES = ("OID", "Geometry", "GlobalID", "Raster", "Blob")
+SYSTEM_FIELD_NAMES = ("shape_length", "shape_area", "shape.starea()", "shape.stlength()",
+                      "created_user", "created_date", "last_edited_user", "last_edited_date",
+                      "editor", "editdate", "creator", "creationdate")
+
+
+def get_workspace(dataset):
+    """Returns the workspace (geodatabase) containing a dataset, skipping feature datasets."""
+    path = arcpy.Describe(dataset).path
+    while path and arcpy.Describe(path).dataType not in ("Workspace", "Folder"):
+        path = os.path.dirname(path)
+    return path
+
+
+def matching_fields(source, target):
+    """Returns {target field: source field} for the editable attribute fields both datasets share."""
+    def editable(dataset):
+        return {field.name.lower(): field.name for field in arcpy.ListFields(dataset)
+                if field.type not in SYSTEM_FIELD_TYPES and field.editable
+                and field.name.lower() not in SYSTEM_FIELD_NAMES}
+
+    source_fields = editable(source)
+    return {name: source_fields[key] for key, name in editable(target).items() if key in source_fields}
+
+
+def _values_equal(a, b, tolerance):
+    if isinstance(a, float) or isinstance(b, float):
+        if a is None or b is None:
+            return a is b
+        return abs(a - b) <= tolerance
+    if isinstance(a, str) and isinstance(b, str):
+        return a.rstrip() == b.rstrip()
+    return a == b
+
+
+def _shapes_equal(a, b, tolerance):
+    if a is None or b is None:
+        return a is None and b is None
+    if a.type == "point" and b.type == "point":
+        pa, pb = a.firstPoint, b.firstPoint
+        if abs(pa.X - pb.X) > tolerance or abs(pa.Y - pb.Y) > tolerance:
+            return False
+        return pa.Z is None or pb.Z is None or abs(pa.Z - pb.Z) <= tolerance
+    return a.equals(b)
+
+
+def _sort_key(values):
+    return tuple((value is None, str(value)) for value in values)
+
+
+def upsert_features(source, target, key_fields, field_map=None, source_where=None, target_where=None,
+                    tolerance=0.001, delete_missing=True):
+    """
+    Synchronises the target rows in scope with the source rows, writing only what changed.
+
+    Rows are matched on the key fields. Where several rows share a key (e.g. more than one
+    lost-equipment interval on a hole) they are paired in a stable attribute order. Matched
+    rows are updated only if an attribute or the geometry differs by more than the tolerance,
+    unmatched source rows are inserted and, if delete_missing is set, unmatched target rows
+    are deleted. All edits are applied inside one edit session.
+
+    Parameters:
+        source (str): Feature class or layer holding the new rows.
+        target (str): Feature class to update.
+        key_fields (list): Target field names that identify a row, e.g. ["Hole_Name", "MineSite"].
+        field_map (dict): {target field: source field}. Defaults to the fields both datasets share.
+        source_where (str): Optional SQL expression limiting the source rows.
+        target_where (str): SQL expression limiting the target rows in scope, e.g. one mine site.
+        tolerance (float): Tolerance for numeric attributes and coordinates.
+        delete_missing (bool): If True, target rows in scope with no matching source row are deleted.
+
+    Returns:
+        dict: Counts of "inserted", "updated", "deleted" and "unchanged" rows.
+    """
+    field_map = dict(field_map or matching_fields(source, target))
+    target_fields = list(field_map)
+    source_fields = [field_map[name] for name in target_fields]
+
+    # Field names are case-insensitive, as in arcpy
+    lower_fields = [name.lower() for name in target_fields]
+    for key_field in key_fields:
+        if key_field.lower() not in lower_fields:
+            raise ValueError(f"Key field {key_field} is not mapped from {source}")
+    key_index = [lower_fields.index(name.lower()) for name in key_fields]
+
+    def key_of(values):
+        return tuple(values[i].strip().upper() if isinstance(values[i], str) else values[i] for i in key_index)
+
+    # Read both sides once and group rows by key
+    # Source shapes are read in the target's coordinate system so they compare like for like
+    new_rows = {}
+    target_sr = arcpy.Describe(target).spatialReference
+    with arcpy.da.SearchCursor(source, source_fields + ["SHAPE@"], source_where, spatial_reference=target_sr) as cursor:
+        for row in cursor:
+            new_rows.setdefault(key_of(row), []).append((list(row[:-1]), row[-1]))
+
+    existing_rows = {}
+    with arcpy.da.SearchCursor(target, ["OID@"] + target_fields + ["SHAPE@"], target_where) as cursor:
+        for row in cursor:
+            existing_rows.setdefault(key_of(row[1:-1]), []).append((row[0], list(row[1:-1]), row[-1]))
+
+    # Work out the minimal set of edits
+    updates = {}
+    deletes = set()
+    inserts = []
+    unchanged = 0
+    for key in set(new_rows) | set(existing_rows):
+        incoming = sorted(new_rows.get(key, []), key=lambda item: _sort_key(item[0]))
+        current = sorted(existing_rows.get(key, []), key=lambda item: _sort_key(item[1]))
+        for (values, shape), (oid, old_values, old_shape) in zip(incoming, current):
+            if (all(_values_equal(a, b, tolerance) for a, b in zip(values, old_values))
+                    and _shapes_equal(shape, old_shape, tolerance)):
+                unchanged += 1
+            else:
+                updates[oid] = (values, shape)
+        inserts.extend(incoming[len(current):])
+        if delete_missing:
+            deletes.update(oid for oid, _, _ in current[len(incoming):])
+
+    counts = {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes), "unchanged": unchanged}
+    if not (updates or deletes or inserts):
+        print(f"{target}: up to date ({unchanged} rows unchanged)")
+        return counts
+
+    workspace = get_workspace(target)
+    desc = arcpy.Describe(target)
+    edit = arcpy.da.Editor(workspace)
+    edit.startEditing(False, bool(getattr(desc, "isVersioned", False)))
+    edit.startOperation()
+    try:
+        if updates or deletes:
+            with arcpy.da.UpdateCursor(target, ["OID@"] + target_fields + ["SHAPE@"], target_where) as cursor:
+                for row in cursor:
+                    if row[0] in deletes:
+                        cursor.deleteRow()
+                    elif row[0] in updates:
+                        values, shape = updates[row[0]]
+                        cursor.updateRow([row[0]] + values + [shape])
+
+        if inserts:
+            with arcpy.da.InsertCursor(target, target_fields + ["SHAPE@"]) as cursor:
+                for values, shape in inserts:
+                    cursor.insertRow(values + [shape])
+
+        edit.stopOperation()
+        edit.stopEditing(True)
+    except Exception:
+        edit.abortOperation()
+        edit.stopEditing(False)
+        raise
+
+    print(f"{target}: {counts['inserted']} inserted, {counts['updated']} updated, "
+          f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+    return counts
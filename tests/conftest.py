@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ArcpyStandIn import StandIn
+
+# Registered as the arcpy module before any test imports a pipeline module
+STANDIN = StandIn()
+STANDIN.install()
+
+
+@pytest.fixture
+def arcpy(tmp_path):
+    """The arcpy stand-in with an empty data store and tmp_path as the scratch folder."""
+    STANDIN.reset()
+    STANDIN.module.env.scratchFolder = str(tmp_path)
+    yield STANDIN.module
+    STANDIN.reset()
@@ -0,0 +1,32 @@
+import os
+
+from ArcpyStandIn import Polygon
+from PadProcessingCore import PolygonToPoints
+
+
+def test_deepest_point_is_interior(arcpy, tmp_path):
+    arcpy.CreateFileGDB_management(str(tmp_path), "pads.gdb")
+    workspace = os.path.join(str(tmp_path), "pads.gdb")
+    arcpy.CreateFeatureclass_management(workspace, "pads", "POLYGON", spatial_reference=arcpy.SpatialReference(28350))
+    pads = os.path.join(workspace, "pads")
+    # A 10 x 2 rectangle and an L shape whose extent centre lies outside it
+    shapes = [
+        Polygon([[(0, 0), (0, 2), (10, 2), (10, 0), (0, 0)]]),
+        Polygon([[(20, 0), (20, 10), (22, 10), (22, 2), (30, 2), (30, 0), (20, 0)]]),
+    ]
+    with arcpy.da.InsertCursor(pads, ["SHAPE@"]) as cursor:
+        for shape in shapes:
+            cursor.insertRow([shape])
+
+    out_fc = os.path.join(workspace, "pads_deepest")
+    PolygonToPoints(pads, out_fc, "DeepestPoint")
+
+    with arcpy.da.SearchCursor(out_fc, ["ET_IDP", "SHAPE@XY"]) as cursor:
+        points = {oid: xy for oid, xy in cursor}
+    assert sorted(points) == [1, 2]
+    for oid, shape in zip((1, 2), shapes):
+        x, y = points[oid]
+        assert shape.contains_xy(x, y)
+        # Both shapes are 2 wide, the deepest point is about 1 from the boundary
+        distance = arcpy.PointGeometry(arcpy.Point(x, y)).distanceTo(shape.boundary())
+        assert distance >= 0.9
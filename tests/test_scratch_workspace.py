@@ -0,0 +1,36 @@
+import os
+
+from ScratchWorkspace import ScratchWorkspace
+
+
+def _age(path, hours):
+    """Sets a path's mtime to the given number of hours ago."""
+    import time
+    stamp = time.time() - hours * 3600
+    os.utime(path, (stamp, stamp))
+
+
+def test_reclaim_stale_only_deletes_marked_runs(arcpy, tmp_path):
+    root = str(tmp_path)
+    live = ScratchWorkspace(root, "LostEquipment")
+    live.name("a")
+    stale = ScratchWorkspace(root, "LostEquipment")
+    stale.name("b")
+    _age(stale.marker, 48)
+    _age(live.path, 48)  # an old folder mtime alone does not make a run stale
+
+    # A geodatabase sharing the folder that ScratchWorkspace did not create
+    foreign = os.path.join(root, "LostEquipment_x.gdb")
+    os.makedirs(foreign)
+    _age(foreign, 48)
+
+    assert ScratchWorkspace.reclaim_stale(root, "LostEquipment", 24) == [stale.path]
+    assert not os.path.exists(stale.path)
+    assert not os.path.exists(stale.marker)
+    assert os.path.isdir(foreign)
+    assert os.path.isdir(live.path)
+
+    live.cleanup()
+    assert not os.path.exists(live.path)
+    assert not os.path.exists(live.marker)
+    assert os.listdir(root) == ["LostEquipment_x.gdb"]
@@ -0,0 +1,47 @@
+import contextlib
+import io
+
+import LostEquipmentBenchmark as benchmark
+
+
+def _run_site(pipeline, config, mineSite):
+    """Runs one site and returns the stage status lines it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        pipeline.ProcessLostEquipment(mineSite, benchmark.FC_NAME, config, []).process_LostEquipment()
+    return [line for line in output.getvalue().splitlines() if line.startswith("Stage ")]
+
+
+def _site_hole(arcpy, config, mineSite):
+    """Returns the HOLE_NAME of a hole that reaches the site's publish output."""
+    publish_fc = config["task_fme_featureClassConfig"][benchmark.FC_NAME]["Publish_Projected_FC"]
+    with arcpy.da.SearchCursor(publish_fc, ["Hole_Name"], f"MineSite = '{mineSite}'") as cursor:
+        published = {row[0] for row in cursor}
+    original_fc = config["task_fme_featureClassConfig"][benchmark.FC_NAME]["Original_FC"]
+    with arcpy.da.SearchCursor(original_fc, ["HOLE_NAME"]) as cursor:
+        return next(row[0] for row in cursor if row[0] in published)
+
+
+def test_edit_without_row_count_change_reruns_stages(arcpy, tmp_path):
+    config, _ = benchmark.generate_inputs(arcpy, str(tmp_path), 2, 200, surface_size=50)
+    pipeline = benchmark._install_pipeline(arcpy, benchmark.StageRecorder(False))
+
+    assert "Stage select_exploration: running" in _run_site(pipeline, config, "S001")
+    assert all(line.endswith("up to date, skipping") for line in _run_site(pipeline, config, "S001"))
+
+    # Original_FC has no editor tracking field, rename one hole's rows in place
+    hole_name = _site_hole(arcpy, config, "S001")
+    original_fc = config["task_fme_featureClassConfig"][benchmark.FC_NAME]["Original_FC"]
+    with arcpy.da.UpdateCursor(original_fc, ["HOLE_NAME"], f"HOLE_NAME = '{hole_name}'") as cursor:
+        for row in cursor:
+            cursor.updateRow([hole_name + "_RENAMED"])
+
+    stages = _run_site(pipeline, config, "S001")
+    for stage in ("select_exploration", "build_drillholes", "load_original", "load_publish", "export"):
+        assert f"Stage {stage}: running" in stages
+
+    publish_fc = config["task_fme_featureClassConfig"][benchmark.FC_NAME]["Publish_Projected_FC"]
+    with arcpy.da.SearchCursor(publish_fc, ["Hole_Name"], "MineSite = 'S001'") as cursor:
+        published = {row[0] for row in cursor}
+    assert hole_name + "_RENAMED" in published
+    assert hole_name not in published